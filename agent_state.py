@@ -1,8 +1,101 @@
-from typing import TypedDict, List, Optional
+import os
+import re
+from typing import TypedDict, List, Optional, Any, Annotated, Dict
+
+# 체크포인터에 누적되는 스레드별 최대 메시지 수 (후속 질문용 대화 메모리)
+MAX_STATE_MESSAGES = int(os.getenv("MAX_STATE_MESSAGES", "20"))
+# 에이전트 LLM 프롬프트에 넣는 이전 메시지 수와 메시지당 최대 글자 수 (HISTORY_PROMPT_MESSAGES=0 이면 사용 안 함)
+HISTORY_PROMPT_MESSAGES = int(os.getenv("HISTORY_PROMPT_MESSAGES", "4"))
+HISTORY_MESSAGE_MAX_CHARS = int(os.getenv("HISTORY_MESSAGE_MAX_CHARS", "500"))
+# 이 글자 수(공백 제외) 이하의 짧은 질문은 앞 대화를 생략한 후속 질문으로 간주 (예: "2페이지는?", "왜?")
+FOLLOW_UP_MAX_CHARS = int(os.getenv("FOLLOW_UP_MAX_CHARS", "8"))
+# 앞 대화를 가리키는 지시어 / 이어 묻는 표현
+FOLLOW_UP_PATTERN = re.compile(
+    r"(그것|그거|그게|그걸|이것|이거|이게|이걸|저것|저거|"
+    r"(그|이|저|위|해당)\s*(문서|보고서|회의록|계획서|파일|자료|내용|답변|부분|사람|항목)|"
+    r"앞서|방금|아까|이전\s*(답변|내용|질문)|더\s*자세히|좀\s*더|다시\s*(설명|알려|정리)|"
+    r"^\s*(그럼|그러면|그리고|그래서|그런데|또|근데)\b)"
+)
+
+
+def append_bounded_messages(left: Optional[List[Any]], right: Optional[List[Any]]) -> List[Any]:
+    """
+    messages 리듀서: 노드가 반환한 새 메시지를 기존 메시지 뒤에 붙이고 최근 MAX_STATE_MESSAGES 개만 유지
+
+    Args:
+        left: 기존 메시지 리스트
+        right: 노드가 추가한 메시지 리스트 (전체 복사본이 아닌 변경분)
+
+    Returns:
+        합쳐진 메시지 리스트
+    """
+    if not right:
+        return left or []
+    merged = (left or []) + list(right)
+    return merged[-MAX_STATE_MESSAGES:]
+
 
 class AgentState(TypedDict):
     input_query: str
     thread_id: str
     project_name: Optional[str]
     project_explain: Optional[str]
-    messages: List[str] 
\ No newline at end of file
+    messages: Annotated[List[Any], append_bounded_messages]
+    raw_search_result: Optional[Dict[str, Any]]  # AGENT_DEBUG=true 일 때만 채워짐 (검색 원본 결과)
+
+
+def agent_debug_enabled() -> bool:
+    """디버그 모드 여부 (켜면 검색 에이전트가 원본 검색 결과를 상태에 포함)"""
+    return os.getenv("AGENT_DEBUG", "false").lower() in ("1", "true", "yes") 
+
+def get_thread_id(state: dict, config: Optional[dict]) -> str:
+    """
+    실행 설정(RunnableConfig)의 configurable.thread_id → 상태의 thread_id → "default" 순으로 스레드 ID 결정
+
+    RunnableConfig 는 TypedDict(dict) 이므로 속성이 아닌 키로 조회해야 합니다.
+    """
+    configurable = (config or {}).get("configurable") or {}
+    return configurable.get("thread_id") or state.get("thread_id") or "default"
+
+
+def message_text(message: Any) -> str:
+    """상태 메시지(검색 에이전트 dict 또는 문자열)의 답변 텍스트 (오류 메시지는 빈 문자열)"""
+    if isinstance(message, dict):
+        return str(message.get("answer") or "")
+    return str(getattr(message, "content", message) or "")
+
+
+def is_follow_up(query: str) -> bool:
+    """질문이 이전 대화에 의존하는 후속 질문인지 (지시어 / 생략된 짧은 질문)"""
+    compact = re.sub(r"\s+", "", query or "")
+    return bool(compact) and (len(compact) <= FOLLOW_UP_MAX_CHARS or bool(FOLLOW_UP_PATTERN.search(query)))
+
+
+def conversation_history(state: dict, limit: Optional[int] = None) -> List[str]:
+    """
+    체크포인터에서 복원된 이전 대화 메시지를 LLM 프롬프트용 텍스트로 변환
+
+    Args:
+        state: 현재 상태 (messages 에는 이번 요청 이전의 메시지만 있음)
+        limit: 최근 메시지 수 (기본값: HISTORY_PROMPT_MESSAGES)
+
+    Returns:
+        오래된 순서의 메시지 텍스트 리스트 (메시지당 HISTORY_MESSAGE_MAX_CHARS 자로 자름)
+    """
+    limit = HISTORY_PROMPT_MESSAGES if limit is None else limit
+    if limit <= 0:
+        return []
+    texts = [text for text in (message_text(message).strip() for message in state.get("messages") or []) if text]
+    return [text[:HISTORY_MESSAGE_MAX_CHARS] for text in texts[-limit:]]
+
+
+def follow_up_history(state: dict) -> List[str]:
+    """
+    이번 질문이 후속 질문일 때만 이전 대화 반환 (독립 질문은 빈 리스트 → 시맨틱 캐시 사용 가능)
+
+    같은 스레드의 이전 답변은 에이전트와 관계없이 모두 남아 있으므로, 항상 이전 대화를 붙이면
+    스레드의 첫 질문 외에는 캐시를 읽지도 쓰지도 못합니다.
+    """
+    if not is_follow_up(state.get("input_query", "")):
+        return []
+    return conversation_history(state)
@@ -1,20 +1,34 @@
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_core.documents import Document
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from agent_state import get_thread_id
 from vector_store.builder import ensure_code_rule_vector_db_exists
+from vector_store.registry import get_vectorstore, OPENAI_EMBEDDING_MODEL
 
 import os
+import threading
 
-# 최초 실행 시 벡터DB 생성 (없으면)
-ensure_code_rule_vector_db_exists()
+# 규칙 벡터DB는 최초 검수 요청(또는 warm-up) 시점에 준비
+global_vectorstore = None
+_vectorstore_lock = threading.Lock()
 
-embedding_model = OpenAIEmbeddings()
-global_vectorstore = Chroma(
-    embedding_function=OpenAIEmbeddings(),
-    persist_directory="vector_store/db/code_rule_chroma"
-)
+def load_rule_vectorstore():
+    """코드 규칙 벡터DB 반환 (없으면 생성 후 로드)"""
+    global global_vectorstore
+    if global_vectorstore is None:
+        with _vectorstore_lock:
+            if global_vectorstore is None:
+                ensure_code_rule_vector_db_exists()
+                global_vectorstore = get_vectorstore(
+                    "vector_store/db/code_rule_chroma",
+                    model_name=OPENAI_EMBEDDING_MODEL,
+                    provider="openai"
+                )
+    return global_vectorstore
+
+def warm_up() -> None:
+    """코드 규칙 벡터DB 사전 로드"""
+    load_rule_vectorstore()
 
 # 코드 검수 LLM 체인 (최신 방식)
 llm = ChatOpenAI(model="gpt-4o-mini")
@@ -36,30 +50,54 @@ List clearly which rules are violated, and suggest how the code should be correc
 )
 code_review_chain = prompt | llm 
 
+# 스트리밍 중 LLM 이 아무 조각도 보내지 않았을 때의 안내 메시지
+EMPTY_FEEDBACK_MESSAGE = "코드 검수 결과를 생성하지 못했습니다."
+
 # 코드 검수 실행 함수
 def check_code(code: str) -> str:
-    related_rules = global_vectorstore.similarity_search(code, k=3)
+    related_rules = load_rule_vectorstore().similarity_search(code, k=3)
     rules_text = "\n\n".join([doc.page_content for doc in related_rules])
     return code_review_chain.invoke({"code": code, "rules": rules_text})
 
+async def acheck_code(code: str) -> str:
+    """check_code 의 비동기 버전"""
+    related_rules = await load_rule_vectorstore().asimilarity_search(code, k=3)
+    rules_text = "\n\n".join([doc.page_content for doc in related_rules])
+    return await code_review_chain.ainvoke({"code": code, "rules": rules_text})
+
 
 # LangGraph Supervisor용 invoke 함수
 def invoke(state: dict, config) -> dict:
+    feedback = check_code(state.get("input_query", ""))
+    return _build_state(state, config, feedback)
+
+async def ainvoke(state: dict, config) -> dict:
+    feedback = await acheck_code(state.get("input_query", ""))
+    return _build_state(state, config, feedback)
+
+async def astream(state: dict, config):
+    """스트리밍 버전: 검수 결과를 토큰 단위로 전달한 뒤 최종 메시지 전달"""
     code = state.get("input_query", "")
-    thread_id = (
-        getattr(config, "configurable", {}).get("thread_id")
-        if hasattr(config, "configurable")
-        else config.get("thread_id", "default")
-    )
-
-    feedback = check_code(code)
-    # print(feedback.content)
-    # ✅ messages 누적
-    new_messages = list(state.get("messages", []))  # 기존 메시지 유지
-    new_messages.append(f"🧠 코드 검수 결과:\n{feedback.content}")
+    related_rules = await load_rule_vectorstore().asimilarity_search(code, k=3)
+    rules_text = "\n\n".join([doc.page_content for doc in related_rules])
+
+    feedback = None
+    async for chunk in code_review_chain.astream({"code": code, "rules": rules_text}):
+        feedback = chunk if feedback is None else feedback + chunk
+        if chunk.content:
+            yield {"event": "token", "data": chunk.content}
+
+    if feedback is None:
+        yield {"event": "error", "data": {"detail": EMPTY_FEEDBACK_MESSAGE}}
+
+    yield {"event": "message", "data": _build_state(state, config, feedback)["messages"][-1]}
+
+def _build_state(state: dict, config, feedback) -> dict:
+    thread_id = get_thread_id(state, config)
 
+    content = feedback.content if feedback is not None else EMPTY_FEEDBACK_MESSAGE
+    # ✅ 새 메시지만 반환 (기존 messages 에는 그래프 리듀서가 누적)
     return {
-        **state,
-        "messages": new_messages,
+        "messages": [f"🧠 코드 검수 결과:\n{content}"],
         "thread_id": thread_id,
     }
@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
+from agent_state import get_thread_id
 
 # 환경변수 로드
 load_dotenv()
@@ -7,12 +8,10 @@ load_dotenv()
 # 전역에서 LLM 초기화
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
-# 이메일 생성 함수
-def generate_email(email_input: str) -> str:
-    """이메일 생성 함수"""
-    
-    # 프롬프트 구성
-    prompt = f"""
+# 이메일 프롬프트 구성
+def build_email_prompt(email_input: str) -> str:
+    """이메일 생성 프롬프트 구성"""
+    return f"""
 First, please extract the email purpose, recipient, tone, and main content from the user input below.
 If certain information is missing, assume the email purpose is 'request', the recipient is 'manager', and the tone is 'respectful'.
 
@@ -40,34 +39,50 @@ IMPORTANT:
 2. The sender is assumed to be "me" (not the recipient)
 3. Please make sure to generate the final email in Korean language.
 """
-    response = llm.invoke(prompt)
+
+# 이메일 생성 함수
+def generate_email(email_input: str) -> str:
+    """이메일 생성 함수"""
+    response = llm.invoke(build_email_prompt(email_input))
+    return response.content
+
+async def agenerate_email(email_input: str) -> str:
+    """generate_email 의 비동기 버전"""
+    response = await llm.ainvoke(build_email_prompt(email_input))
     return response.content
 
 
 # LangGraph Supervisor용 invoke 함수 
 def invoke(state: dict, config) -> dict:
     """LangGraph Supervisor용 invoke 함수"""
-    # 입력 쿼리 가져오기
-    email_input = state.get("input_query", "")
+    # 이메일 생성 함수 호출
+    generated_email = generate_email(state.get("input_query", ""))
+    return _build_state(state, config, generated_email)
+
+async def ainvoke(state: dict, config) -> dict:
+    """LangGraph Supervisor용 비동기 invoke 함수"""
+    generated_email = await agenerate_email(state.get("input_query", ""))
+    return _build_state(state, config, generated_email)
 
+async def astream(state: dict, config):
+    """스트리밍 버전: 이메일을 토큰 단위로 전달한 뒤 최종 메시지 전달"""
+    chunks = []
+    async for chunk in llm.astream(build_email_prompt(state.get("input_query", ""))):
+        if chunk.content:
+            chunks.append(chunk.content)
+            yield {"event": "token", "data": chunk.content}
+
+    yield {"event": "message", "data": _build_state(state, config, "".join(chunks))["messages"][-1]}
+
+def _build_state(state: dict, config, generated_email: str) -> dict:
     # 설정에서 thread_id 가져오기
-    thread_id = (
-        getattr(config, "configurable", {}).get("thread_id")
-        if hasattr(config, "configurable")
-        else config.get("thread_id", "default")
-    )
+    thread_id = get_thread_id(state, config)
 
-    # 이메일 생성 함수 호출
-    generated_email = generate_email(email_input)  # self 제거하고 직접 함수 호출
     # print(f"생성된 이메일:\n{generated_email}")
 
-    # messages 누적
-    new_messages = list(state.get("messages", []))  # 기존 메시지 유지
-    new_messages.append(f"📧 생성된 이메일:\n{generated_email}")
-
+    # 새 메시지만 반환 (기존 messages 에는 그래프 리듀서가 누적)
     return {
-        **state,
-        "messages": new_messages,
+        "messages": [f"📧 생성된 이메일:\n{generated_email}"],
         "thread_id": thread_id,
         "generated_email": generated_email  # 생성된 이메일 추가
     }
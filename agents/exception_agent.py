@@ -1,4 +1,5 @@
 from langchain_core.runnables.config import RunnableConfig
+from agent_state import get_thread_id
 
 def generate_fallback_response(message: str) -> str:
     return f"""
@@ -19,21 +20,23 @@ def generate_fallback_response(message: str) -> str:
 
 def invoke(state: dict, config: RunnableConfig) -> dict:
     input_query = state.get("input_query", "")
-    thread_id = (
-        getattr(config, "configurable", {}).get("thread_id")
-        if hasattr(config, "configurable")
-        else config.get("thread_id", "default")
-    )
+    thread_id = get_thread_id(state, config)
 
     fallback_answer = generate_fallback_response(input_query)
 
-    # ✅ messages 누적
-    new_messages = list(state.get("messages", []))
-    new_messages.append(f"❗ 예외 처리 결과:\n{fallback_answer}")
-
+    # ✅ 새 메시지만 반환 (기존 messages 에는 그래프 리듀서가 누적)
     return {
-        **state,
-        "messages": new_messages,
+        "messages": [f"❗ 예외 처리 결과:\n{fallback_answer}"],
         "agent": "exception_agent",
         "thread_id": thread_id
     }
+
+async def ainvoke(state: dict, config: RunnableConfig) -> dict:
+    # LLM 호출이 없으므로 동기 버전을 그대로 사용
+    return invoke(state, config)
+
+async def astream(state: dict, config: RunnableConfig):
+    # 고정 응답이므로 전체 답변을 토큰 이벤트 1개로 보낸 뒤 최종 메시지 전달
+    message = invoke(state, config)["messages"][-1]
+    yield {"event": "token", "data": message}
+    yield {"event": "message", "data": message}
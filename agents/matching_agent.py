@@ -1,98 +1,248 @@
 import os
-from typing import List, Dict
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+import time
+import threading
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from dotenv import load_dotenv
+from agent_state import get_thread_id
+from vector_store.employee_index import (
+    EMPLOYEE_DATA_PATH, employee_document, format_employee, get_employee_index, load_employee_records,
+    local_matching_enabled,
+)
+from vector_store.registry import get_openai_embeddings, get_vectorstore, release_vectorstore, OPENAI_EMBEDDING_MODEL
 
 load_dotenv()
 
+EMPLOYEE_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vector_store", "db", "employee_info_chroma"
+)
+MATCHING_LLM_MODEL = "gpt-4o-mini"
+
+
 def initialize_employee_vectorstore():
     """직원 정보 텍스트 파일을 구조화된 방식으로 벡터 스토어에 저장합니다."""
     
-    # 1. TXT 파일 로드
-    # 현재 스크립트의 절대 경로를 기준으로 파일 경로 설정
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    txt_file_path = os.path.join(current_dir, "vector_store", "docs", "employee_info", "smartfarm-employee-data-revised.txt")
-
+    # 1. TXT 파일을 필드 단위로 파싱 (이름/이메일/부서/직책/담당업무 + 담당업무 키워드를 메타데이터로 저장)
     try:
-        with open(txt_file_path, mode='r', encoding='utf-8') as file:
-            text_content = file.read()
-        print(f"✓ 텍스트 파일 로드 완료: {len(text_content)} 바이트")
+        records = load_employee_records(EMPLOYEE_DATA_PATH)
     except Exception as e:
         print(f"❌ 파일 로드 오류: {str(e)}")
         return None
-    
-    # 2. 텍스트를 행으로
-    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-    
-    # 3. 각 행을 직원 정보로 파싱
-    documents = []
-
-    for line in lines:
-        # 쉼표로 분리된 값 처리
-        parts = line.split(',')
-        if len(parts) >= 5:  # 최소한 5개 필드가 있는지 확인
-            name = parts[0].strip()
-            email = parts[1].strip()
-            department = parts[2].strip()
-            position = parts[3].strip()
-            job_description = parts[4].strip()
-            
-            # 직원 정보 텍스트 생성
-            employee_info = f"""
-            이름: {name}
-            이메일: {email}
-            부서: {department}
-            직책: {position}
-            담당업무: {job_description}
-            """
-            # Document 객체 생성
-            doc = Document(page_content=employee_info)
-            # print(doc)
-            documents.append(doc)
 
+    documents = [employee_document(record) for record in records]
     print(f"✓ {len(documents)}명의 직원 정보 파싱 완료")
 
-     # 4. 임베딩 모델 초기화
-    embedding_model = OpenAIEmbeddings()
+    # 2. 임베딩 모델 초기화
+    embedding_model = get_openai_embeddings()
     
-    # 5. 벡터 스토어 저장 경로 설정
-    persist_path = os.path.join(current_dir, "vector_store", "db", "employee_info_chroma")
+    # 3. 벡터 스토어 저장 경로 설정
+    persist_path = EMPLOYEE_DB_PATH
 
-    # 6. 디렉토리가 없으면 생성
+    # 4. 디렉토리가 없으면 생성
     os.makedirs(persist_path, exist_ok=True)
 
-    # 7. Chroma 벡터 스토어 생성
+    # 5. Chroma 벡터 스토어 생성
     vectorstore = Chroma.from_documents(
         documents=documents,
         embedding=embedding_model,
+        ids=[record["email"] for record in records],  # 다시 만들 때 같은 직원이 중복 저장되지 않도록 이메일을 ID 로 사용
         persist_directory=persist_path,
     )
 
-    # 8. 벡터 스토어 저장
+    # 6. 벡터 스토어 저장
     vectorstore.persist()
     print(f"직원 정보 벡터 DB 저장 완료: {persist_path}")
+
+    # 실행 중인 매칭기가 다음 요청에서 새 인덱스를 읽도록 표시
+    if _matcher is not None:
+        _matcher.invalidate()
     
     return vectorstore
 
+class EmployeeMatcher:
+    """
+    직원 벡터DB / 임베딩 / LLM 클라이언트를 프로세스 수명 동안 재사용하는 담당자 매칭기
+
+    직원 인덱스 파일(chroma.sqlite3 등)의 수정 시각/크기가 바뀌면 다음 요청에서 벡터DB 를 다시 엽니다.
+    확인 주기는 EMPLOYEE_INDEX_CHECK_SECONDS (기본 5초) 입니다.
+    """
+
+    def __init__(self, db_path: str = EMPLOYEE_DB_PATH, k: int = 3, model: str = MATCHING_LLM_MODEL,
+                 check_interval: Optional[float] = None):
+        """
+        Args:
+            db_path: 직원 정보 Chroma 디렉토리
+            k: 프롬프트에 넣을 후보 직원 수
+            model: 매칭 결과를 작성할 LLM 모델
+            check_interval: 인덱스 변경 확인 주기(초)
+        """
+        self.db_path = db_path
+        self.k = k
+        self.llm = ChatOpenAI(model=model, temperature=0)
+        self.check_interval = (
+            check_interval if check_interval is not None
+            else float(os.getenv("EMPLOYEE_INDEX_CHECK_SECONDS", "5"))
+        )
+        self.index = get_employee_index()
+        self._vectorstore = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _index_signature(self) -> Tuple:
+        """인덱스 디렉토리 안 파일들의 (경로, 수정 시각, 크기) 목록"""
+        signature = []
+        for root, _, files in os.walk(self.db_path):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(signature))
+
+    def vectorstore(self):
+        """캐시된 직원 벡터DB 반환 (인덱스가 바뀌었으면 다시 로드)"""
+        now = time.monotonic()
+        if self._vectorstore is not None and now - self._checked_at < self.check_interval:
+            return self._vectorstore
+
+        with self._lock:
+            signature = self._index_signature()
+            if self._vectorstore is not None and signature != self._signature:
+                print("🔄 직원 정보 벡터 DB 변경 감지, 다시 로드합니다.")
+                release_vectorstore(self.db_path, reload_from_disk=True)
+                self._vectorstore = None
+
+            if self._vectorstore is None:
+                # 레지스트리의 공유 임베딩 / Chroma 핸들 사용
+                self._vectorstore = get_vectorstore(
+                    self.db_path,
+                    model_name=OPENAI_EMBEDDING_MODEL,
+                    provider="openai"
+                )
+            self._signature = signature
+            self._checked_at = now
+            return self._vectorstore
+
+    def invalidate(self) -> None:
+        """다음 요청에서 인덱스 변경 여부를 바로 확인하도록 표시"""
+        self._checked_at = 0.0
+
+    def find_candidates(self, query: str) -> List[Document]:
+        return self.vectorstore().similarity_search(query, k=self.k)
+
+    async def afind_candidates(self, query: str) -> List[Document]:
+        return await self.vectorstore().asimilarity_search(query, k=self.k)
+
+    def local_match(self, query: str) -> Dict:
+        """
+        직원 색인으로 로컬 매칭 (임베딩 / LLM 호출 없음)
+
+        Returns:
+            EmployeeIndex.lookup 결과 ("result" 에 확정된 경우의 매칭 결과 문자열 추가)
+        """
+        if not local_matching_enabled():
+            return {"match": None, "method": None, "keywords": [], "candidates": [], "result": None}
+
+        lookup = self.index.lookup(query, k=self.k)
+        lookup["result"] = None
+        if lookup["match"] is not None:
+            print(f"⚡ 로컬 담당자 매칭 ({lookup['method']}): {lookup['match']['name']}")
+            lookup["result"] = format_local_match(lookup)
+        return lookup
+
+    def _merge_candidates(self, keyword_candidates: List[Dict], related_employees: List[Document]) -> List[Document]:
+        """키워드 후보 + 벡터 검색 후보 (이메일 기준 중복 제거)"""
+        documents = [employee_document(record) for record in keyword_candidates]
+        seen = {record["email"] for record in keyword_candidates}
+        for doc in related_employees:
+            email = doc.metadata.get("email") or next(
+                (record["email"] for record in keyword_candidates if record["email"] in doc.page_content), None
+            )
+            if email is None or email not in seen:
+                documents.append(doc)
+                if email:
+                    seen.add(email)
+        return documents
+
+    def match(self, query: str, project_name: str) -> str:
+        """질문에 맞는 담당자 매칭 결과 생성 (이름/키워드로 확정되지 않는 모호한 질문만 LLM 사용)"""
+        lookup = self.local_match(query)
+        if lookup["result"] is not None:
+            return lookup["result"]
+
+        related_employees = self._merge_candidates(lookup["candidates"], self.find_candidates(query))
+        response = self.llm.invoke(build_matching_prompt(query, project_name, related_employees))
+        return response.content
+
+    async def amatch(self, query: str, project_name: str) -> str:
+        """match 의 비동기 버전"""
+        lookup = self.local_match(query)
+        if lookup["result"] is not None:
+            return lookup["result"]
+
+        related_employees = self._merge_candidates(lookup["candidates"], await self.afind_candidates(query))
+        response = await self.llm.ainvoke(build_matching_prompt(query, project_name, related_employees))
+        return response.content
+
+    async def astream_match(self, query: str, project_name: str) -> AsyncIterator[str]:
+        """매칭 결과를 토큰 단위로 생성 (로컬 매칭은 한 번에 전달)"""
+        lookup = self.local_match(query)
+        if lookup["result"] is not None:
+            yield lookup["result"]
+            return
+
+        related_employees = self._merge_candidates(lookup["candidates"], await self.afind_candidates(query))
+        async for chunk in self.llm.astream(build_matching_prompt(query, project_name, related_employees)):
+            if chunk.content:
+                yield chunk.content
+
+
+_matcher: Optional[EmployeeMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> EmployeeMatcher:
+    """프로세스 공유 EmployeeMatcher 반환 (최초 호출 시 1회 생성)"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = EmployeeMatcher()
+    return _matcher
+
+def format_local_match(lookup: Dict) -> str:
+    """로컬 매칭 결과를 LLM 응답과 같은 형식으로 작성"""
+    record = lookup["match"]
+    if lookup["method"] == "name":
+        reason = "질문에서 언급한 직원입니다."
+    else:
+        keywords = ", ".join(f"'{keyword}'" for keyword in lookup["keywords"])
+        reason = f"질문의 {keywords} 키워드가 담당업무({record['duty']}) 및 부서와 일치합니다."
+    return f"{format_employee(record)}\n\n{reason}"
+
 # VectorDB 로딩
 def load_vectorstore():
-    embedding = OpenAIEmbeddings()
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    vector_db_path = os.path.join(current_dir, "vector_store", "db", "employee_info_chroma")
-    
-    return Chroma(
-        embedding_function=embedding,
-        persist_directory=vector_db_path
-    )
+    return get_matcher().vectorstore()
+
+def warm_up() -> None:
+    """직원 정보 색인 / 벡터DB / LLM 클라이언트 사전 로드"""
+    get_matcher().index.lookup("")
+    load_vectorstore()
 
 def match_person_for_query(query: str, project_name: str):
-    vs = load_vectorstore()
-    related_employees = vs.similarity_search(query, k=3)
-    # print(related_employees)
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    return get_matcher().match(query, project_name)
+
+async def amatch_person_for_query(query: str, project_name: str):
+    """match_person_for_query 의 비동기 버전"""
+    return await get_matcher().amatch(query, project_name)
 
+def build_matching_prompt(query: str, project_name: str, related_employees: List[Document]) -> str:
+    """담당자 매칭 프롬프트 구성"""
     # 직원 정보 포맷팅
     employee_info = ""
     for i, doc in enumerate(related_employees, 1):
@@ -100,7 +250,7 @@ def match_person_for_query(query: str, project_name: str):
     
     # print("✅employee_info", employee_info)
     # 직접 추천 생성
-    prompt = f"""
+    return f"""
 You are the person-in-charge matching agent for {project_name}. Your role is to analyze the user's question and connect them with the appropriate person-in-charge.
 
 Instructions:
@@ -132,10 +282,6 @@ Response requirements:
 
 IMPORTANT: Generate response in Korean language. Be direct and concise.
 """
-    
-    response = llm.invoke(prompt)
-    # print(response)
-    return response.content
 
 # LangGraph Supervisor용 invoke 함수 
 def invoke(state: dict, config) -> dict:
@@ -144,24 +290,39 @@ def invoke(state: dict, config) -> dict:
     query = state.get("input_query", "")
     project_name = state.get("project_name", "스마트팜 프로젝트")  # 기본값 설정
 
-    # 설정에서 thread_id 가져오기
-    thread_id = (
-        getattr(config, "configurable", {}).get("thread_id")
-        if hasattr(config, "configurable")
-        else config.get("thread_id", "default")
-    )
-
     # 담당자 매칭 함수 호출
     result = match_person_for_query(query, project_name)
-    # print(f"담당자 매칭 결과:\n{result}")
+    return _build_state(state, config, result)
+
+async def ainvoke(state: dict, config) -> dict:
+    """LangGraph Supervisor용 비동기 invoke 함수"""
+    query = state.get("input_query", "")
+    project_name = state.get("project_name", "스마트팜 프로젝트")
+
+    result = await amatch_person_for_query(query, project_name)
+    return _build_state(state, config, result)
+
+async def astream(state: dict, config):
+    """스트리밍 버전: 매칭 결과를 토큰 단위로 전달한 뒤 최종 메시지 전달"""
+    query = state.get("input_query", "")
+    project_name = state.get("project_name", "스마트팜 프로젝트")
+
+    chunks = []
+    async for token in get_matcher().astream_match(query, project_name):
+        chunks.append(token)
+        yield {"event": "token", "data": token}
+
+    yield {"event": "message", "data": _build_state(state, config, "".join(chunks))["messages"][-1]}
 
-    # messages 누적
-    new_messages = list(state.get("messages", []))  # 기존 메시지 유지
-    new_messages.append(f"👨‍💼 담당자 매칭 결과:\n{result}")
+def _build_state(state: dict, config, result: str) -> dict:
+    # 설정에서 thread_id 가져오기
+    thread_id = get_thread_id(state, config)
+
+    # print(f"담당자 매칭 결과:\n{result}")
 
+    # 새 메시지만 반환 (기존 messages 에는 그래프 리듀서가 누적)
     return {
-        **state,
-        "messages": new_messages,
+        "messages": [f"👨‍💼 담당자 매칭 결과:\n{result}"],
         "thread_id": thread_id,
         "matching_result": result  # 매칭 결과 추가
     }
@@ -0,0 +1,670 @@
+import os
+import time
+import asyncio
+import threading
+from typing import Dict, Any, AsyncIterator, List, Optional, Callable, Tuple
+from dotenv import load_dotenv
+import openai
+from langchain_core.runnables.config import RunnableConfig
+from agent_state import AgentState, get_thread_id, agent_debug_enabled, follow_up_history
+from vector_store.registry import get_embeddings, get_vectorstore
+from vector_store.semantic_cache import get_semantic_cache, semantic_cache_enabled
+from vector_store.keyword_index import get_keyword_index, hybrid_search_enabled
+from vector_store.hybrid_search import hybrid_search, ahybrid_search
+from vector_store.reranker import get_reranker
+from vector_store.context_builder import ContextBuilder, context_compression_enabled
+from vector_store.retrieval import extract_filters, list_filenames
+
+'''
+보고서 벡터 DB 기반 에이전트 공통 구현 (find_report_agent / report_writing_guide_agent)
+
+질의 임베딩 → 시맨틱 캐시 조회 → (선택) 메타데이터 필터 추출 → 하이브리드 검색 + 재순위
+→ 컨텍스트 압축 → LLM 답변 생성(동기 / 비동기 / 스트리밍) → 캐시 저장 흐름을 공유하고,
+하위 클래스는 시스템 프롬프트, 검색 문서 수, 필터 사용 여부만 정합니다.
+'''
+
+GENERATION_ERROR_MESSAGE = "답변 생성 과정에서 오류가 발생했습니다"
+
+
+class GenerationError(Exception):
+    """LLM 답변 생성 실패 (스트리밍 도중 실패 포함)"""
+
+
+class ReportAgentBase:
+    """
+    보고서 문서를 검색해 LLM 으로 답변하는 에이전트의 공통 기반 클래스
+    """
+
+    agent_name = "report_agent"  # 시맨틱 캐시 네임스페이스
+    max_sources = 5  # 응답에 포함할 최대 출처 수
+    max_top_k: Optional[int] = None  # 검색 문서 수 상한 (None 이면 k 그대로 사용)
+    use_filters = False  # 질의에서 파일명 / 문서 유형 / 날짜 / 페이지 필터를 추출할지 여부
+    system_prompt = "Please answer based on the provided documents. Respond **only** in Korean."
+
+    def __init__(
+        self,
+        db_path: str = "./vector_store/db",
+        embedding_model_name: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS",
+        openai_model: str = "gpt-4o-mini",
+        temperature: float = 0.1,
+        k: int = 5
+    ):
+        """
+        에이전트 초기화
+
+        Args:
+            db_path: 벡터 DB 경로
+            embedding_model_name: 임베딩 모델 이름
+            openai_model: OpenAI 모델 이름
+            temperature: 생성 온도
+            k: 검색할 문서 수
+        """
+        self.db_path = db_path
+        self.embedding_model_name = embedding_model_name
+        self.openai_model = openai_model
+        self.temperature = temperature
+        self.k = k
+
+        # OpenAI API 키 로드
+        load_dotenv()
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not self.openai_api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+        # OpenAI 클라이언트 설정 (동기 / 비동기)
+        openai.api_key = self.openai_api_key
+        self.async_client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+
+        # 임베딩 모델 및 벡터 DB 초기화
+        self._init_vector_db()
+
+    def _init_vector_db(self) -> None:
+        """벡터 DB 및 임베딩 모델 초기화"""
+        print(f"✅ {type(self).__name__} 초기화 완료")
+        try:
+            # 벡터 DB 경로 확인
+            if not os.path.exists(self.db_path):
+                raise FileNotFoundError(f"Vector DB not found at {self.db_path}")
+
+            # 공유 레지스트리에서 임베딩 모델 및 벡터 DB 가져오기 (프로세스당 1회 로드)
+            self.embeddings = get_embeddings(self.embedding_model_name)
+            self.vectordb = get_vectorstore(self.db_path, self.embedding_model_name)
+
+            # 반복 질의용 시맨틱 캐시 (같은 벡터 DB 를 쓰는 에이전트끼리 공유, 네임스페이스로 구분)
+            self.cache = get_semantic_cache(self.db_path) if semantic_cache_enabled() else None
+
+            # 식별자/조항 번호 검색용 BM25 키워드 색인 (첫 검색 시 동기화)
+            self.keyword_index = get_keyword_index(self.vectordb, self.db_path) if hybrid_search_enabled() else None
+
+            # 겹친 청크 병합 + 토큰 예산 내 문장 선택으로 LLM 입력 토큰 절감
+            self.context_builder = (
+                ContextBuilder(self.embeddings, model_name=self.openai_model)
+                if context_compression_enabled() else None
+            )
+
+            # 질의에서 파일명 필터를 찾기 위한 색인 파일명 목록 (청크 수가 바뀌면 다시 조회)
+            self._filenames: List[str] = []
+            self._filenames_count = -1
+            print(f"Vector DB loaded from {self.db_path}")
+
+        except Exception as e:
+            self.vectordb = None
+            self.embeddings = None
+            self.cache = None
+            self.keyword_index = None
+            self.context_builder = None
+            print(f"Error initializing vector DB: {str(e)}")
+            raise
+
+    def _build_messages(self, query: str, context: str, history: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """LLM 에 전달할 메시지 구성 (이전 대화 답변은 질문 앞에 assistant 메시지로 포함)"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            *({"role": "assistant", "content": text} for text in history or []),
+            {"role": "user", "content": f"질문: {query}\n\n관련 문서:\n{context}"}
+        ]
+
+    def generate_response(self, query: str, context: str, history: Optional[List[str]] = None) -> str:
+        """
+        OpenAI API를 사용하여 응답 생성
+
+        Args:
+            query: 사용자 질문
+            context: 검색된 문서 컨텍스트
+            history: 이전 대화 답변 (후속 질문용)
+
+        Returns:
+            str: 생성된 응답
+
+        Raises:
+            GenerationError: API 호출 실패
+        """
+        try:
+            response = openai.chat.completions.create(
+                model=self.openai_model,
+                temperature=self.temperature,
+                messages=self._build_messages(query, context, history)
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            raise GenerationError(f"{GENERATION_ERROR_MESSAGE}: {str(e)}") from e
+
+    async def agenerate_response(self, query: str, context: str, history: Optional[List[str]] = None) -> str:
+        """generate_response 의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.openai_model,
+                temperature=self.temperature,
+                messages=self._build_messages(query, context, history)
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            raise GenerationError(f"{GENERATION_ERROR_MESSAGE}: {str(e)}") from e
+
+    async def astream_response(self, query: str, context: str, history: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        OpenAI 스트리밍 응답을 토큰(조각) 단위로 생성
+
+        Args:
+            query: 사용자 질문
+            context: 검색된 문서 컨텍스트
+            history: 이전 대화 답변 (후속 질문용)
+
+        Yields:
+            str: 생성된 응답 조각
+
+        Raises:
+            GenerationError: 스트림 시작 또는 도중 실패 (이미 전달한 조각은 불완전한 답변)
+        """
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.openai_model,
+                temperature=self.temperature,
+                messages=self._build_messages(query, context, history),
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            raise GenerationError(f"{GENERATION_ERROR_MESSAGE}: {str(e)}") from e
+
+    def _build_context(
+        self,
+        retrieved_docs: List[Any],
+        query_vector: Optional[List[float]] = None
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        검색된 문서로 LLM 컨텍스트와 출처 목록 구성
+
+        Args:
+            retrieved_docs: 검색된 문서 리스트
+            query_vector: 질의 임베딩 (컨텍스트 압축 시 문장 선택에 사용)
+
+        Returns:
+            context, sources, context_stats: 컨텍스트 문자열, 출처 정보 리스트, 컨텍스트 토큰 통계
+        """
+        context_entries = []
+        sources = []
+
+        for i, doc in enumerate(retrieved_docs):
+            source_path = doc.metadata.get('source', 'Unknown')
+            section = doc.metadata.get('section',
+                                    doc.metadata.get('dl_meta', {}).get('headings', ['미분류 섹션'])[0]
+                                    if 'dl_meta' in doc.metadata else '미분류 섹션')
+            filename = os.path.basename(source_path) if isinstance(source_path, str) else 'Unknown'
+
+            context_entry = f"[문서 {i+1}] 출처: {filename}, 섹션: {section}\n{doc.page_content}"
+            context_entries.append(context_entry)
+
+            source_info = {
+                "content": doc.page_content,
+                "section": section,
+                "source": source_path,
+                "filename": filename,
+                "rank": i + 1
+            }
+            sources.append(source_info)
+
+        if self.context_builder is None:
+            return "\n\n".join(context_entries), sources, {}
+
+        # 출처는 청크 단위 그대로, LLM 컨텍스트만 압축
+        context, context_stats = self.context_builder.build(retrieved_docs, query_vector)
+        return context, sources, context_stats
+
+    async def _abuild_context(
+        self,
+        retrieved_docs: List[Any],
+        query_vector: Optional[List[float]] = None
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """_build_context 의 비동기 버전 (문장 임베딩은 스레드에서 실행)"""
+        return await asyncio.to_thread(self._build_context, retrieved_docs, query_vector)
+
+    def _known_filenames(self) -> List[str]:
+        count = self.vectordb._collection.count()
+        if count != self._filenames_count:
+            self._filenames = list_filenames(self.vectordb)
+            self._filenames_count = count
+        return self._filenames
+
+    def _extract_filters(self, query: str) -> Dict[str, Any]:
+        """질의에서 파일명 / 문서 유형 / 날짜 / 페이지 조건 추출 (use_filters 가 False 면 항상 빈 조건)"""
+        if not self.use_filters:
+            return {}
+        try:
+            filters = extract_filters(query, self._known_filenames())
+        except Exception as e:
+            print(f"⚠️ 검색 필터 추출 실패, 필터 없이 검색합니다: {e}")
+            return {}
+        if filters:
+            print(f"🔎 검색 필터: {filters}")
+        return filters
+
+    async def _aextract_filters(self, query: str) -> Dict[str, Any]:
+        """_extract_filters 의 비동기 버전 (파일명 목록 조회는 SQLite 호출이므로 스레드에서 실행)"""
+        if not self.use_filters:
+            return {}
+        return await asyncio.to_thread(self._extract_filters, query)
+
+    def _retrieval_plan(self) -> Tuple[int, Any, int]:
+        """
+        검색 문서 수 결정 (재순위 사용 시 후보를 넉넉히 가져온 뒤 상위만 사용)
+
+        Returns:
+            top_k, reranker, fetch_k: 최종 문서 수, 재순위 모델 (미사용 시 None), 1차 검색 후보 수
+        """
+        top_k = min(self.k, self.max_top_k) if self.max_top_k else self.k
+        reranker = get_reranker()
+        fetch_k = max(reranker.max_candidates, top_k) if reranker else top_k
+        return top_k, reranker, fetch_k
+
+    @staticmethod
+    def _log_unfiltered_retry() -> None:
+        # 조건에 맞는 청크가 없으면 (잘못 추출된 필터 등) 전체에서 다시 검색
+        print("⚠️ 필터에 맞는 문서가 없어 전체 문서에서 다시 검색합니다.")
+
+    def _retrieve(self, query: str, query_vector: List[float], filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """벡터 + 키워드 하이브리드 검색 후 (선택) cross-encoder 재순위 (이미 계산한 질의 임베딩 사용)"""
+        top_k, reranker, fetch_k = self._retrieval_plan()
+
+        search_start = time.perf_counter()
+        retrieved_docs = hybrid_search(self.vectordb, self.keyword_index, query, query_vector, k=fetch_k, filters=filters)
+        if not retrieved_docs and filters:
+            self._log_unfiltered_retry()
+            retrieved_docs = hybrid_search(self.vectordb, self.keyword_index, query, query_vector, k=fetch_k)
+        search_ms = (time.perf_counter() - search_start) * 1000
+
+        if reranker is None:
+            print(f"🔍 VectorDB 검색 시간: {search_ms:.0f}ms")
+            return retrieved_docs
+
+        reranked_docs, rerank_stats = reranker.rerank(query, retrieved_docs, top_k)
+        self._print_retrieval_timings(search_ms, rerank_stats)
+        return reranked_docs
+
+    async def _aretrieve(self, query: str, query_vector: List[float], filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """_retrieve 의 비동기 버전 (재순위 채점은 스레드에서 실행)"""
+        top_k, reranker, fetch_k = self._retrieval_plan()
+
+        search_start = time.perf_counter()
+        retrieved_docs = await ahybrid_search(self.vectordb, self.keyword_index, query, query_vector, k=fetch_k, filters=filters)
+        if not retrieved_docs and filters:
+            self._log_unfiltered_retry()
+            retrieved_docs = await ahybrid_search(self.vectordb, self.keyword_index, query, query_vector, k=fetch_k)
+        search_ms = (time.perf_counter() - search_start) * 1000
+
+        if reranker is None:
+            print(f"🔍 VectorDB 검색 시간: {search_ms:.0f}ms")
+            return retrieved_docs
+
+        reranked_docs, rerank_stats = await asyncio.to_thread(reranker.rerank, query, retrieved_docs, top_k)
+        self._print_retrieval_timings(search_ms, rerank_stats)
+        return reranked_docs
+
+    @staticmethod
+    def _print_retrieval_timings(search_ms: float, rerank_stats: Dict[str, Any]) -> None:
+        budget_note = " (지연 예산 초과로 일부만 채점)" if rerank_stats["budget_exceeded"] else ""
+        print(
+            f"🔍 검색 {search_ms:.0f}ms (후보 {rerank_stats['candidates']}개) → "
+            f"재순위 {rerank_stats['rerank_ms']:.0f}ms (채점 {rerank_stats['scored']}개){budget_note}"
+        )
+
+    async def _aembed_query(self, query: str) -> List[float]:
+        """질의 임베딩 (CPU 연산은 스레드에서 실행)"""
+        return await asyncio.to_thread(self.embeddings.embed_query, query)
+
+    def _cache_namespace(self, project_name: Optional[str], filters: Optional[Dict[str, Any]] = None) -> str:
+        # 임베딩이 비슷해도 날짜/파일 조건이 다른 질의는 다른 답변이므로 필터별로 네임스페이스 분리
+        namespace = f"{self.agent_name}:{project_name or 'default'}"
+        if filters:
+            namespace += ":" + ",".join(f"{key}={filters[key]}" for key in sorted(filters))
+        return namespace
+
+    def _cache_lookup(
+        self,
+        query_vector: List[float],
+        project_name: Optional[str],
+        filters: Optional[Dict[str, Any]] = None,
+        history: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """시맨틱 캐시 조회 (적중 시 검색 결과 형식으로 반환)"""
+        # 이전 대화를 참고한 후속 질문의 답변은 대화마다 다르므로 캐시하지 않음
+        if self.cache is None or history:
+            return None
+        cached = self.cache.lookup(self._cache_namespace(project_name, filters), query_vector)
+        if cached is None:
+            return None
+        return {**cached, "success": True, "cached": True}
+
+    def _cache_store(
+        self,
+        query: str,
+        query_vector: List[float],
+        project_name: Optional[str],
+        result: Dict[str, Any],
+        filters: Optional[Dict[str, Any]] = None,
+        history: Optional[List[str]] = None
+    ) -> None:
+        """정상 생성된 답변만 시맨틱 캐시에 저장 (이전 대화를 참고한 답변 제외)"""
+        if self.cache is None or not result["success"] or history:
+            return
+        self.cache.store(
+            self._cache_namespace(project_name, filters),
+            query,
+            query_vector,
+            {"answer": result["answer"], "sources": result["sources"], "context": result["context"]}
+        )
+
+    @staticmethod
+    def _generation_error_result(
+        e: GenerationError,
+        sources: List[Dict[str, Any]],
+        context: str,
+        context_stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """답변 생성 실패 결과 (success=False 이므로 캐시에 저장되지 않음)"""
+        return {
+            "answer": str(e),
+            "sources": sources,
+            "context": context,
+            "context_stats": context_stats,
+            "success": False
+        }
+
+    def _error_result(self, e: Exception) -> Dict[str, Any]:
+        print(f"Error searching documents: {str(e)}")
+        return {
+            "answer": f"문서 검색 과정에서 오류가 발생했습니다: {str(e)}",
+            "sources": [],
+            "context": "",
+            "success": False
+        }
+
+    @staticmethod
+    def _not_ready_result() -> Dict[str, Any]:
+        return {
+            "answer": "벡터 DB가 초기화되지 않았습니다.",
+            "sources": [],
+            "success": False
+        }
+
+    def search_documents(
+        self,
+        query: str,
+        project_name: Optional[str] = None,
+        history: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        문서 검색 후 답변 생성
+
+        Args:
+            query: 사용자 질문
+            project_name: 프로젝트 이름 (캐시 네임스페이스)
+            history: 이전 대화 답변 (있으면 LLM 에 함께 전달하고 캐시는 사용하지 않음)
+
+        Returns:
+            Dict: answer, sources, context, context_stats, success (캐시 적중 시 cached)
+        """
+        if not self.vectordb:
+            return self._not_ready_result()
+
+        try:
+            query_vector = self.embeddings.embed_query(query)
+            filters = self._extract_filters(query)
+            cached = self._cache_lookup(query_vector, project_name, filters, history)
+            if cached:
+                return cached
+
+            retrieved_docs = self._retrieve(query, query_vector, filters)
+
+            # ✅ 상위 문서만 context로 사용
+            context, sources, context_stats = self._build_context(retrieved_docs, query_vector)
+
+            # ✅ LLM 응답 생성 시간 측정
+            gen_start = time.perf_counter()
+            try:
+                answer = self.generate_response(query, context, history)
+            except GenerationError as e:
+                return self._generation_error_result(e, sources, context, context_stats)
+            print(f"🧠 LLM 응답 생성 시간: {time.perf_counter() - gen_start:.2f}초")
+
+            result = {
+                "answer": answer,
+                "sources": sources,
+                "context": context,
+                "context_stats": context_stats,
+                "success": True
+            }
+            self._cache_store(query, query_vector, project_name, result, filters, history)
+            return result
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def asearch_documents(
+        self,
+        query: str,
+        project_name: Optional[str] = None,
+        history: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """search_documents 의 비동기 버전"""
+        if not self.vectordb:
+            return self._not_ready_result()
+
+        try:
+            query_vector = await self._aembed_query(query)
+            filters = await self._aextract_filters(query)
+            cached = self._cache_lookup(query_vector, project_name, filters, history)
+            if cached:
+                return cached
+
+            retrieved_docs = await self._aretrieve(query, query_vector, filters)
+
+            context, sources, context_stats = await self._abuild_context(retrieved_docs, query_vector)
+
+            gen_start = time.perf_counter()
+            try:
+                answer = await self.agenerate_response(query, context, history)
+            except GenerationError as e:
+                return self._generation_error_result(e, sources, context, context_stats)
+            print(f"🧠 LLM 응답 생성 시간: {time.perf_counter() - gen_start:.2f}초")
+
+            result = {
+                "answer": answer,
+                "sources": sources,
+                "context": context,
+                "context_stats": context_stats,
+                "success": True
+            }
+            self._cache_store(query, query_vector, project_name, result, filters, history)
+            return result
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def format_agent_response(self, search_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        에이전트 응답 형식 구성
+
+        Args:
+            search_result: 검색 결과
+
+        Returns:
+            Dict: 형식화된 응답
+        """
+        if search_result["success"]:
+            message = {
+                "answer": search_result["answer"],
+                "sources": search_result["sources"][:self.max_sources]  # 상위 max_sources 개 소스만 포함
+            }
+        else:
+            message = {
+                "error": search_result["answer"]
+            }
+
+        return {
+            "messages": [message]
+        }
+
+    def invoke(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """
+        에이전트 호출 메서드
+
+        Args:
+            state: 현재 상태
+            config: 실행 설정
+
+        Returns:
+            AgentState: 업데이트된 상태
+        """
+        # 문서 검색 수행
+        search_result = self.search_documents(
+            state.get("input_query", ""), state.get("project_name"), follow_up_history(state)
+        )
+        return self._build_state(state, config, search_result)
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """invoke 의 비동기 버전"""
+        search_result = await self.asearch_documents(
+            state.get("input_query", ""), state.get("project_name"), follow_up_history(state)
+        )
+        return self._build_state(state, config, search_result)
+
+    async def astream(self, state: AgentState, config: RunnableConfig) -> AsyncIterator[Dict[str, Any]]:
+        """
+        스트리밍 호출: 검색된 출처(sources) → 생성 토큰(token) → 최종 메시지(message) 순으로 이벤트 생성
+
+        Args:
+            state: 현재 상태
+            config: 실행 설정
+
+        Yields:
+            Dict: {"event": 이벤트 종류, "data": 데이터}
+        """
+        query = state.get("input_query", "")
+        if not self.vectordb:
+            yield {"event": "message", "data": self.format_agent_response(self._not_ready_result())["messages"][0]}
+            return
+
+        project_name = state.get("project_name")
+        history = follow_up_history(state)
+        try:
+            query_vector = await self._aembed_query(query)
+            filters = await self._aextract_filters(query)
+            cached = self._cache_lookup(query_vector, project_name, filters, history)
+            if cached:
+                yield {"event": "sources", "data": cached["sources"][:self.max_sources]}
+                yield {"event": "token", "data": cached["answer"]}
+                yield {"event": "message", "data": self.format_agent_response(cached)["messages"][0]}
+                return
+
+            retrieved_docs = await self._aretrieve(query, query_vector, filters)
+            context, sources, context_stats = await self._abuild_context(retrieved_docs, query_vector)
+        except Exception as e:
+            search_result = self._error_result(e)
+            yield {"event": "message", "data": self.format_agent_response(search_result)["messages"][0]}
+            return
+
+        yield {"event": "sources", "data": sources[:self.max_sources]}
+
+        tokens = []
+        try:
+            async for token in self.astream_response(query, context, history):
+                tokens.append(token)
+                yield {"event": "token", "data": token}
+        except GenerationError as e:
+            # 도중에 끊긴 답변은 캐시하지 않고 오류 메시지로 응답
+            search_result = self._generation_error_result(e, sources, context, context_stats)
+            yield {"event": "message", "data": self.format_agent_response(search_result)["messages"][0]}
+            return
+
+        search_result = {
+            "answer": "".join(tokens),
+            "sources": sources,
+            "context": context,
+            "context_stats": context_stats,
+            "success": True
+        }
+        self._cache_store(query, query_vector, project_name, search_result, filters, history)
+        yield {"event": "message", "data": self.format_agent_response(search_result)["messages"][0]}
+
+    def _build_state(self, state: AgentState, config: RunnableConfig, search_result: Dict[str, Any]) -> Dict[str, Any]:
+        """검색 결과로 상태 변경분 구성"""
+        # 스레드 ID 추출
+        thread_id = get_thread_id(state, config)
+
+        # 응답 형식화
+        response = self.format_agent_response(search_result)
+
+        # 상태 변경분만 반환 (기존 messages 에는 그래프 리듀서가 누적)
+        delta = {
+            "messages": response["messages"],
+            "agent": "search_agent",
+            "thread_id": thread_id
+        }
+        if agent_debug_enabled():
+            delta["raw_search_result"] = search_result  # 디버깅용 원시 검색 결과 (컨텍스트 문자열 포함)
+        return delta
+
+
+class SharedReportAgent:
+    """
+    프로세스 공유 에이전트 인스턴스 (최초 호출 시 1회만 생성, import 시점에는 모델을 로드하지 않음)
+
+    에이전트 모듈은 get / warm_up / invoke / ainvoke / astream 을 모듈 함수로 노출합니다.
+    """
+
+    def __init__(self, factory: Callable[[], ReportAgentBase]):
+        self.factory = factory
+        self.agent: Optional[ReportAgentBase] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ReportAgentBase:
+        """전역 에이전트 인스턴스 반환 (없으면 생성)"""
+        if self.agent is None:
+            with self._lock:
+                if self.agent is None:
+                    self.agent = self.factory()
+        return self.agent
+
+    def warm_up(self) -> None:
+        """임베딩 모델, 벡터 DB 및 (사용 시) 재순위 모델 사전 로드"""
+        self.get()
+        get_reranker()
+
+    def invoke(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """함수형 인터페이스로 에이전트 호출"""
+        return self.get().invoke(state, config)
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """함수형 인터페이스의 비동기 버전"""
+        return await self.get().ainvoke(state, config)
+
+    async def astream(self, state: AgentState, config: RunnableConfig) -> AsyncIterator[Dict[str, Any]]:
+        """함수형 인터페이스의 스트리밍 버전"""
+        async for event in self.get().astream(state, config):
+            yield event
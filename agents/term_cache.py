@@ -0,0 +1,215 @@
+import os
+import re
+import html
+import time
+import sqlite3
+import threading
+import unicodedata
+from typing import List, Optional
+
+'''
+용어 설명 영구 캐시 (SQLite)
+
+word_explain_agent 가 같은 용어(예: NDVI, MQTT)를 물을 때마다 Tavily 검색과 LLM 호출을
+반복하지 않도록 (정규화된 용어, 프로젝트명) 단위로 설명을 저장합니다.
+- TTL 이 지난 항목은 조회 시 무시되고 다시 생성됨
+- 회의록 요약의 "신입 직원을 위한 생소한 용어" 목록으로 미리 채워둘 수 있음
+'''
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TERM_CACHE_PATH = os.path.join(BASE_DIR, "cache", "term_cache.sqlite3")
+
+# 용어 뒤에 붙는 질문 표현 (예: "NDVI가 뭐야?", "MQTT란 무엇인가요")
+QUESTION_SUFFIX_PATTERN = re.compile(
+    r"\s*(무엇인가요|무엇이에요|무엇입니까|무엇|뭔가요|뭐예요|뭐에요|뭐야|뭐지|뭐임|무슨\s*뜻.*|"
+    r"뜻이?\s*뭐.*|의미가?\s*뭐.*|설명해\s*줘|설명해\s*주세요|알려\s*줘|알려\s*주세요)\s*$"
+)
+# 질문 표현 앞의 조사 → 앞 글자에 받침이 있어야 하는지 (이란/이/은 은 받침 뒤, 란/가/는 은 받침 없는 글자 뒤)
+QUESTION_PARTICLES = (("이란", True), ("란", False), ("이", True), ("가", False), ("은", True), ("는", False))
+GLOSSARY_HEADER = "신입 직원을 위한 생소한 용어"
+NO_CONTENT_MESSAGE = "해당 내용에 대한 발언은 없었습니다"
+
+
+def _has_final_consonant(char: str) -> Optional[bool]:
+    """한글 음절의 받침 유무 (한글 음절이 아니면 None)"""
+    if not "가" <= char <= "힣":
+        return None
+    return (ord(char) - ord("가")) % 28 != 0
+
+
+def _strip_particle(term: str) -> str:
+    """
+    질문 표현 앞의 조사 제거 (앞 글자의 받침과 맞는 조사만)
+
+    "파이 뭐야" 의 '이' 는 받침 없는 '파' 뒤이므로 조사가 아니라 용어의 일부입니다.
+    영문/숫자 뒤에서는 읽는 법을 알 수 없으므로 두 형태 모두 조사로 봅니다.
+    """
+    for particle, needs_final in QUESTION_PARTICLES:
+        stem = term[:-len(particle)]
+        if not term.endswith(particle) or not stem or stem[-1].isspace():
+            continue
+        has_final = _has_final_consonant(stem[-1])
+        if has_final is None or has_final == needs_final:
+            return stem
+    return term
+
+
+def normalize_term(term: str) -> str:
+    """
+    캐시 키용 용어 정규화 (유니코드 정규화, 소문자, 공백 정리, 질문 표현 제거)
+
+    Args:
+        term: 사용자가 입력한 용어 또는 질문
+
+    Returns:
+        정규화된 용어
+    """
+    term = unicodedata.normalize("NFKC", term).strip().lower()
+    term = re.sub(r"[?!.。？！]+$", "", term).strip()
+    stripped = QUESTION_SUFFIX_PATTERN.sub("", term).strip()
+    if stripped != term:
+        term = _strip_particle(stripped)
+    term = term.strip("\"'`“”‘’")
+    return re.sub(r"\s+", " ", term)
+
+
+def extract_glossary_terms(summary: str, max_terms: int = 20) -> List[str]:
+    """
+    회의록 요약(summarize_meeting_text 결과)의 "신입 직원을 위한 생소한 용어" 항목에서 용어 추출
+
+    Args:
+        summary: HTML(<strong>, <br>) 형식의 회의록 요약
+        max_terms: 최대 추출 용어 수
+
+    Returns:
+        용어 목록 (설명 부분은 제외)
+    """
+    start = summary.find(GLOSSARY_HEADER)
+    if start == -1:
+        return []
+
+    section = summary[start + len(GLOSSARY_HEADER):]
+    section = re.sub(r"^\s*:?\s*(</strong>)?\s*:?", "", section)
+    # 다음 <strong> 섹션 전까지만 사용
+    next_section = section.find("<strong>")
+    if next_section != -1:
+        section = section[:next_section]
+    if NO_CONTENT_MESSAGE in section:
+        return []
+
+    terms = []
+    for line in re.split(r"<br\s*/?>|\n|•|·|,|、", section):
+        line = html.unescape(re.sub(r"<[^>]+>", "", line)).strip(" -*\t")
+        # "NDVI: 정규식생지수", "MQTT - 메시지 프로토콜", "YOLOv8(객체 탐지 모델)" 형태에서 용어만
+        term = re.split(r"\s*[:：]\s*|\s+-\s+|\s*\(", line, maxsplit=1)[0].strip()
+        if not term or len(term) > 40 or term in terms:
+            continue
+        terms.append(term)
+        if len(terms) >= max_terms:
+            break
+    return terms
+
+
+class TermCache:
+    """(정규화된 용어, 프로젝트명) → 설명 SQLite 캐시"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본값: TERM_CACHE_PATH 또는 cache/term_cache.sqlite3)
+            ttl_seconds: 항목 유효 시간 (기본값: TERM_CACHE_TTL 또는 30일)
+        """
+        self.db_path = db_path or os.getenv("TERM_CACHE_PATH", DEFAULT_TERM_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("TERM_CACHE_TTL", str(30 * 24 * 3600)))
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS term_explanations (
+                    term TEXT NOT NULL,
+                    project_name TEXT NOT NULL,
+                    original_term TEXT NOT NULL,
+                    explanation TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (term, project_name)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # 스레드마다 짧게 연결 (API 스레드풀 / 백그라운드 작업에서 동시에 사용)
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, term: str, project_name: Optional[str]) -> Optional[str]:
+        """캐시된 설명 조회 (없거나 만료되면 None, 용어가 없는 질문은 항상 None)"""
+        key = normalize_term(term)
+        if not key:
+            # "설명해줘" 처럼 정규화 후 빈 키가 되는 질문끼리 한 항목을 공유하지 않도록 캐시 생략
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT explanation, created_at FROM term_explanations WHERE term = ? AND project_name = ?",
+                (key, project_name or "")
+            ).fetchone()
+
+        hit = row is not None and time.time() - row[1] <= self.ttl_seconds
+        with self._lock:
+            self._counters["hits" if hit else "misses"] += 1
+        if hit:
+            print(f"💾 용어 설명 캐시 적중: {key}")
+            return row[0]
+        return None
+
+    def set(self, term: str, project_name: Optional[str], explanation: str) -> None:
+        """설명 저장 (같은 키가 있으면 덮어씀, 정규화 후 빈 키는 저장하지 않음)"""
+        key = normalize_term(term)
+        if not key:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO term_explanations VALUES (?, ?, ?, ?, ?)",
+                (key, project_name or "", term, explanation, time.time())
+            )
+
+    def purge_expired(self) -> int:
+        """만료 항목 삭제 후 삭제 개수 반환"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM term_explanations WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM term_explanations").fetchone()[0]
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+
+_term_cache: Optional[TermCache] = None
+_term_cache_lock = threading.Lock()
+
+
+def term_cache_enabled() -> bool:
+    return os.getenv("TERM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def get_term_cache() -> Optional[TermCache]:
+    """공유 용어 캐시 반환 (비활성화 시 None)"""
+    global _term_cache
+    if not term_cache_enabled():
+        return None
+    if _term_cache is None:
+        with _term_cache_lock:
+            if _term_cache is None:
+                _term_cache = TermCache()
+    return _term_cache
@@ -1,28 +1,64 @@
 import os
+import asyncio
+import httpx
 import requests
 from dotenv import load_dotenv
 from langchain_core.runnables import RunnableConfig
-from openai import OpenAI
-from agent_state import AgentState
+from openai import OpenAI, AsyncOpenAI
+from agent_state import AgentState, get_thread_id
+from agents.term_cache import get_term_cache
 
 load_dotenv()
 client = OpenAI()
+async_client = AsyncOpenAI()
 
-# Tavily 웹 검색
-def search_tavily(query: str, max_results: int = 3) -> list:
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Tavily 요청 헤더
+def _tavily_headers() -> dict:
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         raise ValueError("TAVILY_API_KEY 환경 변수가 설정되지 않았습니다.")
-    
-    url = "https://api.tavily.com/search"
-    headers = {"Authorization": f"Bearer {api_key}"}
+    return {"Authorization": f"Bearer {api_key}"}
+
+# Tavily 웹 검색 (401 / 429 / 5xx 는 빈 결과가 아니라 예외로 처리)
+def search_tavily(query: str, max_results: int = 3) -> list:
+    headers = _tavily_headers()
     params = {"query": query, "num_results": max_results}
 
-    res = requests.get(url, headers=headers, params=params)
+    res = requests.get(TAVILY_SEARCH_URL, headers=headers, params=params)
+    res.raise_for_status()
     data = res.json()
     
     return [item["content"] for item in data.get("results", [])]
 
+async def asearch_tavily(query: str, max_results: int = 3) -> list:
+    """search_tavily 의 비동기 버전"""
+    headers = _tavily_headers()
+    params = {"query": query, "num_results": max_results}
+
+    async with httpx.AsyncClient() as http_client:
+        res = await http_client.get(TAVILY_SEARCH_URL, headers=headers, params=params)
+    res.raise_for_status()
+    data = res.json()
+
+    return [item["content"] for item in data.get("results", [])]
+
+# 검색 실패 시 웹 검색 결과 없이 설명 (이 경우 캐시에 저장하지 않음)
+def _search_or_empty(term: str) -> list:
+    try:
+        return search_tavily(term)
+    except requests.RequestException as e:
+        print(f"⚠️ Tavily 검색 실패, 웹 검색 결과 없이 설명합니다: {e}")
+        return []
+
+async def _asearch_or_empty(term: str) -> list:
+    try:
+        return await asearch_tavily(term)
+    except httpx.HTTPError as e:
+        print(f"⚠️ Tavily 검색 실패, 웹 검색 결과 없이 설명합니다: {e}")
+        return []
+
 # 프롬프트 템플릿 로딩
 def load_prompt_template() -> str:
     return """
@@ -38,9 +74,8 @@ Please explain the term **in Korean**, in a simple and easy-to-understand way fo
 Include relevant examples, and avoid overly technical language if possible.
 """
 
-# 용어 설명 메인 함수
-def explain_word(term: str, project_name: str, project_explain: str) -> str:
-    search_results = search_tavily(term)
+# LLM 메시지 구성
+def build_messages(term: str, project_name: str, project_explain: str, search_results: list) -> list:
     web_context = "\n".join(search_results)
 
     prompt_template = load_prompt_template()
@@ -51,18 +86,128 @@ def explain_word(term: str, project_name: str, project_explain: str) -> str:
         web_result=web_context
     )
 
+    return [
+        {"role": "system", "content": f"당신은 친절하고 전문적인 {project_name} 멘토입니다."},
+        {"role": "user", "content": full_prompt}
+    ]
+
+# 캐시된 용어 설명 조회
+def get_cached_explanation(term: str, project_name: str):
+    cache = get_term_cache()
+    return cache.get(term, project_name) if cache else None
+
+# 웹 검색 결과 없이 만든 설명은 저장하지 않음 (검색 장애 동안의 설명이 TTL 동안 재사용되지 않도록)
+def cache_explanation(term: str, project_name: str, explanation: str, search_results: list) -> None:
+    cache = get_term_cache()
+    if cache and explanation and search_results:
+        cache.set(term, project_name, explanation)
+
+# 비동기 경로에서는 SQLite 조회/저장을 스레드에서 실행 (이벤트 루프를 막지 않음)
+async def aget_cached_explanation(term: str, project_name: str):
+    return await asyncio.to_thread(get_cached_explanation, term, project_name)
+
+async def acache_explanation(term: str, project_name: str, explanation: str, search_results: list) -> None:
+    await asyncio.to_thread(cache_explanation, term, project_name, explanation, search_results)
+
+# 용어 설명 메인 함수 (캐시 적중 시 웹 검색과 LLM 호출 모두 생략)
+def explain_word(term: str, project_name: str, project_explain: str) -> str:
+    cached = get_cached_explanation(term, project_name)
+    if cached:
+        return cached
+
+    search_results = _search_or_empty(term)
+
     response = client.chat.completions.create(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": f"당신은 친절하고 전문적인 {project_name} 멘토입니다."},
-            {"role": "user", "content": full_prompt}
-        ]
+        messages=build_messages(term, project_name, project_explain, search_results)
+    )
+
+    explanation = response.choices[0].message.content.strip()
+    cache_explanation(term, project_name, explanation, search_results)
+    return explanation
+
+async def aexplain_word(term: str, project_name: str, project_explain: str) -> str:
+    """explain_word 의 비동기 버전"""
+    cached = await aget_cached_explanation(term, project_name)
+    if cached:
+        return cached
+
+    search_results = await _asearch_or_empty(term)
+
+    response = await async_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=build_messages(term, project_name, project_explain, search_results)
     )
 
-    return response.choices[0].message.content.strip()
+    explanation = response.choices[0].message.content.strip()
+    await acache_explanation(term, project_name, explanation, search_results)
+    return explanation
+
+def prewarm_terms(terms: list, project_name: str, project_explain: str) -> int:
+    """
+    용어 목록의 설명을 미리 생성하여 캐시에 저장 (회의록 요약 후 백그라운드 실행용)
+
+    Args:
+        terms: 용어 목록 (예: extract_glossary_terms 결과)
+        project_name: 프로젝트명
+        project_explain: 프로젝트 설명
+
+    Returns:
+        새로 생성한 설명 수
+    """
+    if get_term_cache() is None:
+        return 0
+
+    created = 0
+    for term in terms:
+        if get_cached_explanation(term, project_name):
+            continue
+        try:
+            explain_word(term, project_name, project_explain)
+            created += 1
+        except Exception as e:
+            print(f"⚠️ 용어 설명 사전 생성 실패 ({term}): {e}")
+    print(f"✅ 용어 설명 캐시 사전 생성 완료: {created}/{len(terms)}개")
+    return created
 
 # LangGraph Supervisor용 invoke 함수
 def invoke(state: dict, config: RunnableConfig) -> dict:
+    term, project_name, project_explain = _get_inputs(state)
+    explanation = explain_word(term, project_name, project_explain)
+    return _build_state(state, config, explanation)
+
+async def ainvoke(state: dict, config: RunnableConfig) -> dict:
+    term, project_name, project_explain = _get_inputs(state)
+    explanation = await aexplain_word(term, project_name, project_explain)
+    return _build_state(state, config, explanation)
+
+async def astream(state: dict, config: RunnableConfig):
+    """스트리밍 버전: 용어 설명을 토큰 단위로 전달한 뒤 최종 메시지 전달"""
+    term, project_name, project_explain = _get_inputs(state)
+    cached = await aget_cached_explanation(term, project_name)
+    if cached:
+        yield {"event": "token", "data": cached}
+        yield {"event": "message", "data": _build_state(state, config, cached)["messages"][-1]}
+        return
+
+    search_results = await _asearch_or_empty(term)
+
+    stream = await async_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=build_messages(term, project_name, project_explain, search_results),
+        stream=True
+    )
+    chunks = []
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+            yield {"event": "token", "data": chunk.choices[0].delta.content}
+
+    explanation = "".join(chunks).strip()
+    await acache_explanation(term, project_name, explanation, search_results)
+    yield {"event": "message", "data": _build_state(state, config, explanation)["messages"][-1]}
+
+def _get_inputs(state: dict) -> tuple:
     term = state.get("input_query", "")
     project_name = state.get("project_name")
     project_explain = state.get("project_explain")
@@ -70,21 +215,13 @@ def invoke(state: dict, config: RunnableConfig) -> dict:
     assert term, "input_query (term) 값이 필요합니다."
     assert project_name and project_explain, "project_name과 project_explain은 필수입니다."
 
-    thread_id = (
-        getattr(config, "configurable", {}).get("thread_id")
-        if hasattr(config, "configurable")
-        else config.get("thread_id", "default")
-    )
-
-    explanation = explain_word(term, project_name, project_explain)
+    return term, project_name, project_explain
 
-    # ✅ messages 누적
-    messages = list(state.get("messages", []))
-    messages.append(f"📕 용어 설명 결과:\n{explanation}")
+def _build_state(state: dict, config: RunnableConfig, explanation: str) -> dict:
+    thread_id = get_thread_id(state, config)
 
-    # ✅ 전체 상태 복사 + 갱신
+    # ✅ 변경분만 반환 (기존 messages 에는 그래프 리듀서가 누적)
     return {
-        **state,
-        "messages": messages,
+        "messages": [f"📕 용어 설명 결과:\n{explanation}"],
         "thread_id": thread_id
-    }
\ No newline at end of file
+    }
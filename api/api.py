@@ -1,16 +1,26 @@
+import os
+import threading
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from api.routers import chat, meeting, reports, human_resource
 from dotenv import load_dotenv
-from graph import create_supervisor_graph
+import graph
+from graph import create_supervisor_graph, create_lazy_agents, warm_up_agents
 from agent_state import AgentState
+from checkpointer import create_checkpointer
 from typing import Dict, List, Any
-from api.utils.chat_history_utils import get_thread_messages, add_thread_messages, add_thread_query, get_thread_queries
+from vector_store.semantic_cache import all_cache_stats
+from api.utils.chat_history_utils import get_thread_history, add_thread_history
+from api.utils.history_backend import create_history_backend
 from fastapi.middleware.cors import CORSMiddleware
 
 
 # 애플리케이션 시작 시 환경 변수 로드 및 그래프 초기화
 load_dotenv()
-supervisor_graph = create_supervisor_graph()
+# 에이전트는 최초 라우팅 또는 백그라운드 warm-up 시점에 로드되므로 서버는 즉시 기동됨
+lazy_agents = create_lazy_agents()
+# 스레드별 대화 상태는 체크포인터에 저장 (CHECKPOINTER=memory | sqlite | none)
+supervisor_graph = create_supervisor_graph(lazy_agents, checkpointer=create_checkpointer())
 
 # 기본 AgentState 인스턴스
 base_agent_state = AgentState(
@@ -21,9 +31,8 @@ base_agent_state = AgentState(
     messages=[]
 )
 
-# 쓰레드별 히스토리 저장소 초기화
-thread_message_history: Dict[str, List[List[Any]]] = {} # thread_id, message list
-thread_query_history: Dict[str, List[str]] = {} # thread_id, query list
+# 쓰레드별 히스토리 저장소 초기화 (HISTORY_BACKEND=memory | sql, 스레드당 최대 턴 수 제한)
+history_backend = create_history_backend()
 
 app = FastAPI(
     title="ReadySet API", 
@@ -36,24 +45,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Thread-Id"],  # 새로 발급된 스레드 ID 를 브라우저에서 읽을 수 있도록
 )
 
 # 그래프 객체와 history를 app.state에 저장하여 전역적으로 접근 가능하게 함
 app.state.supervisor_graph = supervisor_graph
+app.state.lazy_agents = lazy_agents
 app.state.base_agent_state = base_agent_state
-app.state.thread_message_history = thread_message_history
-app.state.thread_query_history = thread_query_history
+app.state.history_backend = history_backend
 
 # 히스토리 관리 함수들을 앱 상태에 등록
-app.state.get_thread_messages = get_thread_messages
-app.state.add_thread_messages = add_thread_messages
-app.state.add_thread_query = add_thread_query
-app.state.get_thread_queries = get_thread_queries
+app.state.get_thread_history = get_thread_history
+app.state.add_thread_history = add_thread_history
+
+@app.on_event("startup")
+async def setup_history_backend():
+    await app.state.history_backend.setup()
+
+@app.on_event("startup")
+async def start_agent_warm_up():
+    # AGENT_WARMUP=false 이면 각 에이전트는 최초 라우팅 시점에 로드됨
+    if os.getenv("AGENT_WARMUP", "true").lower() in ("0", "false", "no"):
+        return
+    threading.Thread(target=warm_up_agents, args=(lazy_agents,), daemon=True).start()
 
 @app.get("/")
 async def welcome():
     return {"message": "Welcome to the ReadySet FastAPI server!"}
 
+@app.get("/ready")
+async def readiness():
+    """에이전트별 warm-up 상태 (모두 준비되면 200, 아니면 503)"""
+    agents = {name: agent.status() for name, agent in app.state.lazy_agents.items()}
+    ready = all(status["ready"] for status in agents.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "agents": agents}
+    )
+
+@app.get("/router/stats")
+async def router_stats():
+    """라우팅 통계 (fast-path 적중률 / LLM 라우터 호출 수)"""
+    if graph.fast_router is None:
+        return {"enabled": False}
+    return {"enabled": True, **graph.fast_router.stats()}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """시맨틱 답변 캐시 적중/미적중 통계"""
+    return all_cache_stats()
+
 app.include_router(chat.router)
 app.include_router(meeting.router)
 app.include_router(reports.router)
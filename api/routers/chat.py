@@ -1,43 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException,Form, Request, Response
+from fastapi import APIRouter, Depends, HTTPException,Form, Request, Response, Query
+from typing import Optional
 from ..schemas.chat_dto import QueryRequest, QueryResponse, Message, ReportSource, map_to_message, ChatHistoryListResponse, ChatHistory
-import copy
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from urllib.parse import unquote
 import pathlib
 import os
+import json
 from .reports import download_file
+from graph import astream_supervisor, ainvoke_supervisor
+from api.utils.chat_history_utils import resolve_thread_id, THREAD_ID_HEADER
 
 router = APIRouter(
     prefix="/chat",
     tags=["채팅"])
 
 @router.post("", response_model=QueryResponse)
-async def execute_query( fastapi_request: Request, input_query: str = Form(...)): 
+async def execute_query(
+    fastapi_request: Request,
+    response: Response,
+    input_query: str = Form(...),
+    thread_id: Optional[str] = Form(None)
+): 
+    # 요청의 스레드 ID (X-Thread-Id 헤더 또는 thread_id 폼 필드, 없으면 새로 발급하여 응답 헤더로 반환)
+    thread_id = resolve_thread_id(fastapi_request, thread_id)
+    response.headers[THREAD_ID_HEADER] = thread_id
     try:
         graph = fastapi_request.app.state.supervisor_graph
-        # 기본 AgentState의 복사본 생성 (깊은 복사)
-        state = copy.deepcopy(fastapi_request.app.state.base_agent_state)
+        # 기본 AgentState의 복사본 생성 (messages 만 새 리스트, 나머지 값은 문자열이므로 얕은 복사로 충분)
+        state = {**fastapi_request.app.state.base_agent_state, "messages": []}
 
         # 요청 데이터로 상태 업데이트
         state["input_query"] = input_query
-        thread_id=state["thread_id"]
-        state = graph.invoke(state)  # ✅ 여기에서 thread_id가 default로 바뀜!!!
+        state["thread_id"] = thread_id
+        # 비동기 실행: LLM/벡터 검색 대기 중에도 이벤트 루프가 다른 요청을 처리
+        # (체크포인터에 누적된 이전 대화는 제외하고 이번 요청의 메시지만 받음)
+        new_messages = await ainvoke_supervisor(graph, state, {"configurable": {"thread_id": thread_id}})
 
         # 히스토리에 대화 내용 추가
-        fastapi_request.app.state.add_thread_query(fastapi_request.app, thread_id, input_query)
-        fastapi_request.app.state.add_thread_messages(fastapi_request.app, thread_id, state["messages"])
+        await fastapi_request.app.state.add_thread_history(fastapi_request.app, thread_id, input_query, new_messages)
         
         messages = []
-        for msg in state["messages"]:
+        for msg in new_messages:
             message = map_to_message(msg)
             messages.append(message)
         
-        return QueryResponse(messages=messages)
+        return QueryResponse(messages=messages, thread_id=thread_id)
         
     except Exception as e:
         print("Error in execute_query:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_sse(event: str, data) -> str:
+    """Server-Sent-Events 형식 문자열 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/stream")
+async def stream_query(fastapi_request: Request, input_query: str = Form(...), thread_id: Optional[str] = Form(None)):
+    """
+    채팅 응답 스트리밍 (SSE)
+
+    route → sources(문서 검색 에이전트) → token... → done 순서로 이벤트를 전송합니다.
+    스레드 ID 는 X-Thread-Id 응답 헤더와 done 이벤트로 반환합니다.
+    """
+    app = fastapi_request.app
+    thread_id = resolve_thread_id(fastapi_request, thread_id)
+    state = {**app.state.base_agent_state, "messages": []}
+    state["input_query"] = input_query
+    state["thread_id"] = thread_id
+
+    async def event_generator():
+        messages = []
+        try:
+            async for event in astream_supervisor(
+                state, app.state.lazy_agents, {"configurable": {"thread_id": thread_id}}, app.state.supervisor_graph
+            ):
+                if event["event"] == "message":
+                    messages.append(event["data"])
+                    continue
+                yield format_sse(event["event"], event["data"])
+
+            # 히스토리에 대화 내용 추가
+            await app.state.add_thread_history(app, thread_id, input_query, messages)
+
+            response = QueryResponse(messages=[map_to_message(msg) for msg in messages], thread_id=thread_id)
+            yield format_sse("done", response.model_dump())
+
+        except Exception as e:
+            print("Error in stream_query:", str(e))
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", THREAD_ID_HEADER: thread_id}
+    )
+
 @router.post("/reports/download")
 async def download_report_file(fastapi_request: Request, source: str): 
     try:
@@ -50,18 +107,25 @@ async def download_report_file(fastapi_request: Request, source: str):
 
 
 @router.get("/histories", response_model=ChatHistoryListResponse)
-async def get_chat_histories(fastapi_request: Request): 
+async def get_chat_histories(
+    fastapi_request: Request,
+    thread_id: Optional[str] = Query(None, description="스레드 ID (X-Thread-Id 헤더로도 전달 가능)"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: Optional[int] = Query(None, ge=1, le=100, description="페이지 크기 (생략 시 보관 중인 전체)")
+): 
     try:
-        # 기본 AgentState의 thread_id 가져오기
-        thread_id = fastapi_request.app.state.base_agent_state["thread_id"]
+        # 요청의 스레드 ID (없으면 빈 히스토리)
+        thread_id = resolve_thread_id(fastapi_request, thread_id, generate=False)
+        if thread_id is None:
+            return ChatHistoryListResponse(histories=[], total=0, page=page, size=size)
 
-        # 히스토리 조회
-        messages_history = fastapi_request.app.state.get_thread_messages(fastapi_request.app, thread_id)
-        queries_history = fastapi_request.app.state.get_thread_queries(fastapi_request.app, thread_id)
+        # 히스토리 조회 (요청한 페이지만)
+        history_page = await fastapi_request.app.state.get_thread_history(fastapi_request.app, thread_id, page, size)
         
         # 히스토리 데이터 정제
         histories = []
-        for query, messages in zip(queries_history, messages_history):
+        for turn in history_page["turns"]:
+            query, messages = turn["query"], turn["messages"]
             processed_messages = []
             for msg in messages:
                 message = map_to_message(msg)
@@ -73,9 +137,11 @@ async def get_chat_histories(fastapi_request: Request):
             )
             histories.append(history)
         
-        return ChatHistoryListResponse(histories=histories)
+        return ChatHistoryListResponse(histories=histories, total=history_page["total"], page=page, size=size)
         
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         print("Error in get_chat_histories:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
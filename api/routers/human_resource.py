@@ -3,10 +3,12 @@ from fastapi import APIRouter, Body, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.human_resource import HumanResourcePagination, HumanResourceBase
-from ..schemas.matching import MatchingResponse, MatchingRequest, parse_matching_result, ProjectInfoResponse
+from ..schemas.matching import (
+    MatchingResponse, MatchingRequest, CandidateMatch, ProjectInfoResponse, BatchMatchingRequest, BatchMatchingResponse
+)
 from ..cruds.human_resource import HumanResourceRepository
 from config.db_config import get_db
-from talent_matching.smart_hr_matcher import match_project_with_employees
+from talent_matching.smart_hr_matcher import amatch_project_candidates, amatch_projects
 
 import traceback
 import logging
@@ -162,22 +164,10 @@ async def project_matching_endpoint(request: MatchingRequest = Body(...)):
         project_name = request.project_name
         project_info = get_project_info(project_name)
 
-        # 포맷팅된 프로젝트 정보 반환
-        input_project_info = f"""
-        프로젝트 이름: {project_name}
-        프로젝트 설명: {project_info.project_description}
-        필요한 역할: {project_info.project_role}
-        필요한 기술 스택: {project_info.tech_stack}
-        추가 정보: {project_info.additional_info}
-        """
-        
-        # 프로젝트 매칭 실행
+        # 프로젝트 매칭 실행 (점수는 로컬 채점 엔진, 선정 이유만 LLM 작성)
         logger.info(f"'{project_name}' 프로젝트에 대한 매칭 시작")
-        matching_result= match_project_with_employees(input_project_info, request.top_n)
-        print(matching_result)
-        
-        # 매칭 결과 파싱
-        candidates = parse_matching_result(matching_result)
+        matches = await amatch_project_candidates(project_info.model_dump(), request.top_n)
+        candidates = [CandidateMatch(**match) for match in matches]
         
         return MatchingResponse(
             project_info=project_info,
@@ -189,20 +179,52 @@ async def project_matching_endpoint(request: MatchingRequest = Body(...)):
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"처리 중 오류가 발생했습니다: {str(e)}")
     
+@router.post("/project-matching/batch", response_model=BatchMatchingResponse)
+async def batch_project_matching_endpoint(request: BatchMatchingRequest = Body(...)):
+    """
+    여러 프로젝트를 한 번에 매칭합니다.
+
+    - **project_names**: 매칭할 프로젝트 이름 목록 (생략 시 샘플 프로젝트 전체)
+    - **top_n**: 프로젝트당 추천 인원 수
+    - **unique_assignment**: true 면 한 신입사원이 여러 프로젝트에 중복 추천되지 않도록 전역 배정
+    """
+    try:
+        project_names = request.project_names or SAMPLE_PROJECTS
+        project_infos = [get_project_info(project_name) for project_name in project_names]
+
+        logger.info(f"프로젝트 {len(project_infos)}개 일괄 매칭 시작 (전역 배정: {request.unique_assignment})")
+        match_sets = await amatch_projects(
+            [project_info.model_dump() for project_info in project_infos], request.top_n, request.unique_assignment
+        )
+
+        return BatchMatchingResponse(
+            results=[
+                MatchingResponse(project_info=project_info, candidates=[CandidateMatch(**match) for match in matches])
+                for project_info, matches in zip(project_infos, match_sets)
+            ],
+            unique_assignment=request.unique_assignment
+        )
+
+    except Exception as e:
+        logger.error(f"API 처리 중 오류: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"처리 중 오류가 발생했습니다: {str(e)}")
+
+SAMPLE_PROJECTS = [
+    "웹 애플리케이션 개발",
+    "신규 사업 전략 수립 프로젝트",
+    "모바일 앱 개발",
+    "데이터 파이프라인 구축",
+    "AI 모델 개발",
+    "클라우드 인프라 구축",
+    "보안 시스템 강화",
+    "UI/UX 디자인",
+    "블록체인 서비스 개발",
+    "데이터 분석 시스템",
+    "품질 보증 시스템"
+]
+
 # 프로젝트 더미 데이터 확인 엔드포인트
 @router.get("/projects")
 async def get_sample_projects():
-    sample_projects = [
-        "웹 애플리케이션 개발",
-        "신규 사업 전략 수립 프로젝트",
-        "모바일 앱 개발",
-        "데이터 파이프라인 구축",
-        "AI 모델 개발",
-        "클라우드 인프라 구축",
-        "보안 시스템 강화",
-        "UI/UX 디자인",
-        "블록체인 서비스 개발",
-        "데이터 분석 시스템",
-        "품질 보증 시스템"
-    ]
-    return {"projects": sample_projects}
+    return {"projects": SAMPLE_PROJECTS}
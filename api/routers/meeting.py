@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Form, Request,UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Form, Request,UploadFile, File, BackgroundTasks
 import copy
 from meeting.text_summarizer import summarize_meeting_text
 from meeting.model import RtzrAPI
+from agents.term_cache import extract_glossary_terms, term_cache_enabled
 import os
 import uuid
 import time
@@ -10,11 +11,34 @@ router = APIRouter(
     prefix="/meeting",
     tags=["회의록"])
 
+DEFAULT_PROJECT_NAME = "차세대 한국형 스마트팜 개발"
+DEFAULT_PROJECT_EXPLAIN = "스마트팜 기술개발 프로젝트"
+
+def prewarm_glossary_terms(terms: list, project_name: str, project_explain: str):
+    # 용어 설명 에이전트는 실제 사용 시점에 로드 (서버 기동 시 import 하지 않음)
+    from agents.word_explain_agent import prewarm_terms
+    prewarm_terms(terms, project_name, project_explain)
+
+def schedule_term_prewarm(background_tasks: BackgroundTasks, summary: str, project_name: str, project_explain: str):
+    """요약의 '생소한 용어' 목록으로 용어 설명 캐시를 백그라운드에서 미리 채움"""
+    if not term_cache_enabled():
+        return
+    terms = extract_glossary_terms(summary or "")
+    if terms:
+        print(f"📕 용어 설명 사전 생성 예약: {terms}")
+        background_tasks.add_task(prewarm_glossary_terms, terms, project_name, project_explain)
+
 # 텍스트 요약 API
 @router.post("/summarize")
-async def summarize_text(text: str = Form(...)):
+async def summarize_text(
+    background_tasks: BackgroundTasks,
+    text: str = Form(...),
+    project_name: str = Form(DEFAULT_PROJECT_NAME),
+    project_explain: str = Form(DEFAULT_PROJECT_EXPLAIN)
+):
     try:
         summarized_text = summarize_meeting_text(text)
+        schedule_term_prewarm(background_tasks, summarized_text, project_name, project_explain)
         
         return {
             "status": "success",
@@ -52,7 +76,12 @@ async def upload_audio(file: UploadFile = File(...)):
 
 # 음성 파일 요약 API
 @router.post("/summarize/{file_id}")
-async def summarize_audio(file_id: str):
+async def summarize_audio(
+    file_id: str,
+    background_tasks: BackgroundTasks,
+    project_name: str = Form(DEFAULT_PROJECT_NAME),
+    project_explain: str = Form(DEFAULT_PROJECT_EXPLAIN)
+):
     try:
         # 파일 찾기
         UPLOAD_DIR= "meeting/resource"
@@ -92,6 +121,7 @@ async def summarize_audio(file_id: str):
         print("\n📌 GPT 기반 요약으로 대체 결과 :")
         summary = summarize_meeting_text(api.voice_data)
         print(summary)
+        schedule_term_prewarm(background_tasks, summary, project_name, project_explain)
 
         return {
             "status": "success",
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException,Form, Request, Response
+from fastapi import APIRouter, Depends, HTTPException,Form, Request, Response, Query
+from typing import Optional
 from ..schemas.report_dto import ReportListResponse, ReportSource, process_history_for_documents
 import copy
 from fastapi.responses import FileResponse
+from api.utils.chat_history_utils import resolve_thread_id
 from urllib.parse import unquote
 import pathlib
 import os
@@ -15,14 +17,22 @@ ROOT_DIR = os.environ.get('PROJECT_ROOT_DIR', os.path.dirname(os.path.dirname(os
 
 # 그동안 받았던 문서 목록 확인 api
 @router.get("", response_model=ReportListResponse)
-async def get_report_list( fastapi_request: Request): 
+async def get_report_list(
+    fastapi_request: Request,
+    thread_id: Optional[str] = Query(None, description="스레드 ID (X-Thread-Id 헤더로도 전달 가능)"),
+    page: int = Query(1, ge=1, description="히스토리 페이지 번호"),
+    size: Optional[int] = Query(None, ge=1, le=100, description="히스토리 페이지 크기 (생략 시 보관 중인 전체)")
+): 
     try:
-        # 기본 AgentState의 thread_id 가져오기
-        thread_id = fastapi_request.app.state.base_agent_state["thread_id"]
+        # 요청의 스레드 ID (없으면 빈 목록)
+        thread_id = resolve_thread_id(fastapi_request, thread_id, generate=False)
+        if thread_id is None:
+            return ReportListResponse(sources=[])
 
-        # 히스토리 조회
-        messages_history = fastapi_request.app.state.get_thread_messages(fastapi_request.app, thread_id)
-        queries_history = fastapi_request.app.state.get_thread_queries(fastapi_request.app, thread_id)
+        # 히스토리 조회 (요청한 페이지만)
+        history_page = await fastapi_request.app.state.get_thread_history(fastapi_request.app, thread_id, page, size)
+        queries_history = [turn["query"] for turn in history_page["turns"]]
+        messages_history = [turn["messages"] for turn in history_page["turns"]]
         
         # 히스토리 데이터에서 문서 데이터 가져오기
         reports = process_history_for_documents(queries_history, messages_history)
@@ -30,6 +40,8 @@ async def get_report_list( fastapi_request: Request):
         return ReportListResponse(sources=reports)
         
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         print("Error in execute_query:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -21,6 +21,7 @@ class Message(BaseModel):
 
 class QueryResponse(BaseModel):
     messages: List[Message]
+    thread_id: Optional[str] = None  # 다음 요청에 X-Thread-Id 헤더 또는 thread_id 필드로 전달
 
 class ChatHistory(BaseModel):
     query: str
@@ -28,6 +29,9 @@ class ChatHistory(BaseModel):
 
 class ChatHistoryListResponse(BaseModel):
     histories: List[ChatHistory]
+    total: int = 0  # 보관 중인 전체 대화 턴 수
+    page: int = 1
+    size: Optional[int] = None
 
 def map_to_message(msg: Any) -> Message:
     """
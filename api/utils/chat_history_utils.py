@@ -1,25 +1,32 @@
-from typing import List, Optional, Any
-import copy
-from fastapi import FastAPI
+import re
+import uuid
+from typing import List, Optional, Any, Dict
+from fastapi import FastAPI, HTTPException, Request
 
-# 히스토리 관련 유틸리티 함수
-def get_thread_messages(app: FastAPI, thread_id: str) -> List[Any]:
-    """특정 스레드의 메시지 히스토리 조회"""
-    return copy.deepcopy(app.state.thread_message_history.get(thread_id, []))
+THREAD_ID_HEADER = "X-Thread-Id"
+THREAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.:\-]{1,100}$")
 
-def add_thread_messages(app: FastAPI, thread_id: str, messages: List[Any]) -> None:
-    """특정 스레드의 메시지 히스토리 추가"""
-    if thread_id not in app.state.thread_message_history:
-        app.state.thread_message_history[thread_id] = []
-    app.state.thread_message_history[thread_id].append(messages)
+def resolve_thread_id(request: Request, thread_id: Optional[str] = None, generate: bool = True) -> Optional[str]:
+    """
+    요청의 스레드 ID 결정 (X-Thread-Id 헤더 → 폼/쿼리 파라미터 → 새 UUID 순)
 
-def get_thread_queries(app: FastAPI, thread_id: str) -> List[str]:
-    """특정 스레드의 쿼리 히스토리 조회"""
-    return copy.deepcopy(app.state.thread_query_history.get(thread_id, []))
+    Args:
+        request: FastAPI 요청
+        thread_id: 폼 또는 쿼리 파라미터로 받은 스레드 ID
+        generate: 요청에 스레드 ID 가 없을 때 새로 발급할지 여부 (False 면 None 반환)
+    """
+    thread_id = request.headers.get(THREAD_ID_HEADER) or thread_id
+    if not thread_id:
+        return str(uuid.uuid4()) if generate else None
+    if not THREAD_ID_PATTERN.match(thread_id):
+        raise HTTPException(status_code=400, detail="thread_id 는 영문/숫자/_.:- 로 된 100자 이하 문자열이어야 합니다.")
+    return thread_id
 
-def add_thread_query(app: FastAPI, thread_id: str, query: str) -> None:
-    """특정 스레드에 새 쿼리 추가"""
-    if thread_id not in app.state.thread_query_history:
-        app.state.thread_query_history[thread_id] = []
-    app.state.thread_query_history[thread_id].append(query)
+# 히스토리 관련 유틸리티 함수 (저장소는 app.state.history_backend, api/utils/history_backend.py 참고)
+async def get_thread_history(app: FastAPI, thread_id: str, page: int = 1, size: Optional[int] = None) -> Dict[str, Any]:
+    """특정 스레드의 대화 히스토리 페이지 조회 (반환된 턴은 읽기 전용)"""
+    return await app.state.history_backend.get_turns(thread_id, page, size)
 
+async def add_thread_history(app: FastAPI, thread_id: str, query: str, messages: List[Any]) -> None:
+    """특정 스레드에 대화 턴(쿼리 + 메시지) 추가"""
+    await app.state.history_backend.add_turn(thread_id, query, messages)
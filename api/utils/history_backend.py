@@ -0,0 +1,241 @@
+import os
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+'''
+스레드별 대화 히스토리 저장소
+
+- InMemoryHistoryBackend: 스레드당 최근 HISTORY_MAX_TURNS 턴만 보관하는 링 버퍼
+  (스레드 수도 HISTORY_MAX_THREADS 개로 제한, 가장 오래 사용되지 않은 스레드부터 제거)
+- SQLHistoryBackend: config/db_config 의 SQLAlchemy 비동기 엔진(MySQL)을 사용하는 영구 저장소
+  (HISTORY_DB_URL 을 지정하면 해당 DB 사용, HISTORY_BACKEND=sqlite 는 기본값으로 cache/history.sqlite3 파일 사용)
+- RedisHistoryBackend: Redis 프로토콜 서버(REDIS_URL)의 스레드별 리스트 저장소
+
+HISTORY_BACKEND=memory|sql|redis 로 선택합니다. 여러 uvicorn 워커/노드로 실행할 때는 모든 워커가
+같은 대화를 보도록 sql 또는 redis 를 사용해야 합니다. 조회는 페이지 단위이며 저장된 턴을 복사하지 않고 반환하므로
+호출 측은 결과를 수정하지 않아야 합니다.
+'''
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SQLITE_HISTORY_PATH = os.path.join(BASE_DIR, "cache", "history.sqlite3")
+
+HistoryTurn = Dict[str, Any]  # {"query": 사용자 질의, "messages": 에이전트 메시지 리스트}
+
+
+def _page_bounds(total: int, page: int, size: Optional[int]) -> tuple:
+    if size is None:
+        return 0, total
+    start = min((max(page, 1) - 1) * size, total)
+    return start, min(start + size, total)
+
+
+def _page_result(turns: List[HistoryTurn], total: int, page: int, size: Optional[int]) -> Dict[str, Any]:
+    return {"turns": turns, "total": total, "page": page, "size": size}
+
+
+class HistoryBackend(ABC):
+    """대화 히스토리 저장소 인터페이스"""
+
+    async def setup(self) -> None:
+        """저장소 초기화 (애플리케이션 시작 시 1회 호출)"""
+
+    @abstractmethod
+    async def add_turn(self, thread_id: str, query: str, messages: List[Any]) -> None:
+        """
+        대화 턴 추가 (스레드별 최대 턴 수를 넘으면 오래된 턴부터 제거)
+
+        Args:
+            thread_id: 스레드 ID
+            query: 사용자 질의
+            messages: 해당 질의에 대한 에이전트 메시지 리스트
+        """
+
+    @abstractmethod
+    async def get_turns(self, thread_id: str, page: int = 1, size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        대화 턴 페이지 조회 (오래된 턴부터 시간순)
+
+        Args:
+            thread_id: 스레드 ID
+            page: 페이지 번호 (1부터)
+            size: 페이지 크기 (None 이면 보관 중인 전체 턴)
+
+        Returns:
+            {"turns": 턴 리스트, "total": 보관 중인 전체 턴 수, "page", "size"}
+        """
+
+
+class InMemoryHistoryBackend(HistoryBackend):
+    """프로세스 메모리 링 버퍼 저장소"""
+
+    def __init__(self, max_turns: Optional[int] = None, max_threads: Optional[int] = None):
+        """
+        Args:
+            max_turns: 스레드당 최대 턴 수 (기본값: HISTORY_MAX_TURNS 또는 100)
+            max_threads: 최대 스레드 수 (기본값: HISTORY_MAX_THREADS 또는 1000)
+        """
+        self.max_turns = max_turns or int(os.getenv("HISTORY_MAX_TURNS", "100"))
+        self.max_threads = max_threads or int(os.getenv("HISTORY_MAX_THREADS", "1000"))
+        self._threads: "OrderedDict[str, Deque[HistoryTurn]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def add_turn(self, thread_id: str, query: str, messages: List[Any]) -> None:
+        turn = {"query": query, "messages": list(messages)}
+        with self._lock:
+            turns = self._threads.get(thread_id)
+            if turns is None:
+                turns = self._threads[thread_id] = deque(maxlen=self.max_turns)
+            turns.append(turn)
+            self._threads.move_to_end(thread_id)
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+
+    async def get_turns(self, thread_id: str, page: int = 1, size: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            turns = self._threads.get(thread_id)
+            if turns is None:
+                return _page_result([], 0, page, size)
+            start, end = _page_bounds(len(turns), page, size)
+            return _page_result(list(islice(turns, start, end)), len(turns), page, size)
+
+
+class SQLHistoryBackend(HistoryBackend):
+    """SQLAlchemy 비동기 엔진 기반 영구 저장소"""
+
+    def __init__(self, db_url: Optional[str] = None, max_turns: Optional[int] = None):
+        """
+        Args:
+            db_url: 비동기 DB URL (기본값: HISTORY_DB_URL, 없으면 config/db_config 의 MySQL 엔진 사용)
+            max_turns: 스레드당 최대 턴 수 (기본값: HISTORY_MAX_TURNS 또는 100)
+        """
+        db_url = db_url or os.getenv("HISTORY_DB_URL")
+        if db_url:
+            from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+            from sqlalchemy.orm import sessionmaker
+            self.engine = create_async_engine(db_url)
+            self.session_factory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        else:
+            from config.db_config import async_engine, AsyncSessionLocal
+            self.engine = async_engine
+            self.session_factory = AsyncSessionLocal
+        self.max_turns = max_turns or int(os.getenv("HISTORY_MAX_TURNS", "100"))
+
+    async def setup(self) -> None:
+        from models.chat_history import ChatHistoryTurn
+        async with self.engine.begin() as conn:
+            await conn.run_sync(ChatHistoryTurn.__table__.create, checkfirst=True)
+        print("✅ 대화 히스토리 테이블 준비 완료")
+
+    async def add_turn(self, thread_id: str, query: str, messages: List[Any]) -> None:
+        from sqlalchemy import select, delete
+        from models.chat_history import ChatHistoryTurn
+
+        # JSON 컬럼에 저장할 수 없는 값은 문자열로 변환
+        serializable_messages = json.loads(json.dumps(list(messages), ensure_ascii=False, default=str))
+        async with self.session_factory() as session:
+            session.add(ChatHistoryTurn(thread_id=thread_id, query=query, messages=serializable_messages))
+            await session.flush()
+
+            # 최근 max_turns 개보다 오래된 턴 삭제
+            cutoff = await session.scalar(
+                select(ChatHistoryTurn.id)
+                .where(ChatHistoryTurn.thread_id == thread_id)
+                .order_by(ChatHistoryTurn.id.desc())
+                .offset(self.max_turns - 1)
+                .limit(1)
+            )
+            if cutoff is not None:
+                await session.execute(
+                    delete(ChatHistoryTurn).where(ChatHistoryTurn.thread_id == thread_id, ChatHistoryTurn.id < cutoff)
+                )
+            await session.commit()
+
+    async def get_turns(self, thread_id: str, page: int = 1, size: Optional[int] = None) -> Dict[str, Any]:
+        from sqlalchemy import select, func
+        from models.chat_history import ChatHistoryTurn
+
+        async with self.session_factory() as session:
+            total = await session.scalar(
+                select(func.count()).select_from(ChatHistoryTurn).where(ChatHistoryTurn.thread_id == thread_id)
+            )
+            start, end = _page_bounds(total or 0, page, size)
+            if start >= end:
+                return _page_result([], total or 0, page, size)
+
+            result = await session.execute(
+                select(ChatHistoryTurn.query, ChatHistoryTurn.messages)
+                .where(ChatHistoryTurn.thread_id == thread_id)
+                .order_by(ChatHistoryTurn.id)
+                .offset(start)
+                .limit(end - start)
+            )
+            turns = [{"query": query, "messages": messages} for query, messages in result.all()]
+            return _page_result(turns, total, page, size)
+
+
+class RedisHistoryBackend(HistoryBackend):
+    """Redis 리스트 기반 공유 저장소 (스레드당 키 1개, RPUSH + LTRIM 으로 크기 제한)"""
+
+    key_prefix = "readyset:history:"
+
+    def __init__(self, redis_url: Optional[str] = None, max_turns: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        """
+        Args:
+            redis_url: Redis URL (기본값: REDIS_URL 또는 redis://localhost:6379/0)
+            max_turns: 스레드당 최대 턴 수 (기본값: HISTORY_MAX_TURNS 또는 100)
+            ttl_seconds: 마지막 대화 이후 스레드 보관 기간 (기본값: HISTORY_TTL_SECONDS 또는 30일)
+        """
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True)
+        self.max_turns = max_turns or int(os.getenv("HISTORY_MAX_TURNS", "100"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("HISTORY_TTL_SECONDS", str(30 * 24 * 3600)))
+
+    def _key(self, thread_id: str) -> str:
+        return f"{self.key_prefix}{thread_id}"
+
+    async def setup(self) -> None:
+        await self.client.ping()
+        print("✅ Redis 대화 히스토리 저장소 연결 완료")
+
+    async def add_turn(self, thread_id: str, query: str, messages: List[Any]) -> None:
+        key = self._key(thread_id)
+        turn = json.dumps({"query": query, "messages": list(messages)}, ensure_ascii=False, default=str)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, turn)
+            pipe.ltrim(key, -self.max_turns, -1)
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def get_turns(self, thread_id: str, page: int = 1, size: Optional[int] = None) -> Dict[str, Any]:
+        key = self._key(thread_id)
+        total = await self.client.llen(key)
+        start, end = _page_bounds(total, page, size)
+        if start >= end:
+            return _page_result([], total, page, size)
+        turns = [json.loads(turn) for turn in await self.client.lrange(key, start, end - 1)]
+        return _page_result(turns, total, page, size)
+
+
+def create_history_backend() -> HistoryBackend:
+    """HISTORY_BACKEND 환경 변수(memory | sql | sqlite | redis)에 따른 히스토리 저장소 생성"""
+    backend = os.getenv("HISTORY_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        db_url = os.getenv("HISTORY_DB_URL")
+        if not db_url:
+            os.makedirs(os.path.dirname(DEFAULT_SQLITE_HISTORY_PATH), exist_ok=True)
+            db_url = f"sqlite+aiosqlite:///{DEFAULT_SQLITE_HISTORY_PATH}"
+        return SQLHistoryBackend(db_url=db_url)
+    if backend in ("sql", "mysql"):
+        return SQLHistoryBackend()
+    if backend == "redis":
+        return RedisHistoryBackend()
+    if backend != "memory":
+        print(f"⚠️ 알 수 없는 HISTORY_BACKEND '{backend}', 메모리 저장소를 사용합니다.")
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        print("⚠️ 메모리 히스토리 저장소는 워커 간에 공유되지 않습니다. HISTORY_BACKEND=sql 또는 redis 를 사용하세요.")
+    return InMemoryHistoryBackend()
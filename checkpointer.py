@@ -0,0 +1,126 @@
+import os
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+'''
+Supervisor 그래프용 체크포인터 (thread_id 별 대화 상태 저장)
+
+LangGraph 체크포인터는 그래프 단계마다 체크포인트를 추가로 저장하므로 그대로 쓰면 스레드당 저장량이 계속 늘어납니다.
+여기서는 스레드별 최근 CHECKPOINT_KEEP 개만 남깁니다 (다음 요청은 최신 체크포인트에서 이어짐).
+- memory: 프로세스 메모리 (스레드 수도 CHECKPOINT_MAX_THREADS 개로 제한)
+- sqlite: CHECKPOINT_DB_PATH 파일 (같은 노드의 여러 워커가 공유)
+CHECKPOINTER=memory|sqlite|none 으로 선택합니다.
+저장된 messages 는 다음 요청의 상태로 복원되어, 질문이 앞 대화에 의존하는 후속 질문이면 보고서 에이전트가
+최근 HISTORY_PROMPT_MESSAGES 개를 이전 대화로 LLM 에 전달합니다 (agent_state.follow_up_history).
+'''
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CHECKPOINT_DB_PATH = os.path.join(BASE_DIR, "cache", "checkpoints.sqlite3")
+
+
+def _keep_count() -> int:
+    return max(int(os.getenv("CHECKPOINT_KEEP", "2")), 1)
+
+
+class BoundedMemorySaver(MemorySaver):
+    """스레드별 최근 체크포인트만 보관하는 메모리 체크포인터"""
+
+    def __init__(self, keep: Optional[int] = None, max_threads: Optional[int] = None):
+        """
+        Args:
+            keep: 스레드별 보관할 체크포인트 수 (기본값: CHECKPOINT_KEEP 또는 2)
+            max_threads: 최대 스레드 수 (기본값: CHECKPOINT_MAX_THREADS 또는 1000)
+        """
+        super().__init__()
+        self.keep = keep or _keep_count()
+        self.max_threads = max_threads or int(os.getenv("CHECKPOINT_MAX_THREADS", "1000"))
+        self._thread_order: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        with self._lock:
+            saved_config = super().put(config, checkpoint, metadata)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoints = self.storage[thread_id]
+            for thread_ts in sorted(checkpoints)[:-self.keep]:
+                del checkpoints[thread_ts]
+
+            # 가장 오래 사용되지 않은 스레드부터 제거
+            self._thread_order[thread_id] = None
+            self._thread_order.move_to_end(thread_id)
+            while len(self._thread_order) > self.max_threads:
+                evicted, _ = self._thread_order.popitem(last=False)
+                self.storage.pop(evicted, None)
+            return saved_config
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver 에 비동기 메서드(스레드 실행)를 추가하고 스레드별 최근 체크포인트만 남기는 체크포인터
+
+    langgraph 의 AsyncSqliteSaver 는 aiosqlite 가 필요하므로, 표준 sqlite3 연결을 스레드에서 사용합니다.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, keep: Optional[int] = None):
+        super().__init__(conn)
+        self.keep = keep or _keep_count()
+
+    @classmethod
+    def from_path(cls, db_path: str, keep: Optional[int] = None) -> "ThreadedSqliteSaver":
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        return cls(conn, keep)
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        saved_config = super().put(config, checkpoint, metadata)
+        with self.lock, self.cursor() as cur:
+            cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND thread_ts NOT IN "
+                "(SELECT thread_ts FROM checkpoints WHERE thread_id = ? ORDER BY thread_ts DESC LIMIT ?)",
+                (str(config["configurable"]["thread_id"]), str(config["configurable"]["thread_id"]), self.keep),
+            )
+        return saved_config
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata)
+
+
+def create_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """CHECKPOINTER 환경 변수(memory | sqlite | none)에 따른 체크포인터 생성"""
+    kind = os.getenv("CHECKPOINTER", "memory").lower()
+    if kind in ("none", "false", "0"):
+        return None
+    if kind == "sqlite":
+        db_path = os.getenv("CHECKPOINT_DB_PATH", DEFAULT_CHECKPOINT_DB_PATH)
+        print(f"✅ SQLite 체크포인터 사용: {db_path}")
+        return ThreadedSqliteSaver.from_path(db_path)
+    if kind != "memory":
+        print(f"⚠️ 알 수 없는 CHECKPOINTER '{kind}', 메모리 체크포인터를 사용합니다.")
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        print("⚠️ 메모리 체크포인터는 워커 간에 공유되지 않습니다. CHECKPOINTER=sqlite 를 사용하세요.")
+    return BoundedMemorySaver()
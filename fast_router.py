@@ -0,0 +1,195 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vector_store.registry import get_embeddings, DEFAULT_EMBEDDING_MODEL
+
+'''
+LLM 호출 없이 라우팅을 결정하는 fast-path 라우터
+
+1. 휴리스틱 (코드 형태 입력, 메일/이메일, 담당자 문의)
+2. 예시 문장 임베딩(KR-SBERT) 중심점(centroid)과의 코사인 유사도
+
+신뢰도가 임계값보다 낮으면 None 을 반환하고, 호출자는 기존 router_chain(LLM)으로 판단합니다.
+'''
+
+# 라우트별 예시 문장 (중심점 계산용)
+ROUTE_EXAMPLES: Dict[str, List[str]] = {
+    "word_explain": [
+        "PLC란 무엇인가요?",
+        "NDVI가 뭐야?",
+        "MQTT 프로토콜이 무슨 뜻인가요?",
+        "엣지 컴퓨팅 개념을 쉽게 설명해줘",
+        "양액 재배라는 용어가 생소해요",
+    ],
+    "code_check": [
+        "이 코드가 코딩 규칙에 맞는지 검토해줘",
+        "제 함수 이름이 컨벤션에 맞나요?",
+        "작성한 클래스 코드 리뷰 부탁드립니다",
+        "변수명 규칙 위반이 있는지 확인해줘",
+    ],
+    "find_report_agent": [
+        "사업계획서에서 추진 일정 찾아줘",
+        "0807 회의록 보여줘",
+        "스마트팜 실태조사 보고서 찾아주세요",
+        "이전 분기 품질 분석 보고서 보여줘",
+        "프로젝트 추진 체계가 나와 있는 문서를 찾아주세요",
+    ],
+    "report_writing_guide_agent": [
+        "회의록 작성 시 의결사항은 어떻게 써야 하나요?",
+        "보고서의 이슈 요약 항목 어떻게 작성해야 할까요?",
+        "사업계획서 목차 구성 방법을 알려줘",
+        "결과 보고서를 잘 쓰는 방법이 궁금해요",
+    ],
+    "email_agent": [
+        "팀장님께 회의 일정 변경 요청 메일 써줘",
+        "협조 요청 이메일 작성해줘",
+        "정중하게 사과 메일 보내고 싶어요",
+    ],
+    "matching_agent": [
+        "MES 연동 관련 문의는 누구한테 하면 되나요?",
+        "농업 규제 대응 담당자가 누구야?",
+        "센서 데이터 수집 담당하시는 분 알려줘",
+        "드론 운용 관련해서 누구에게 물어봐야 하나요?",
+    ],
+    "exception_agent": [
+        "오늘 점심 뭐 먹지?",
+        "주말에 날씨 어때?",
+        "재미있는 농담 해줘",
+    ],
+}
+
+# 코드 형태 입력 패턴
+CODE_PATTERNS = [
+    re.compile(r"^\s*(def|class|import|from\s+\S+\s+import|function|public|private|const|let|var|#include|package)\b", re.MULTILINE),
+    re.compile(r"(=>|::|\+\+|console\.log|System\.out|return\s+[^\s]+;?$)", re.MULTILINE),
+    re.compile(r"[{};]\s*$", re.MULTILINE),
+    re.compile(r"\w+\s*\([^)]*\)\s*[:{]\s*$", re.MULTILINE),
+]
+EMAIL_PATTERN = re.compile(r"(이메일|메일)")
+MATCHING_PATTERN = re.compile(r"(담당자|담당하(는|시는)\s*분|누구(한테|에게|랑|와)|누구.*(문의|연락|물어))")
+DOCUMENT_PATTERN = re.compile(r"(문서|보고서|회의록|계획서|자료).*(찾|보여|알려)")
+
+
+class FastRouter:
+    """휴리스틱 + 최근접 중심점 기반 로컬 라우터"""
+
+    def __init__(
+        self,
+        embedding_model_name: str = DEFAULT_EMBEDDING_MODEL,
+        threshold: Optional[float] = None,
+        margin: Optional[float] = None,
+        examples: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Args:
+            embedding_model_name: 임베딩 모델 이름 (보고서 검색과 같은 모델 공유)
+            threshold: 중심점 라우팅에 필요한 최소 코사인 유사도 (기본값: FAST_ROUTER_THRESHOLD 또는 0.6)
+            margin: 1순위와 2순위 유사도의 최소 차이 (기본값: FAST_ROUTER_MARGIN 또는 0.05)
+            examples: 라우트별 예시 문장
+        """
+        self.embedding_model_name = embedding_model_name
+        self.threshold = threshold if threshold is not None else float(os.getenv("FAST_ROUTER_THRESHOLD", "0.6"))
+        self.margin = margin if margin is not None else float(os.getenv("FAST_ROUTER_MARGIN", "0.05"))
+        self.examples = examples or ROUTE_EXAMPLES
+
+        self._routes: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._counts = {"heuristic": 0, "centroid": 0, "llm_fallback": 0}
+        self._route_counts: Dict[str, int] = {}
+
+    # 휴리스틱 라우팅
+    def _match_heuristic(self, query: str) -> Optional[str]:
+        code_hits = sum(1 for pattern in CODE_PATTERNS if pattern.search(query))
+        if code_hits >= 2 or (code_hits >= 1 and "\n" in query.strip()):
+            return "code_check"
+        if EMAIL_PATTERN.search(query):
+            return "email_agent"
+        if MATCHING_PATTERN.search(query) and not DOCUMENT_PATTERN.search(query):
+            return "matching_agent"
+        return None
+
+    def _load_centroids(self) -> np.ndarray:
+        """예시 문장 임베딩으로 라우트별 중심점 계산 (최초 1회)"""
+        if self._centroids is not None:
+            return self._centroids
+
+        with self._centroid_lock:
+            if self._centroids is None:
+                embeddings = get_embeddings(self.embedding_model_name)
+                routes, centroids = [], []
+                for route, sentences in self.examples.items():
+                    vectors = np.asarray(embeddings.embed_documents(sentences), dtype=np.float32)
+                    centroid = vectors.mean(axis=0)
+                    centroids.append(centroid / (np.linalg.norm(centroid) or 1.0))
+                    routes.append(route)
+                self._routes = routes
+                self._centroids = np.vstack(centroids)
+        return self._centroids
+
+    # 중심점 라우팅
+    def _match_centroid(self, query: str) -> Tuple[Optional[str], float]:
+        centroids = self._load_centroids()
+        vector = np.asarray(get_embeddings(self.embedding_model_name).embed_query(query), dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+
+        scores = centroids @ vector
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        second = float(scores[order[1]]) if len(order) > 1 else -1.0
+        if best >= self.threshold and best - second >= self.margin:
+            return self._routes[order[0]], best
+        return None, best
+
+    def route(self, query: str) -> Optional[str]:
+        """
+        로컬 라우팅 시도
+
+        Args:
+            query: 사용자 입력
+
+        Returns:
+            라우트 이름 또는 None (신뢰도가 낮아 LLM 라우터가 필요한 경우)
+        """
+        route = self._match_heuristic(query)
+        if route:
+            self._record("heuristic", route)
+            print(f"⚡ fast-path 라우팅(휴리스틱): {route}")
+            return route
+
+        try:
+            route, score = self._match_centroid(query)
+        except Exception as e:
+            print(f"⚠️ fast-path 중심점 라우팅 실패: {e}")
+            return None
+
+        if route:
+            self._record("centroid", route)
+            print(f"⚡ fast-path 라우팅(중심점, {score:.2f}): {route}")
+        return route
+
+    def record_fallback(self, route: str) -> None:
+        """LLM 라우터로 결정된 경우 기록"""
+        self._record("llm_fallback", route)
+
+    def _record(self, method: str, route: str) -> None:
+        with self._lock:
+            self._counts[method] += 1
+            self._route_counts[route] = self._route_counts.get(route, 0) + 1
+
+    def stats(self) -> Dict[str, object]:
+        """fast-path 적중률 등 라우팅 통계"""
+        with self._lock:
+            total = sum(self._counts.values())
+            fast = self._counts["heuristic"] + self._counts["centroid"]
+            return {
+                "total": total,
+                **self._counts,
+                "fast_path_hit_rate": fast / total if total else 0.0,
+                "routes": dict(self._route_counts),
+            }
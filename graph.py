@@ -1,20 +1,29 @@
-from typing import Literal, Optional, TypedDict, List
-from copy import deepcopy
+from typing import Literal, Optional, TypedDict, List, Dict, Any, AsyncIterator, Callable, Union
+import asyncio
+import importlib
+import os
+import threading
+import time
 from langgraph.graph import StateGraph, END
-from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 
-from agents.word_explain_agent import invoke as word_agent
-from agents.code_check_agent import invoke as code_agent
-from agents.email_agent import invoke as email_agent
-from agents.matching_agent import invoke as matching_agent 
-from agents.exception_agent import invoke as exception_agent
-from agents.find_report_agent import invoke as find_report_agent
-from agents.report_writing_guide_agent import invoke as report_writing_guide_agent
-
 from agent_state import AgentState
+from fast_router import FastRouter
+
+# 노드 이름 → 에이전트 모듈 (모듈은 최초 라우팅 또는 warm-up 시점에 import)
+AGENT_MODULES: Dict[str, str] = {
+    "word_explain": "agents.word_explain_agent",
+    "code_check": "agents.code_check_agent",
+    "find_report_agent": "agents.find_report_agent",
+    "report_writing_guide_agent": "agents.report_writing_guide_agent",
+    "email_agent": "agents.email_agent",
+    "matching_agent": "agents.matching_agent",
+    "exception_agent": "agents.exception_agent",
+}
 
 
 
@@ -41,12 +50,16 @@ router_prompt = PromptTemplate.from_template("""
 
 router_chain = router_prompt | ChatOpenAI(model="gpt-4o-mini") | StrOutputParser()
 
-# 라우팅 함수
-def route_agent(state: AgentState) -> Literal[
+# LLM 호출 전에 시도하는 로컬 라우터 (FAST_ROUTER_ENABLED=false 이면 항상 LLM 라우팅)
+fast_router = FastRouter() if os.getenv("FAST_ROUTER_ENABLED", "true").lower() not in ("0", "false", "no") else None
+
+RouteName = Literal[
     "word_explain", "code_check", "find_report_agent",
     "report_writing_guide_agent", "email_agent", "matching_agent", "exception_agent"
-]:
-    result = router_chain.invoke({"input_query": state["input_query"]}).strip().lower()
+]
+
+def _parse_route(result: str) -> RouteName:
+    result = result.strip().lower()
     print(f"🧭 라우팅 결과: {result}")
     if result in {
         "word_explain", "code_check", "find_report_agent",
@@ -55,37 +68,271 @@ def route_agent(state: AgentState) -> Literal[
         return result
     return "exception_agent"
 
+def _record_fallback(route: RouteName) -> RouteName:
+    if fast_router is not None:
+        fast_router.record_fallback(route)
+    return route
+
+# 라우팅 함수
+def route_agent(state: AgentState) -> RouteName:
+    if fast_router is not None:
+        route = fast_router.route(state["input_query"])
+        if route:
+            return route
+    return _record_fallback(_parse_route(router_chain.invoke({"input_query": state["input_query"]})))
+
+async def aroute_agent(state: AgentState) -> RouteName:
+    """route_agent 의 비동기 버전"""
+    if fast_router is not None:
+        # 임베딩 계산(CPU)은 스레드에서 실행
+        route = await asyncio.to_thread(fast_router.route, state["input_query"])
+        if route:
+            return route
+    return _record_fallback(_parse_route(await router_chain.ainvoke({"input_query": state["input_query"]})))
+
+
+class LazyAgent:
+    """
+    에이전트를 최초 호출(또는 warm-up) 시점에 생성하는 노드 래퍼
+
+    factory 는 인자 없이 호출되어 `invoke(state, config)` (선택적으로 `ainvoke`) 를 가진
+    에이전트 객체(모듈 등) 또는 `(state, config) -> dict` 형태의 함수를 반환합니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Callable]):
+        self.name = name
+        self.factory = factory
+        self._agent: Optional[Callable] = None
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._agent is not None
+
+    def load(self) -> Callable:
+        """에이전트 생성 (동시에 여러 요청이 와도 1회만 생성)"""
+        if self._agent is not None:
+            return self._agent
+
+        with self._lock:
+            if self._agent is None:
+                start = time.perf_counter()
+                try:
+                    self._agent = self.factory()
+                    self.error = None
+                except Exception as e:
+                    self.error = str(e)
+                    print(f"❌ {self.name} 초기화 실패: {e}")
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                print(f"✅ {self.name} 초기화 완료 ({self.load_seconds:.2f}초)")
+        return self._agent
+
+    async def aload(self) -> Callable:
+        """load 의 비동기 버전 (모델 로딩 동안 이벤트 루프를 막지 않음)"""
+        if self._agent is not None:
+            return self._agent
+        return await asyncio.to_thread(self.load)
+
+    def __call__(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        agent = self.load()
+        return getattr(agent, "invoke", agent)(state, config)
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        agent = await self.aload()
+        ainvoke = getattr(agent, "ainvoke", None)
+        if ainvoke is not None:
+            return await ainvoke(state, config)
+        # 비동기 구현이 없는 에이전트는 스레드에서 실행
+        return await asyncio.to_thread(getattr(agent, "invoke", agent), state, config)
+
+    async def astream(self, state: AgentState, config: RunnableConfig) -> AsyncIterator[Dict[str, Any]]:
+        """
+        에이전트 스트리밍 호출
+
+        astream 이 없는 에이전트는 ainvoke 결과의 마지막 메시지를 한 번에 전달합니다.
+        """
+        agent = await self.aload()
+        astream = getattr(agent, "astream", None)
+        if astream is None:
+            result = await self.ainvoke(state, config)
+            messages = result.get("messages") or []
+            if messages:
+                yield {"event": "message", "data": messages[-1]}
+            return
+
+        async for event in astream(state, config):
+            yield event
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+def module_agent_factory(module_path: str) -> Callable[[], Callable]:
+    """에이전트 모듈을 import 하고, warm_up() 이 있으면 모델/인덱스를 미리 로드하는 factory"""
+    def factory() -> Callable:
+        module = importlib.import_module(module_path)
+        warm_up = getattr(module, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
+        return module
+    return factory
+
+
+def create_lazy_agents(
+    agent_factories: Optional[Dict[str, Callable[[], Callable]]] = None
+) -> Dict[str, LazyAgent]:
+    """
+    노드 이름별 LazyAgent 생성
+
+    Args:
+        agent_factories: 노드 이름 → factory (None 이면 AGENT_MODULES 기반 기본값)
+
+    Returns:
+        Dict[str, LazyAgent]: 노드 이름 → LazyAgent
+    """
+    factories = {name: module_agent_factory(path) for name, path in AGENT_MODULES.items()}
+    if agent_factories:
+        factories.update(agent_factories)
+    return {name: LazyAgent(name, factory) for name, factory in factories.items()}
+
+
+def warm_up_agents(agents: Dict[str, LazyAgent]) -> None:
+    """모든 에이전트를 순서대로 미리 로드 (백그라운드 warm-up 용)"""
+    for agent in agents.values():
+        try:
+            agent.load()
+        except Exception:
+            # 실패한 에이전트는 최초 라우팅 시 다시 시도됨
+            continue
+
 
 # Supervisor Graph 생성 함수
-from copy import deepcopy 
+def create_supervisor_graph(
+    agent_factories: Optional[Dict[str, Union[LazyAgent, Callable[[], Callable]]]] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None
+):
+    """
+    Supervisor Graph 생성
+
+    Args:
+        agent_factories: 노드 이름 → LazyAgent 또는 factory.
+            None 이면 기본 에이전트 모듈을 지연 로드하는 LazyAgent 를 사용
+        checkpointer: thread_id 별 상태 저장소 (checkpointer.create_checkpointer 참고).
+            지정하면 실행 시 config 의 configurable.thread_id 가 필요하고, messages 가 요청 간에 누적됨
+
+    Returns:
+        컴파일된 그래프
+    """
+    agent_factories = agent_factories or {}
+    agents = create_lazy_agents({
+        name: factory for name, factory in agent_factories.items()
+        if not isinstance(factory, LazyAgent)
+    })
+    agents.update({
+        name: agent for name, agent in agent_factories.items()
+        if isinstance(agent, LazyAgent)
+    })
 
-def create_supervisor_graph():
     builder = StateGraph(AgentState)
 
-    def wrap_agent(agent_func):
-        def wrapper(state: AgentState, config: RunnableConfig) -> AgentState:
-            result = agent_func(state, config)
-            new_state = deepcopy(state)
-            new_state.update(result)
-            return new_state
-        return wrapper
-
-    builder.add_node("word_explain", wrap_agent(word_agent))
-    builder.add_node("code_check", wrap_agent(code_agent))
-    builder.add_node("find_report_agent", wrap_agent(find_report_agent))
-    builder.add_node("report_writing_guide_agent", wrap_agent(report_writing_guide_agent))
-    builder.add_node("email_agent", wrap_agent(email_agent))  
-    builder.add_node("matching_agent", wrap_agent(matching_agent)) 
-    builder.add_node("exception_agent", wrap_agent(exception_agent))
-
-    builder.set_conditional_entry_point(route_agent)
-
-    builder.add_edge("word_explain", END)
-    builder.add_edge("code_check", END)
-    builder.add_edge("find_report_agent", END)
-    builder.add_edge("report_writing_guide_agent", END)
-    builder.add_edge("email_agent", END) 
-    builder.add_edge("matching_agent", END)  
-    builder.add_edge("exception_agent", END)
-
-    return builder.compile()
\ No newline at end of file
+    def wrap_agent(agent: LazyAgent):
+        # 노드는 상태 전체 복사본이 아닌 변경분만 반환하고, messages 는 리듀서가 누적
+        def wrapper(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+            return state_delta(state, agent(state, config))
+
+        async def awrapper(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+            return state_delta(state, await agent.ainvoke(state, config))
+
+        # invoke / ainvoke 모두 지원하는 노드
+        return RunnableLambda(wrapper, afunc=awrapper, name=agent.name)
+
+    for name in AGENT_MODULES:
+        builder.add_node(name, wrap_agent(agents[name]))
+
+    builder.set_conditional_entry_point(
+        RunnableLambda(route_agent, afunc=aroute_agent),
+        list(AGENT_MODULES)
+    )
+
+    for name in AGENT_MODULES:
+        builder.add_edge(name, END)
+
+    return builder.compile(checkpointer=checkpointer)
+
+
+def state_delta(state: AgentState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    에이전트 결과를 상태 변경분으로 변환
+
+    에이전트는 새 메시지만 반환하는 것이 원칙이지만, 기존 messages 뒤에 새 메시지를 붙인 리스트를 반환해도
+    새로 추가된 메시지만 남깁니다. AgentState 에 없는 키(agent, generated_email 등)는 제외합니다.
+    """
+    delta = {key: value for key, value in result.items() if key in AgentState.__annotations__ and key != "messages"}
+    messages = result.get("messages") or []
+    previous = state.get("messages") or []
+    if len(messages) >= len(previous) and all(a is b for a, b in zip(previous, messages)):
+        messages = messages[len(previous):]
+    if messages:
+        delta["messages"] = messages
+    return delta
+
+
+async def ainvoke_supervisor(graph, state: AgentState, config: Optional[RunnableConfig] = None) -> List[Any]:
+    """
+    Supervisor 그래프 실행 후 이번 요청에서 추가된 메시지만 반환
+
+    체크포인터를 사용하면 최종 상태의 messages 에 이전 대화가 누적되어 있으므로 노드별 변경분에서 메시지를 모읍니다.
+    """
+    new_messages: List[Any] = []
+    async for update in graph.astream(state, config, stream_mode="updates"):
+        for node_update in update.values():
+            new_messages.extend((node_update or {}).get("messages", []))
+    return new_messages
+
+
+async def astream_supervisor(
+    state: AgentState,
+    agents: Dict[str, LazyAgent],
+    config: Optional[RunnableConfig] = None,
+    graph=None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Supervisor 스트리밍 실행
+
+    컴파일된 그래프와 같은 라우팅 → 단일 에이전트 흐름을 따르되,
+    라우팅 결과(route) → 출처(sources) → 토큰(token) → 최종 메시지(message) 이벤트를 바로 전달합니다.
+
+    Args:
+        state: 입력 상태
+        agents: create_lazy_agents() 로 만든 노드 이름 → LazyAgent
+        config: 실행 설정
+        graph: create_supervisor_graph() 로 만든 그래프 (체크포인터가 있으면 이전 대화를 불러와 에이전트에 전달하고
+            응답 메시지를 스레드 상태에 기록)
+
+    Yields:
+        Dict: {"event": 이벤트 종류, "data": 데이터}
+    """
+    if graph is not None and graph.checkpointer is not None and not state.get("messages"):
+        # 그래프 실행과 같이 스레드의 이전 대화(체크포인트 messages)를 에이전트에 전달
+        snapshot = await graph.aget_state(config)
+        state = {**state, "messages": list((snapshot.values or {}).get("messages") or [])}
+
+    route = await aroute_agent(state)
+    yield {"event": "route", "data": route}
+
+    messages = []
+    async for event in agents[route].astream(state, config or {}):
+        if event["event"] == "message":
+            messages.append(event["data"])
+        yield event
+
+    # 그래프를 거치지 않은 스트리밍 응답도 체크포인터의 대화 메모리에 반영
+    if graph is not None and graph.checkpointer is not None and messages:
+        await graph.aupdate_state(config, {"input_query": state["input_query"], "messages": messages}, as_node=route)
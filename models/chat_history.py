@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, Text, JSON
+from sqlalchemy import Index
+
+from config.db_config import Base
+
+from datetime import datetime
+
+class ChatHistoryTurn(Base):
+    __tablename__ = "chat_history_turn"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    thread_id = Column(String(100), nullable=False)
+    query = Column(Text, nullable=False)
+    messages = Column(JSON, nullable=False)
+    created_at = Column(String(50), default=lambda: datetime.now().isoformat())
+
+    # 스레드별 최신순 조회 / 오래된 턴 정리용 인덱스
+    __table_args__ = (
+        Index('idx_thread_id_id', thread_id, id),
+    )
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List
+
+'''
+담당자 매칭 에이전트 요청당 준비 비용 비교 (cold vs warm)
+
+- cold: 요청마다 OpenAIEmbeddings / Chroma 클라이언트 / ChatOpenAI 를 새로 만들고 디스크에서 인덱스를 다시 읽음 (기존 방식)
+- warm: 프로세스 공유 EmployeeMatcher 의 캐시된 벡터DB / LLM 클라이언트 사용 (현재 방식)
+
+기본값은 네트워크 없이 측정하도록 인덱스 차원의 고정 벡터로 검색(similarity_search_by_vector)하고 LLM 은 호출하지 않습니다.
+--query 를 주면 질의 임베딩(OpenAI API 호출)까지 포함해 측정합니다.
+실행: python scripts/benchmark_matching_agent.py --requests 20
+'''
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 클라이언트 생성에 키가 필요함 (기본 설정에서는 API 를 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings  # noqa: E402
+from langchain_community.vectorstores import Chroma  # noqa: E402
+
+from agents.matching_agent import EMPLOYEE_DB_PATH, MATCHING_LLM_MODEL, EmployeeMatcher  # noqa: E402
+from vector_store.registry import OPENAI_EMBEDDING_MODEL, release_vectorstore  # noqa: E402
+
+
+def probe_vector(vectorstore: Chroma) -> List[float]:
+    """인덱스에 저장된 첫 번째 임베딩 (검색용 고정 벡터)"""
+    stored = vectorstore._collection.get(limit=1, include=["embeddings"])
+    if not stored["embeddings"]:
+        raise SystemExit(f"❌ 직원 정보 벡터 DB 가 비어 있습니다: {EMPLOYEE_DB_PATH}")
+    return list(stored["embeddings"][0])
+
+
+def cold_request(query: str, vector: List[float], k: int) -> None:
+    # 기존 구현처럼 요청마다 모든 클라이언트를 새로 만들고 인덱스를 다시 읽음
+    release_vectorstore(EMPLOYEE_DB_PATH, reload_from_disk=True)
+    embeddings = OpenAIEmbeddings(model=OPENAI_EMBEDDING_MODEL)
+    vectorstore = Chroma(persist_directory=EMPLOYEE_DB_PATH, embedding_function=embeddings)
+    ChatOpenAI(model=MATCHING_LLM_MODEL, temperature=0)
+    if query:
+        vectorstore.similarity_search(query, k=k)
+    else:
+        vectorstore.similarity_search_by_vector(vector, k=k)
+
+
+def warm_request(matcher: EmployeeMatcher, query: str, vector: List[float]) -> None:
+    if query:
+        matcher.find_candidates(query)
+    else:
+        matcher.vectorstore().similarity_search_by_vector(vector, k=matcher.k)
+
+
+def measure(run: Callable[[], None], requests: int) -> Dict[str, float]:
+    seconds = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return {
+        "mean_ms": statistics.mean(seconds) * 1000,
+        "p50_ms": statistics.median(seconds) * 1000,
+        "max_ms": max(seconds) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="담당자 매칭 에이전트 cold / warm 요청 준비 비용 비교")
+    parser.add_argument("--requests", type=int, default=20, help="측정할 요청 수")
+    parser.add_argument("--query", default="", help="지정하면 질의 임베딩(OpenAI API 호출)까지 포함해 측정")
+    parser.add_argument("--k", type=int, default=3, help="검색할 후보 직원 수")
+    args = parser.parse_args()
+
+    matcher = EmployeeMatcher(k=args.k)
+    vector = probe_vector(matcher.vectorstore())
+
+    results = {
+        "cold (요청마다 클라이언트 생성 + 인덱스 로드)": measure(lambda: cold_request(args.query, vector, args.k), args.requests),
+    }
+    # cold 측정에서 해제한 캐시를 다시 채운 뒤 warm 측정
+    matcher.invalidate()
+    warm_request(matcher, args.query, vector)
+    results["warm (공유 EmployeeMatcher)"] = measure(lambda: warm_request(matcher, args.query, vector), args.requests)
+
+    target = "질의 임베딩 + 검색" if args.query else "고정 벡터 검색"
+    print(f"\n📊 담당자 매칭 준비 비용 ({target}, 요청 {args.requests}회, LLM 호출 제외)")
+    for name, result in results.items():
+        print(f"  - {name}: 평균 {result['mean_ms']:.2f} ms, p50 {result['p50_ms']:.2f} ms, 최대 {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
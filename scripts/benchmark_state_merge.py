@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TypedDict
+
+from langgraph.graph import StateGraph, END
+
+'''
+그래프 상태 병합 방식별 요청당 메모리 할당 비교 (tracemalloc)
+
+- legacy: 노드마다 deepcopy(state) + update, 에이전트는 {**state, 전체 messages 복사본, raw_search_result} 반환
+- delta: 에이전트는 새 메시지만 반환하고 messages 는 리듀서가 누적 (현재 graph.py 방식)
+
+LLM / 벡터 DB 없이 문서 검색 에이전트 크기의 가짜 응답으로 상태 병합 비용만 측정합니다.
+실행: python scripts/benchmark_state_merge.py --history 200 --requests 20
+'''
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# graph 모듈은 라우터용 ChatOpenAI 를 만들기 때문에 키가 필요함 (벤치마크는 LLM 을 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import agent_state  # noqa: E402
+from agent_state import AgentState  # noqa: E402
+from graph import state_delta  # noqa: E402
+
+
+def make_message(i: int) -> Dict[str, Any]:
+    """문서 검색 에이전트 응답 크기의 메시지 (답변 + 출처 5개)"""
+    return {
+        "answer": f"{i}번째 답변입니다. " * 60,
+        "sources": [
+            {"content": "스마트팜 센서 데이터 수집 주기와 저장 방식에 대한 설명. " * 25,
+             "section": "2. 시스템 구성", "source": f"./data/reports/report_{k}.pdf",
+             "filename": f"report_{k}.pdf", "rank": k + 1}
+            for k in range(5)
+        ],
+    }
+
+
+def make_raw_search_result(message: Dict[str, Any]) -> Dict[str, Any]:
+    context = "\n\n".join(source["content"] for source in message["sources"])
+    return {**message, "context": context, "success": True}
+
+
+class LegacyState(TypedDict):
+    input_query: str
+    thread_id: str
+    project_name: Optional[str]
+    project_explain: Optional[str]
+    messages: List[Any]
+
+
+def build_legacy_graph():
+    def agent(state, config):
+        messages = list(state.get("messages", []))
+        message = make_message(len(messages))
+        messages.append(message)
+        return {**state, "messages": messages, "agent": "search_agent", "raw_search_result": make_raw_search_result(message)}
+
+    def node(state, config):
+        result = agent(state, config)
+        new_state = deepcopy(state)
+        new_state.update(result)
+        return new_state
+
+    builder = StateGraph(LegacyState)
+    builder.add_node("agent", node)
+    builder.set_entry_point("agent")
+    builder.add_edge("agent", END)
+    return builder.compile()
+
+
+def build_delta_graph():
+    def agent(state, config):
+        message = make_message(len(state.get("messages", [])))
+        return {"messages": [message], "agent": "search_agent"}
+
+    def node(state, config):
+        return state_delta(state, agent(state, config))
+
+    builder = StateGraph(AgentState)
+    builder.add_node("agent", node)
+    builder.set_entry_point("agent")
+    builder.add_edge("agent", END)
+    return builder.compile()
+
+
+def measure(graph, history: List[Any], requests: int) -> Dict[str, float]:
+    """요청마다 tracemalloc 최고 사용량 증가분과 실행 시간 측정"""
+    peaks, seconds = [], []
+    for i in range(requests):
+        state = {
+            "input_query": f"질문 {i}",
+            "thread_id": "benchmark",
+            "project_name": "차세대 한국형 스마트팜 개발",
+            "project_explain": "스마트팜 기술개발 프로젝트",
+            "messages": list(history),
+        }
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        graph.invoke(state, {"configurable": {"thread_id": "benchmark"}})
+        seconds.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    return {
+        "peak_kb": sum(peaks) / len(peaks) / 1024,
+        "ms": sum(seconds) / len(seconds) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그래프 상태 병합 방식별 요청당 메모리 할당 비교")
+    parser.add_argument("--history", type=int, default=200, help="요청 시점에 상태에 들어 있는 메시지 수")
+    parser.add_argument("--requests", type=int, default=20, help="측정할 요청 수")
+    args = parser.parse_args()
+
+    # legacy 상태처럼 전체 히스토리 + 새 메시지를 유지하도록 리듀서 상한을 올려 같은 메시지 수로 비교
+    agent_state.MAX_STATE_MESSAGES = max(agent_state.MAX_STATE_MESSAGES, args.history + 1)
+
+    history = [make_message(i) for i in range(args.history)]
+    tracemalloc.start()
+    results = {
+        "legacy (deepcopy + 전체 상태 반환)": measure(build_legacy_graph(), history, args.requests),
+        "delta (리듀서 + 변경분 반환)": measure(build_delta_graph(), history, args.requests),
+    }
+    tracemalloc.stop()
+
+    print(f"\n📊 상태 병합 벤치마크 (기존 메시지 {args.history}개, 요청 {args.requests}회 평균)")
+    for name, result in results.items():
+        print(f"  - {name}: 요청당 최고 할당 {result['peak_kb']:,.0f} KB, {result['ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
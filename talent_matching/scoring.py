@@ -0,0 +1,363 @@
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+'''
+프로젝트-신입사원 매칭 점수 계산 엔진 (LLM 없이 결정적으로 계산)
+
+HumanResource 필드(skills, projects, certifications, position, department, join_date)로
+후보 전체를 한 번에 채점합니다. 후보별 기술/자격증/프로젝트 키워드를 0/1 희소 행렬(CSR)로 만들고,
+프로젝트 요구사항과의 일치 여부를 행렬 곱으로 계산합니다. 만 명 규모에서도 행렬은 수 MB 이내입니다.
+
+평가 기준 (smart_hr_matcher 프롬프트와 같은 배점)
+1. 핵심 기술 일치도 (0~4.0): 필요한 기술 스택 중 보유한 기술 비율
+2. 실무 프로젝트 경험 연관성 (0~2.5): 기존 프로젝트 이름과 프로젝트 설명/역할/기술의 키워드 일치 (+ 벡터 유사도)
+3. 자격증 및 전문 역량 (0~2.0): 프로젝트와 관련된 자격증 수
+4. 업무 연속성 및 경력 적합성 (0~1.5): 직책-역할 일치, 부서-프로젝트 일치, 근속 기간
+'''
+
+MAX_SCORES = {
+    "tech_match": 4.0,
+    "project_experience": 2.5,
+    "certifications": 2.0,
+    "career_fit": 1.5,
+}
+# 관련 키워드가 이 개수 이상 겹치면 프로젝트 경험 / 자격증 만점
+PROJECT_OVERLAP_TARGET = 3
+CERTIFICATION_TARGET = 2
+# 근속 기간 만점 기준 (년)
+TENURE_TARGET_YEARS = 3.0
+
+TERM_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9+#.\-/]*[A-Za-z0-9+#]|[A-Za-z]|[가-힣]+|\d+")
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+# 프로젝트 설명에 흔히 나오지만 적합도를 구분하지 못하는 단어
+STOPWORDS = {
+    "및", "등", "위한", "개발", "시스템", "프로젝트", "경험", "우대", "필요", "능력", "지식", "보유자", "선호합니다",
+    "있는", "분을", "우대합니다", "필수", "구축", "처리", "저장", "수집", "관리", "운영", "the", "and", "of",
+}
+# 한글 토큰을 부분 문자열로 일치시킬 최소 글자 수 (짧은 토큰은 어절 전체가 같아야 일치)
+HANGUL_SUBSTRING_MIN_CHARS = 3
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(str(term).lower().split())
+
+
+def term_tokens(text: str) -> List[str]:
+    """영문/숫자 단어와 한글 어절을 소문자 토큰으로 분리 (불용어 제외)"""
+    return [token for token in (match.lower() for match in TERM_PATTERN.findall(str(text))) if token not in STOPWORDS]
+
+
+def split_terms(value: Any) -> List[str]:
+    """리스트 또는 쉼표 구분 문자열을 정규화된 항목 리스트로 변환"""
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else str(value).split(",")
+    return [normalize_term(item) for item in items if str(item).strip()]
+
+
+def _token_matches(token: str, tokens: Sequence[str], text: str) -> bool:
+    """
+    토큰 일치 여부
+
+    한글은 HANGUL_SUBSTRING_MIN_CHARS 글자 이상일 때만 부분 문자열도 허용합니다
+    ('빅데이터' ↔ '빅데이터분석기사'). 두 글자 토큰은 어절 전체가 같아야 하므로 '처리' ↛ '정보처리기사'.
+    """
+    if HANGUL_PATTERN.search(token) and len(token) >= HANGUL_SUBSTRING_MIN_CHARS:
+        return token in text
+    return token in tokens
+
+
+def related_to(term: str, tokens: Sequence[str], text: str) -> bool:
+    """항목(프로젝트 이름, 자격증 등)이 요구사항 키워드와 관련 있는지 (양방향 토큰 일치)"""
+    term_token_list, term_text = term_tokens(term), normalize_term(term)
+    return (
+        any(_token_matches(token, tokens, text) for token in term_token_list)
+        or any(_token_matches(token, term_token_list, term_text) for token in tokens)
+    )
+
+
+def terms_match(a: str, b: str) -> bool:
+    """
+    두 항목(기술명, 자격증명 등)의 일치 여부
+
+    한쪽의 토큰이 모두 다른 쪽에 포함되면 일치로 봅니다 ('aws' ↔ 'aws lambda', 'java' ↛ 'javascript').
+    """
+    a_tokens, b_tokens = term_tokens(a), term_tokens(b)
+    if not a_tokens or not b_tokens:
+        return False
+    a_text, b_text = normalize_term(a), normalize_term(b)
+    return (
+        all(_token_matches(token, b_tokens, b_text) for token in a_tokens)
+        or all(_token_matches(token, a_tokens, a_text) for token in b_tokens)
+    )
+
+
+def _incidence(rows: Sequence[Iterable[str]]) -> Tuple[List[str], sparse.csr_matrix]:
+    """항목 리스트들 → (어휘, 후보 × 어휘 0/1 희소 행렬)"""
+    vocab: Dict[str, int] = {}
+    indptr, indices = [0], []
+    for items in rows:
+        indices.extend(sorted({vocab.setdefault(item, len(vocab)) for item in items}))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    matrix = sparse.csr_matrix((data, np.asarray(indices, dtype=np.int32), np.asarray(indptr)), shape=(len(rows), len(vocab)))
+    return list(vocab), matrix
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def candidate_from_model(employee) -> Dict[str, Any]:
+    """HumanResource 모델 → 채점용 후보 딕셔너리"""
+    return {
+        "id": str(employee.id),
+        "name": employee.name,
+        "position": employee.position or "",
+        "department": employee.department or "",
+        "join_date": employee.join_date,
+        "skills": list(employee.skills or []),
+        "projects": list(employee.projects or []),
+        "certifications": list(employee.certifications or []),
+        "profile_summary": employee.profile_summary or "",
+    }
+
+
+def project_requirements(project: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    프로젝트 정보 → 채점용 요구사항
+
+    Args:
+        project: project_name, project_description, project_role, tech_stack, additional_info 키를 가진 딕셔너리
+            (ProjectInfoResponse.model_dump() 와 같은 형태)
+    """
+    text = " ".join(str(project.get(key) or "") for key in (
+        "project_name", "project_description", "project_role", "tech_stack", "additional_info"
+    ))
+    return {
+        "skills": split_terms(project.get("tech_stack")),
+        "role_tokens": term_tokens(project.get("project_role") or ""),
+        "tokens": sorted(set(term_tokens(text))),
+        "text": normalize_term(text),
+    }
+
+
+class CandidateMatrix:
+    """후보 전체의 기술/자격증/프로젝트 키워드 행렬 (한 번 만들어 여러 프로젝트 채점에 재사용)"""
+
+    def __init__(self, candidates: List[Dict[str, Any]], today: Optional[date] = None):
+        """
+        Args:
+            candidates: 후보 딕셔너리 리스트 (candidate_from_model 형식)
+            today: 근속 기간 기준일 (기본값: 오늘)
+        """
+        self.candidates = candidates
+        self.skill_vocab, self.skills = _incidence([split_terms(c.get("skills")) for c in candidates])
+        self.cert_vocab, self.certs = _incidence([split_terms(c.get("certifications")) for c in candidates])
+        self.project_vocab, self.project_tokens = _incidence(
+            [set(term_tokens(" ".join(split_terms(c.get("projects"))))) for c in candidates]
+        )
+        # 직책/부서는 고유값별로 한 번만 비교하도록 범주 코드로 저장
+        self.position_values, self.position_codes = np.unique(
+            np.asarray([normalize_term(c.get("position") or "") for c in candidates], dtype=object), return_inverse=True
+        )
+        self.department_values, self.department_codes = np.unique(
+            np.asarray([normalize_term(c.get("department") or "") for c in candidates], dtype=object), return_inverse=True
+        )
+        self._vector_cache: Dict[Tuple, Dict[str, Optional[np.ndarray]]] = {}
+        today = today or date.today()
+        join_dates = [_to_date(c.get("join_date")) for c in candidates]
+        self.tenure_years = np.asarray(
+            [(today - joined).days / 365.25 if joined else 0.0 for joined in join_dates], dtype=np.float32
+        )
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _vocab_vector(self, vocab: List[str], predicate) -> np.ndarray:
+        return np.asarray([1.0 if predicate(term) else 0.0 for term in vocab], dtype=np.float32)
+
+    def _requirement_vectors(self, requirements: Dict[str, Any]) -> Dict[str, Optional[np.ndarray]]:
+        """어휘별 요구사항 일치 벡터 (기술은 필요 기술마다 한 열, 같은 프로젝트는 사전 선별/채점에서 재사용)"""
+        key = (tuple(requirements["skills"]), requirements["text"])
+        cached = self._vector_cache.get(key)
+        if cached is None:
+            if len(self._vector_cache) >= 64:
+                self._vector_cache.clear()
+            cached = self._vector_cache[key] = self._build_requirement_vectors(requirements)
+        return cached
+
+    def _build_requirement_vectors(self, requirements: Dict[str, Any]) -> Dict[str, Optional[np.ndarray]]:
+        required, tokens, text = requirements["skills"], requirements["tokens"], requirements["text"]
+        skills = None
+        if required and self.skill_vocab:
+            skills = np.stack([
+                self._vocab_vector(self.skill_vocab, lambda term, skill=skill: terms_match(skill, term))
+                for skill in required
+            ], axis=1)
+        return {
+            "skills": skills,
+            "projects": self._vocab_vector(self.project_vocab, lambda token: related_to(token, tokens, text)),
+            "certifications": self._vocab_vector(
+                self.cert_vocab,
+                lambda cert: related_to(cert, tokens, text) or any(terms_match(skill, cert) for skill in required)
+            ),
+        }
+
+    def prefilter(self, project: Dict[str, Any]) -> np.ndarray:
+        """
+        필요 기술 / 관련 자격증 / 관련 프로젝트 키워드가 하나라도 있는 후보 행 번호 (채점 대상 사전 선별)
+        """
+        vectors = self._requirement_vectors(project_requirements(project))
+        hits = np.zeros(len(self.candidates), dtype=np.float32)
+        if vectors["skills"] is not None:
+            hits += np.asarray(self.skills @ vectors["skills"].sum(axis=1)).ravel()
+        if self.cert_vocab:
+            hits += self.certs @ vectors["certifications"]
+        if self.project_vocab:
+            hits += self.project_tokens @ vectors["projects"]
+        return np.flatnonzero(hits > 0)
+
+    def score(self, project: Dict[str, Any], similarities: Optional[np.ndarray] = None,
+              rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        후보 전체(또는 rows 로 지정한 후보)의 평가 항목별 점수 계산
+
+        Args:
+            project: 프로젝트 정보 딕셔너리
+            similarities: 후보별 벡터 유사도 (0~1, rows 와 같은 순서, 있으면 프로젝트 경험 점수에 반영)
+            rows: 채점할 후보 행 번호 (None 이면 전체)
+
+        Returns:
+            {"tech_match", "project_experience", "certifications", "career_fit", "total"} → 후보별 점수 배열
+        """
+        requirements = project_requirements(project)
+        rows = np.arange(len(self.candidates)) if rows is None else np.asarray(rows)
+        n = len(rows)
+
+        vectors = self._requirement_vectors(requirements)
+        tokens, text = requirements["tokens"], requirements["text"]
+
+        # 1. 핵심 기술 일치도: (후보 × 기술 어휘) @ (기술 어휘 × 필요 기술) → 필요 기술별 보유 여부
+        if vectors["skills"] is not None:
+            covered = (self.skills[rows] @ vectors["skills"]) > 0
+            tech_match = covered.mean(axis=1)
+        else:
+            tech_match = np.zeros(n, dtype=np.float32)
+
+        # 2. 실무 프로젝트 경험: 프로젝트 이름 키워드 중 요구사항 키워드와 겹치는 수
+        overlap = self.project_tokens[rows] @ vectors["projects"] if self.project_vocab else np.zeros(n)
+        experience = np.minimum(overlap / PROJECT_OVERLAP_TARGET, 1.0)
+        if similarities is not None:
+            experience = 0.6 * experience + 0.4 * np.clip(np.asarray(similarities, dtype=np.float32), 0.0, 1.0)
+
+        # 3. 자격증: 요구사항 키워드 / 필요 기술과 관련된 자격증 수
+        cert_count = self.certs[rows] @ vectors["certifications"] if self.cert_vocab else np.zeros(n)
+        certifications = np.minimum(cert_count / CERTIFICATION_TARGET, 1.0)
+
+        # 4. 경력 적합성: 직책-역할 일치 + 부서-프로젝트 일치 + 근속 기간
+        role_fit = self._role_scores(self.position_values, requirements["role_tokens"])[self.position_codes[rows]]
+        department_fit = self._role_scores(self.department_values, tokens, text)[self.department_codes[rows]]
+        tenure = np.clip(self.tenure_years[rows] / TENURE_TARGET_YEARS, 0.0, 1.0)
+        career_fit = 0.6 * role_fit + 0.2 * department_fit + 0.2 * tenure
+
+        scores = {
+            "tech_match": tech_match * MAX_SCORES["tech_match"],
+            "project_experience": experience * MAX_SCORES["project_experience"],
+            "certifications": certifications * MAX_SCORES["certifications"],
+            "career_fit": career_fit * MAX_SCORES["career_fit"],
+        }
+        scores = {name: np.round(values.astype(np.float32), 2) for name, values in scores.items()}
+        scores["total"] = np.round(sum(scores.values()), 2)
+        return scores
+
+    def _role_scores(self, values: np.ndarray, targets: List[str], target_text: str = "") -> np.ndarray:
+        """
+        범주 값(직책/부서)마다 요구 토큰과의 일치도 (0~1)
+
+        직책은 역할 토큰 중 일치 비율, 부서는 부서명 토큰이 프로젝트 키워드에 있는 비율로 계산합니다.
+        """
+        per_value = np.zeros(len(values), dtype=np.float32)
+        if not targets:
+            return per_value
+        for i, value in enumerate(values):
+            value_tokens = term_tokens(value)
+            if not value_tokens:
+                continue
+            if target_text:
+                hits = sum(_token_matches(token, targets, target_text) for token in value_tokens)
+                per_value[i] = hits / len(value_tokens)
+            else:
+                hits = sum(_token_matches(token, value_tokens, value) for token in targets)
+                per_value[i] = hits / len(targets)
+        return per_value
+
+    def evidence(self, index: int, project: Dict[str, Any]) -> Dict[str, List[str]]:
+        """선정 이유 작성용 근거 (일치 기술, 관련 프로젝트, 관련 자격증)"""
+        requirements = project_requirements(project)
+        candidate = self.candidates[index]
+        tokens, text = requirements["tokens"], requirements["text"]
+        skills = split_terms(candidate.get("skills"))
+        original_skills = [str(skill) for skill in candidate.get("skills") or []]
+        return {
+            "skills": [
+                original for original, skill in zip(original_skills, skills)
+                if any(terms_match(required, skill) for required in requirements["skills"])
+            ],
+            "projects": [
+                project_name for project_name in candidate.get("projects") or []
+                if related_to(project_name, tokens, text)
+            ],
+            "certifications": [
+                cert for cert in candidate.get("certifications") or []
+                if related_to(cert, tokens, text)
+                or any(terms_match(skill, normalize_term(cert)) for skill in requirements["skills"])
+            ],
+            "missing_skills": [
+                required for required in requirements["skills"]
+                if not any(terms_match(required, skill) for skill in skills)
+            ],
+        }
+
+    def rank(self, project: Dict[str, Any], top_n: int = 3, similarities: Optional[np.ndarray] = None,
+             rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        종합 점수 상위 top_n 명
+
+        Returns:
+            [{"candidate", "row", "total_score", "scores": 항목별 점수, "evidence", "similarity"}] (점수 내림차순)
+        """
+        rows = np.arange(len(self.candidates)) if rows is None else np.asarray(rows)
+        if len(rows) == 0:
+            return []
+        scores = self.score(project, similarities, rows)
+        similarity = np.zeros(len(rows)) if similarities is None else np.asarray(similarities, dtype=np.float32)
+        # 종합 점수 → 유사도 → 입력 순서 기준 정렬 (같은 입력이면 항상 같은 순위)
+        order = np.lexsort((np.arange(len(rows)), -similarity, -scores["total"]))[:top_n]
+        return self.entries(project, rows, scores, similarity, order)
+
+    def entries(self, project: Dict[str, Any], rows: np.ndarray, scores: Dict[str, np.ndarray],
+                similarity: np.ndarray, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        """score() 결과에서 indices 위치의 후보를 rank 결과 형식으로 변환"""
+        return [
+            {
+                "candidate": self.candidates[rows[i]],
+                "row": int(rows[i]),
+                "total_score": round(float(scores["total"][i]), 2),
+                "scores": {name: round(float(scores[name][i]), 2) for name in MAX_SCORES},
+                "evidence": self.evidence(int(rows[i]), project),
+                "similarity": round(float(similarity[i]), 4),
+            }
+            for i in indices
+        ]
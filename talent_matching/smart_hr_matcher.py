@@ -1,127 +1,301 @@
 from dotenv import load_dotenv
-import json
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
+import re
+import asyncio
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
+from talent_matching.scoring import CandidateMatrix
+from talent_matching.talent_pool import get_talent_pool
+from vector_store.registry import get_vectorstore, OPENAI_EMBEDDING_MODEL
 
 import os
 
 # 환경 변수 로드
 load_dotenv()
 
-# 벡터 DB 초기화
-embedding_model = OpenAIEmbeddings()
-
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 vector_store_path = os.path.join(project_root, 'vector_store', 'db', 'new_employee_chroma')
 
-vectorstore = Chroma(
-    embedding_function=embedding_model,
-    persist_directory=vector_store_path
-)
+# 벡터 DB는 최초 매칭 요청 시점에 로드 (import 만으로 서버 기동이 지연되지 않도록)
+def load_vectorstore():
+    return get_vectorstore(
+        vector_store_path,
+        model_name=OPENAI_EMBEDDING_MODEL,
+        provider="openai"
+    )
 
-# 프롬프트 템플릿 정의 (수정된 평가 기준)
-matching_prompt = PromptTemplate(
-    input_variables=['new_employees', 'project_info', 'top_n'],
+SHORTLIST_SIZE = int(os.getenv("HR_MATCHING_SHORTLIST", "50"))  # 벡터 검색으로 채점 대상에 올릴 후보 수
+REASON_LLM_MODEL = "gpt-4o-mini"
+
+# 선정 이유 작성 프롬프트 (점수는 scoring 엔진이 계산하고 LLM 은 이유만 작성)
+reason_prompt = PromptTemplate(
+    input_variables=['project_info', 'candidates'],
     template="""
 다음은 프로젝트 요구사항입니다.
 {project_info}
 
-다음은 신입사원의 프로필 목록입니다.
-{new_employees}
-
-위 프로젝트에 가장 적합한 신입사원 {top_n}명을 선정하고 그 이유를 설명해주세요.
-선정 기준:
-1. 핵심 기술 일치도 (40%) - 프로젝트에 필요한 핵심 기술이 신입사원의 스킬 목록에 얼마나 포함되어 있는지
-2. 실무 프로젝트 경험 연관성 (25%) - 신입사원의 기존 프로젝트 경험이 새 프로젝트와 얼마나 유사한지, 구체적인 성과를 고려
-3. 자격증 및 전문 역량 (20%) - 프로젝트 관련 전문 자격증 보유 여부, 공식적으로 인증된 기술 역량
-4. 업무 연속성 및 경력 적합성 (15%) - 현재 직책/부서가 프로젝트와 얼마나 일치하는지, 입사 기간과 업무 프로필 요약을 고려
-
-다음 형식으로 반환하세요:
--프로젝트명:
--추천 인재: [
-        이름:
-        ID:
-        부서:
-        기술 스택:
-        종합 점수: 0.0    # 0.0~10.0 사이 점수
-        평가 항목별 점수: 
-            핵심 기술 일치도: 0.0,    # 0.0~4.0
-            실무 프로젝트 경험 연관성: 0.0,    # 0.0~2.5
-            자격증 및 전문 역량: 0.0,    # 0.0~2.0
-            업무 연속성 및 경력 적합성: 0.0    # 0.0~1.5
-        
-        선정 이유: 
-            상세한 이유 1,
-            상세한 이유 2,
-            상세한 이유 3
-        
-        ]
-매칭 과정에서 각 기준별 점수를 명확하게 계산하고, 그 근거를 상세히 설명해주세요. 각 신입사원이 해당 프로젝트에 왜 적합한지 구체적인 이유를 제공하고, 각 선정 기준에 따른 점수를 투명하게 보여주세요.
+아래 신입사원들은 평가 점수 계산이 끝난 추천 인재입니다. 점수는 바꾸지 말고, 각 신입사원의 선정 이유를 작성해주세요.
+평가 기준: 핵심 기술 일치도(0~4.0), 실무 프로젝트 경험 연관성(0~2.5), 자격증 및 전문 역량(0~2.0), 업무 연속성 및 경력 적합성(0~1.5)
+
+{candidates}
+
+각 신입사원마다 점수 근거(일치 기술, 관련 프로젝트, 자격증, 직책/부서)를 바탕으로 구체적인 선정 이유 3개를 한국어 한 문장씩 작성하세요.
+다른 설명 없이 다음 JSON 형식으로만 반환하세요:
+{{"<ID>": ["상세한 이유 1", "상세한 이유 2", "상세한 이유 3"]}}
 """
 )
 
+_llm = None
+
+def get_llm():
+    """선정 이유 작성용 공유 LLM 클라이언트"""
+    global _llm
+    if _llm is None:
+        _llm = ChatOpenAI(model_name=REASON_LLM_MODEL, temperature=0)
+    return _llm
+
+def llm_reasons_enabled() -> bool:
+    return os.getenv("HR_MATCHING_LLM_REASONS", "true").lower() not in ("0", "false", "no")
+
+PROJECT_TEXT_FIELDS = {
+    "프로젝트 이름": "project_name",
+    "프로젝트 설명": "project_description",
+    "필요한 역할": "project_role",
+    "필요한 기술 스택": "tech_stack",
+    "추가 정보": "additional_info",
+}
+DOCUMENT_TEXT_FIELDS = {"입사일": "join_date", "기술": "skills", "프로젝트": "projects", "자격증": "certifications"}
+FIELD_LINE_PATTERN = re.compile(r"^[ \t]*([^:\n]+?)[ \t]*:[ \t]*(.*)$", re.MULTILINE)
+
+def parse_project_info(project_info: str) -> Dict[str, str]:
+    """'프로젝트 이름: ...' 형식의 프로젝트 정보 텍스트 → 프로젝트 딕셔너리"""
+    project = {field: "" for field in PROJECT_TEXT_FIELDS.values()}
+    for label, value in FIELD_LINE_PATTERN.findall(project_info):
+        if label in PROJECT_TEXT_FIELDS:
+            project[PROJECT_TEXT_FIELDS[label]] = value.strip()
+    if not any(project.values()):
+        project["project_description"] = project_info.strip()
+    return project
+
+def format_project_info(project: Dict[str, str]) -> str:
+    return "\n".join(f"{label}: {project.get(field) or ''}" for label, field in PROJECT_TEXT_FIELDS.items())
+
+def split_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+def candidate_from_document(doc) -> Dict[str, Any]:
+    """신입사원 벡터 DB 문서 → 채점용 후보 딕셔너리 (메타데이터에 없는 필드는 본문에서 읽음)"""
+    metadata = doc.metadata or {}
+    fields = {}
+    for label, value in FIELD_LINE_PATTERN.findall(doc.page_content or ""):
+        if label in DOCUMENT_TEXT_FIELDS:
+            fields[DOCUMENT_TEXT_FIELDS[label]] = value.strip()
+
+    def values(field):
+        return split_list(metadata.get(field) or fields.get(field))
+
+    return {
+        "id": str(metadata.get("id", "")),
+        "name": metadata.get("name", "이름 정보 없음"),
+        "position": metadata.get("position", ""),
+        "department": metadata.get("department", ""),
+        "join_date": metadata.get("join_date") or fields.get("join_date"),
+        "skills": values("skills"),
+        "projects": values("projects"),
+        "certifications": values("certifications"),
+    }
+
+def shortlist_candidates(project: Dict[str, str], k: int = SHORTLIST_SIZE) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """벡터 검색으로 채점 대상 후보와 유사도(0~1) 조회"""
+    # 컬렉션 거리 함수에 맞춘 관련도 (store_new_employees.py 가 cosine 공간으로 만들므로 코사인 유사도,
+    # TalentPool.similarities 와 같은 척도)
+    results = load_vectorstore().similarity_search_with_relevance_scores(format_project_info(project), k=k)
+    candidates = [candidate_from_document(doc) for doc, _ in results]
+    similarities = np.clip(np.asarray([score for _, score in results], dtype=np.float32), 0.0, 1.0)
+    return candidates, similarities
+
+def rank_candidates(project: Dict[str, str], top_n: int = 3) -> List[Dict[str, Any]]:
+    """
+    후보 조회 + 점수 계산 (LLM 호출 없음)
+
+    Returns:
+        CandidateMatrix.rank 결과 (종합 점수 내림차순 top_n)
+    """
+    candidates, similarities = shortlist_candidates(project)
+    if not candidates:
+        return []
+    print(f"{len(candidates)}명의 후보를 채점합니다.")
+    return CandidateMatrix(candidates).rank(project, top_n, similarities)
+
+def _format_ranked(ranked: List[Dict[str, Any]]) -> str:
+    blocks = []
+    for entry in ranked:
+        candidate, evidence, scores = entry["candidate"], entry["evidence"], entry["scores"]
+        blocks.append(f"""ID: {candidate['id']}
+이름: {candidate['name']} / 직책: {candidate['position']} / 부서: {candidate['department']}
+종합 점수: {entry['total_score']} (기술 {scores['tech_match']}, 경험 {scores['project_experience']}, 자격증 {scores['certifications']}, 경력 {scores['career_fit']})
+일치 기술: {', '.join(evidence['skills']) or '없음'} / 부족한 기술: {', '.join(evidence['missing_skills']) or '없음'}
+관련 프로젝트: {', '.join(evidence['projects']) or '없음'}
+관련 자격증: {', '.join(evidence['certifications']) or '없음'}""")
+    return "\n\n".join(blocks)
+
+def default_reasons(entry: Dict[str, Any]) -> List[str]:
+    """LLM 없이 점수 근거로 작성한 선정 이유"""
+    candidate, evidence = entry["candidate"], entry["evidence"]
+    reasons = []
+    if evidence["skills"]:
+        reasons.append(f"프로젝트 핵심 기술 중 {', '.join(evidence['skills'])}을(를) 보유하고 있습니다.")
+    if evidence["projects"]:
+        reasons.append(f"{', '.join(evidence['projects'])} 프로젝트 경험이 새 프로젝트와 관련이 있습니다.")
+    if evidence["certifications"]:
+        reasons.append(f"관련 자격증({', '.join(evidence['certifications'])})을 보유하고 있습니다.")
+    reasons.append(f"현재 {candidate['department']}에서 {candidate['position']} 직책을 맡고 있습니다.")
+    return reasons
+
+def _reason_inputs(project: Dict[str, str], ranked: List[Dict[str, Any]]) -> Dict[str, str]:
+    return {'project_info': format_project_info(project), 'candidates': _format_ranked(ranked)}
+
+def _merge_reasons(ranked: List[Dict[str, Any]], reasons: Any) -> List[Dict[str, Any]]:
+    """채점 결과 + 선정 이유 → CandidateMatch 필드 딕셔너리"""
+    reasons = reasons if isinstance(reasons, dict) else {}
+    matches = []
+    for entry in ranked:
+        candidate = entry["candidate"]
+        candidate_reasons = reasons.get(candidate["id"])
+        if not isinstance(candidate_reasons, list) or not candidate_reasons:
+            candidate_reasons = default_reasons(entry)
+        matches.append({
+            "name": candidate["name"],
+            "id": candidate["id"],
+            "department": candidate["department"],
+            "tech_skills": ", ".join(candidate["skills"]),
+            "total_score": entry["total_score"],
+            "scores": entry["scores"],
+            "reasons": [str(reason) for reason in candidate_reasons],
+        })
+    return matches
+
+def match_project_candidates(project: Dict[str, str], top_n: int = 3) -> List[Dict[str, Any]]:
+    """
+    프로젝트에 적합한 신입사원 추천 (점수는 로컬 계산, LLM 은 선정 이유만 작성)
+
+    Args:
+        project: 프로젝트 정보 딕셔너리 (ProjectInfoResponse.model_dump() 형식)
+        top_n: 추천할 인원 수
+
+    Returns:
+        CandidateMatch 필드 딕셔너리 리스트 (종합 점수 내림차순)
+    """
+    ranked = rank_candidates(project, top_n)
+    reasons = None
+    if ranked and llm_reasons_enabled():
+        try:
+            reasons = (reason_prompt | get_llm() | JsonOutputParser()).invoke(_reason_inputs(project, ranked))
+        except Exception as e:
+            print(f"⚠️ 선정 이유 생성 실패, 점수 근거로 대체합니다: {e}")
+    return _merge_reasons(ranked, reasons)
+
+async def arank_candidates(project: Dict[str, str], top_n: int = 3) -> List[Dict[str, Any]]:
+    """
+    human_resource 전체 후보(TalentPool)에서 채점 (DB 를 읽을 수 없으면 벡터 검색 후보로 대체)
+    """
+    try:
+        return await get_talent_pool().arank(project, format_project_info(project), top_n)
+    except Exception as e:
+        print(f"⚠️ 신입사원 풀을 사용할 수 없어 벡터 검색 후보로 채점합니다: {e}")
+        return await asyncio.to_thread(rank_candidates, project, top_n)
+
+async def awrite_reasons(project: Dict[str, str], ranked: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """채점 결과에 LLM 선정 이유를 붙여 CandidateMatch 필드 딕셔너리로 변환"""
+    reasons = None
+    if ranked and llm_reasons_enabled():
+        try:
+            reasons = await (reason_prompt | get_llm() | JsonOutputParser()).ainvoke(_reason_inputs(project, ranked))
+        except Exception as e:
+            print(f"⚠️ 선정 이유 생성 실패, 점수 근거로 대체합니다: {e}")
+    return _merge_reasons(ranked, reasons)
+
+async def amatch_project_candidates(project: Dict[str, str], top_n: int = 3) -> List[Dict[str, Any]]:
+    """match_project_candidates 의 비동기 버전 (신입사원 전체 후보 대상)"""
+    return await awrite_reasons(project, await arank_candidates(project, top_n))
+
+async def amatch_projects(projects: List[Dict[str, str]], top_n: int = 3, unique: bool = False) -> List[List[Dict[str, Any]]]:
+    """
+    여러 프로젝트 일괄 매칭
+
+    프로젝트 설명 임베딩 1회 + (프로젝트 × 신입사원) 유사도 행렬로 한 번에 채점하고,
+    선정 이유 LLM 호출은 HR_MATCHING_LLM_CONCURRENCY 개까지 동시에 실행합니다.
+
+    Args:
+        projects: 프로젝트 정보 딕셔너리 리스트
+        top_n: 프로젝트당 추천 인원 수
+        unique: True 면 한 신입사원을 한 프로젝트에만 추천 (전역 배정)
+
+    Returns:
+        프로젝트별 CandidateMatch 필드 딕셔너리 리스트 (입력 순서)
+    """
+    try:
+        ranked_sets = await get_talent_pool().arank_batch(
+            projects, [format_project_info(project) for project in projects], top_n, unique
+        )
+    except Exception as e:
+        print(f"⚠️ 신입사원 풀을 사용할 수 없어 프로젝트별 벡터 검색 후보로 채점합니다 (전역 배정 미적용): {e}")
+        ranked_sets = await asyncio.gather(*(asyncio.to_thread(rank_candidates, project, top_n) for project in projects))
+
+    semaphore = asyncio.Semaphore(int(os.getenv("HR_MATCHING_LLM_CONCURRENCY", "4")))
+
+    async def write(project, ranked):
+        async with semaphore:
+            return await awrite_reasons(project, ranked)
+
+    return await asyncio.gather(*(write(project, ranked) for project, ranked in zip(projects, ranked_sets)))
+
+def format_matching_result(project: Dict[str, str], matches: List[Dict[str, Any]]) -> str:
+    """추천 결과를 기존 텍스트 형식(-프로젝트명 / -추천 인재 블록)으로 변환"""
+    blocks = [f"-프로젝트명: {project.get('project_name', '')}"]
+    for match in matches:
+        scores = match["scores"]
+        reasons = "\n".join(f"            {i}. {reason}" for i, reason in enumerate(match["reasons"], 1))
+        blocks.append(f"""-추천 인재: [
+        이름: {match['name']}
+        ID: {match['id']}
+        부서: {match['department']}
+        기술 스택: {match['tech_skills']}
+        종합 점수: {match['total_score']:.1f}
+        평가 항목별 점수:
+            핵심 기술 일치도: {scores['tech_match']:.1f},
+            실무 프로젝트 경험 연관성: {scores['project_experience']:.1f},
+            자격증 및 전문 역량: {scores['certifications']:.1f},
+            업무 연속성 및 경력 적합성: {scores['career_fit']:.1f}
+
+        선정 이유:
+{reasons}
+        ]""")
+    return "\n".join(blocks)
+
 # 프로젝트와 적합한 신입사원 매칭 함수 (메타데이터 활용)
 def match_project_with_employees(project_info, top_n=3):
     """
     프로젝트 정보를 기반으로 적합한 신입사원을 찾아 매칭합니다.
-    메타데이터를 활용하여 결과 품질을 향상시킵니다.
+    점수는 scoring 엔진으로 계산하고, 결과는 기존 텍스트 형식으로 반환합니다.
     """
     try:
-        # 디버깅 정보 출력
-        print(f"프로젝트 정보를 기반으로 검색을 시작합니다...")
-        # print(project_info)
-        # 1. 벡터 검색으로 적합한 후보 10명 찾기
-        results = vectorstore.similarity_search_with_score(
-            project_info, 
-            k=10  # 후보 풀로 10명 검색
-        )
-        
-        # 검색 결과 확인 (결과가 있는지)
-        if not results:
+        print("프로젝트 정보를 기반으로 검색을 시작합니다...")
+        project = parse_project_info(project_info) if isinstance(project_info, str) else project_info
+        matches = match_project_candidates(project, top_n)
+        if not matches:
             print("검색 결과가 없습니다.")
             return "적합한 신입사원을 찾을 수 없습니다."
-        
-        print(f"{len(results)}명의 후보를 찾았습니다.")
-        
-        # 2. 신입사원 정보 텍스트로 변환 (메타데이터 활용)
-        employees_text = ""
-        for i, (doc, score) in enumerate(results, 1):
-            # 메타데이터 확인
-            metadata = doc.metadata if hasattr(doc, 'metadata') else {}
-
-            # 메타데이터 정보 출력 (디버깅용)
-            print(f"후보 {i}: {metadata.get('name', '이름 없음')} - 유사도: {(1-score):.3f}")
-            
-            # 메타데이터를 포함한 구조화된 텍스트 생성
-            employee_info = f"""신입사원 #{i}:
-ID: {metadata.get('id', 'ID 정보 없음')}
-이름: {metadata.get('name', '이름 정보 없음')}
-직책: {metadata.get('position', '직책 정보 없음')}
-부서: {metadata.get('department', '부서 정보 없음')}
-기술 스택: {metadata.get('skills', '기술 정보 없음')}
 
-{doc.page_content}
-유사도 점수: {(1-score):.2f}
-
-"""
-            employees_text += employee_info
-        
-        # 3. LLM을 사용한 상세 매칭 수행
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0)
-        matching_chain = matching_prompt | llm
-        
-        # 매칭 결과 생성
-        print("LLM을 사용하여 최종 매칭을 수행 중...")
-        result = matching_chain.invoke({
-            'new_employees': employees_text,
-            'project_info': project_info,
-            'top_n': top_n
-        })
-        
         print("매칭 완료!")
-        return result.content
+        return format_matching_result(project, matches)
     
     except Exception as e:
         print(f"오류 발생: {str(e)}")
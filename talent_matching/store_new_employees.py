@@ -1,113 +1,139 @@
 from dotenv import load_dotenv
-import json
-from langchain_openai import OpenAIEmbeddings
+import asyncio
+import hashlib
 from langchain_community.vectorstores import Chroma
+from sqlalchemy import select
+from vector_store.registry import get_openai_embeddings, release_vectorstore
+from vector_store.embedding_pipeline import EmbeddingPipeline
 import os
 
+'''
+human_resource 테이블 전체(scripts/db_hr_init.py 로 적재한 약 만 명)를 신입사원 벡터 DB 에 저장합니다.
+
+직원 ID 를 문서 ID 로 사용하고 메타데이터에 임베딩 텍스트의 해시(content_hash)를 저장하여, 다시 실행하면
+새로 추가되었거나 내용이 바뀐 직원만 임베딩하고 테이블에서 삭제된 직원은 벡터 DB 에서도 삭제합니다.
+(updated_at 은 db_hr_init.py 가 실행할 때마다 현재 시각으로 채우므로 변경 여부 판단에 쓰지 않음)
+'''
+
 # 환경 변수 로드
 load_dotenv()
 
-print("=============== 신입사원 데이터 로드 시작 ===============")
-
-# JSON 파일 로드
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
-json_file_path = os.path.join(project_root, 'data', 'hr_employees_data.json')
-
-with open(json_file_path, 'r', encoding='utf-8') as file:
-    employees_data = json.load(file)
-
-# 데이터 개수 확인
-total_employees = len(employees_data["employees"])
-print(f"총 신입사원 수: {total_employees}")
-
-# 데이터 크기 제한 (100명만 사용)
-sample_size = 100  # 매우 작게 설정
-reduced_employees = employees_data["employees"][:sample_size]
-# print(f"샘플링한 신입사원 수: {len(reduced_employees)}")
-# print(f"첫 번째 신입사원: {reduced_employees[0]['name']}")
-# print(f"마지막 신입사원: {reduced_employees[-1]['name']}")
-
-# print("=============== 텍스트 변환 시작 ===============")
-
-# 직원 정보를 텍스트로 변환 - reduced_employees 사용!
-texts = []
-metadatas = []
-
-for employee in reduced_employees:  # reduced_employees 사용
-    # 직원 정보를 텍스트로 변환
-    text = f"""
-    이름: {employee['name']}
-    직책: {employee['position']}
-    부서: {employee['department']}
-    입사일: {employee['join_date']}
-    기술: {', '.join(employee['skills'])}
-    프로젝트: {', '.join(employee['projects'])}
-    학력: {employee['education']['degree']} ({employee['education']['school']})
-    자격증: {', '.join(employee['certifications'])}
-    언어: {', '.join(employee['languages'])}
-    프로필: {employee['profile_summary']}
+vectorstore_path = os.path.join(project_root, 'vector_store', 'db', 'new_employee_chroma')
+# 매칭 유사도를 TalentPool 의 코사인 유사도와 같은 척도로 쓰기 위한 거리 함수 (Chroma 기본값은 squared L2)
+COLLECTION_METADATA = {"hnsw:space": "cosine"}
+
+def _join(values):
+    return ', '.join(str(value) for value in (values or []))
+
+# 직원 정보를 텍스트로 변환
+def employee_text(employee) -> str:
+    return f"""
+    이름: {employee.name}
+    직책: {employee.position}
+    부서: {employee.department}
+    입사일: {employee.join_date}
+    기술: {_join(employee.skills)}
+    프로젝트: {_join(employee.projects)}
+    학력: {employee.education_degree} ({employee.education_school})
+    자격증: {_join(employee.certifications)}
+    언어: {_join(employee.languages)}
+    프로필: {employee.profile_summary}
     """
-    
-    # 메타데이터 추가
-    metadata = {
-        "id": employee["id"],
-        "name": employee["name"],
-        "position": employee["position"],
-        "department": employee["department"],
-        "skills": ", ".join(employee["skills"])
-    }
-    
-    texts.append(text)
-    metadatas.append(metadata)
 
-# print(f"변환된 텍스트 수: {len(texts)}")
-# print(f"첫 번째 텍스트 샘플: {texts[0][:100]}...")
+def content_hash(employee) -> str:
+    """임베딩 텍스트의 SHA-256 (내용이 같으면 다시 임베딩하지 않음)"""
+    return hashlib.sha256(employee_text(employee).encode("utf-8")).hexdigest()
+
+def employee_metadata(employee) -> dict:
+    return {
+        "id": employee.id,
+        "name": employee.name,
+        "position": employee.position,
+        "department": employee.department,
+        "skills": _join(employee.skills),
+        # 매칭 점수 계산(scoring.py)에 쓰는 필드
+        "join_date": str(employee.join_date),
+        "projects": _join(employee.projects),
+        "certifications": _join(employee.certifications),
+        # 내용이 바뀐 직원만 다시 임베딩하기 위한 해시
+        "content_hash": content_hash(employee),
+    }
 
-print("=============== 배치 처리 시작 ===============")
+async def load_employees():
+    """human_resource 테이블 전체 조회"""
+    from config.db_config import AsyncSessionLocal
+    from models.human_resource import HumanResource
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(HumanResource).order_by(HumanResource.id))
+        return result.scalars().all()
+
+def open_vectorstore(embedding_model) -> Chroma:
+    """cosine 공간의 신입사원 컬렉션 열기 (다른 거리 함수로 만들어진 기존 컬렉션은 지우고 새로 만듦)"""
+    vectorstore = Chroma(
+        persist_directory=vectorstore_path,
+        embedding_function=embedding_model,
+        collection_metadata=COLLECTION_METADATA
+    )
+    if (vectorstore._collection.metadata or {}).get("hnsw:space") != COLLECTION_METADATA["hnsw:space"]:
+        # 거리 함수는 컬렉션 생성 시에만 정할 수 있으므로 전체를 다시 임베딩
+        print("⚠️ 기존 컬렉션이 cosine 공간이 아니므로 새로 만들어 전체를 다시 임베딩합니다.")
+        vectorstore.delete_collection()
+        vectorstore = Chroma(
+            persist_directory=vectorstore_path,
+            embedding_function=embedding_model,
+            collection_metadata=COLLECTION_METADATA
+        )
+    return vectorstore
 
-# 배치 크기 설정
-batch_size = 10  # 매우 작게 설정
-print(f"배치 크기: {batch_size}")
+def store_employees(employees) -> None:
+    """직원 목록을 벡터 DB 와 동기화 (추가/수정된 직원만 임베딩, 삭제된 직원 제거)"""
+    embedding_model = get_openai_embeddings()
+    vectorstore = open_vectorstore(embedding_model)
 
-# 임베딩 모델 초기화
-embedding_model = OpenAIEmbeddings()
+    existing = vectorstore.get(include=["metadatas"])
+    stored_hashes = {
+        chunk_id: (metadata or {}).get("content_hash")
+        for chunk_id, metadata in zip(existing["ids"], existing["metadatas"])
+    }
+    employee_ids = {str(employee.id) for employee in employees}
+
+    changed = [
+        employee for employee in employees
+        if stored_hashes.get(str(employee.id)) != content_hash(employee)
+    ]
+    removed = [chunk_id for chunk_id in stored_hashes if chunk_id not in employee_ids]
+    print(f"총 신입사원 수: {len(employees)} (임베딩 대상 {len(changed)}명, 삭제 {len(removed)}명)")
+
+    print("=============== 임베딩 및 저장 시작 ===============")
+    # 토큰 기준 배치 임베딩 후 직원 ID 기준으로 upsert (재실행 시 중복 저장 방지)
+    pipeline = EmbeddingPipeline(embedding_model)
+    pipeline.upsert(
+        vectorstore,
+        [employee_text(employee) for employee in changed],
+        [employee_metadata(employee) for employee in changed],
+        ids=[str(employee.id) for employee in changed]
+    )
+    if removed:
+        vectorstore._collection.delete(ids=removed)
+    vectorstore.persist()
+    pipeline.report("신입사원 임베딩")
 
-# 벡터 DB 초기화
-vectorstore = None
+    # 같은 프로세스에서 이미 열린 핸들이 있으면 새 인덱스를 다시 읽도록 해제
+    release_vectorstore(vectorstore_path)
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir)
-vectorstore_path = os.path.join(project_root, 'vector_store', 'db', 'new_employee_chroma')
+    print("=============== 처리 완료 ===============")
+    print(f"총 {len(employees)}명의 신입사원 데이터가 벡터 DB 와 동기화되었습니다.")
 
-# 배치 처리
-for i in range(0, len(texts), batch_size):
-    batch_end = min(i + batch_size, len(texts))
-    # print(f"배치 처리 중: {i} ~ {batch_end-1} / {len(texts)}")
-    
-    batch_texts = texts[i:batch_end]
-    batch_metadatas = metadatas[i:batch_end]
-    
-    if vectorstore is None:
-        # 첫 번째 배치
-        # print(f"첫 번째 배치 처리 - 신규 벡터 DB 생성")
-        vectorstore = Chroma.from_texts(
-            texts=batch_texts,
-            embedding=embedding_model,
-            metadatas=batch_metadatas,
-            persist_directory=vectorstore_path
-        )
-    else:
-        # 이후 배치
-        # print(f"후속 배치 처리 - 기존 벡터 DB에 추가")
-        vectorstore.add_texts(
-            texts=batch_texts,
-            metadatas=batch_metadatas
-        )
-    
-    # 각 배치 후 저장
-    vectorstore.persist()
-    # print(f"배치 {i//batch_size + 1}/{(len(texts) + batch_size - 1)//batch_size} 완료")
+async def main():
+    print("=============== 신입사원 데이터 로드 시작 ===============")
+    employees = await load_employees()
+    if not employees:
+        print("human_resource 테이블이 비어 있습니다. scripts/db_hr_init.py 를 먼저 실행해주세요.")
+        return
+    await asyncio.to_thread(store_employees, employees)
 
-print("=============== 처리 완료 ===============")
-print(f"총 {len(texts)}개의 신입사원 데이터가 벡터 DB에 성공적으로 저장되었습니다.")
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,251 @@
+import os
+import copy
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sqlalchemy import select
+
+from talent_matching.scoring import CandidateMatrix, candidate_from_model
+from vector_store.registry import get_openai_embeddings, get_vectorstore, OPENAI_EMBEDDING_MODEL
+
+'''
+human_resource 테이블 전체를 메모리에 올린 신입사원 풀 (프로젝트 매칭용)
+
+- 후보 필드: DB 전체 행 → CandidateMatrix (기술/자격증/프로젝트 키워드 희소 행렬)
+- 의미 유사도: 신입사원 벡터 DB(store_new_employees.py)에 저장된 임베딩을 정규화한 (후보 수 × 차원) 행렬
+매칭 시 질의 임베딩 1회 + 행렬 곱으로 전체 유사도를 구하고, 키워드 사전 선별 결과와 유사도 상위
+TALENT_POOL_SEMANTIC_K 명을 합친 후보만 채점합니다. TALENT_POOL_TTL_SECONDS 가 지나면 기존 행렬로 계속 응답하면서
+백그라운드 작업 하나가 DB 에서 다시 로드합니다.
+'''
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEW_EMPLOYEE_DB_PATH = os.path.join(BASE_DIR, "vector_store", "db", "new_employee_chroma")
+# Chroma(SQLite) 조회 1회당 ID 수 (SQLite 변수 개수 제한)
+VECTOR_FETCH_BATCH = 5000
+
+
+class TalentPool:
+    """신입사원 전체 후보 행렬 + 임베딩 행렬"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, semantic_k: Optional[int] = None):
+        """
+        Args:
+            ttl_seconds: DB 재로드 주기 (기본값: TALENT_POOL_TTL_SECONDS 또는 600)
+            semantic_k: 키워드 선별과 별도로 채점 대상에 넣을 유사도 상위 후보 수 (기본값: TALENT_POOL_SEMANTIC_K 또는 200)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("TALENT_POOL_TTL_SECONDS", "600"))
+        self.semantic_k = semantic_k or int(os.getenv("TALENT_POOL_SEMANTIC_K", "200"))
+        self.matrix: Optional[CandidateMatrix] = None
+        self.vectors: Optional[np.ndarray] = None
+        self.has_vector: Optional[np.ndarray] = None
+        self._loaded_at = 0.0
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.matrix) if self.matrix is not None else 0
+
+    @property
+    def stale(self) -> bool:
+        return self.matrix is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def _load_employees(self) -> List[Dict[str, Any]]:
+        from config.db_config import AsyncSessionLocal
+        from models.human_resource import HumanResource
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(HumanResource).order_by(HumanResource.id))
+            return [candidate_from_model(employee) for employee in result.scalars().all()]
+
+    def _load_vectors(self, ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """벡터 DB 에 저장된 후보 임베딩을 후보 순서대로 정규화해 행렬로 반환 (없는 후보는 0 벡터)"""
+        collection = get_vectorstore(NEW_EMPLOYEE_DB_PATH, model_name=OPENAI_EMBEDDING_MODEL, provider="openai")._collection
+        position = {candidate_id: i for i, candidate_id in enumerate(ids)}
+        vectors: Optional[np.ndarray] = None
+        has_vector = np.zeros(len(ids), dtype=bool)
+        for start in range(0, len(ids), VECTOR_FETCH_BATCH):
+            stored = collection.get(ids=ids[start:start + VECTOR_FETCH_BATCH], include=["embeddings"])
+            for chunk_id, embedding in zip(stored["ids"], stored["embeddings"]):
+                if vectors is None:
+                    vectors = np.zeros((len(ids), len(embedding)), dtype=np.float32)
+                vectors[position[chunk_id]] = embedding
+                has_vector[position[chunk_id]] = True
+        if vectors is None:
+            return np.zeros((len(ids), 0), dtype=np.float32), has_vector
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        return vectors, has_vector
+
+    async def load(self) -> None:
+        """DB 전체 행과 벡터 DB 임베딩으로 후보 행렬 구성"""
+        start = time.perf_counter()
+        candidates = await self._load_employees()
+        matrix = await asyncio.to_thread(CandidateMatrix, candidates)
+        vectors, has_vector = await asyncio.to_thread(self._load_vectors, [c["id"] for c in candidates])
+
+        self.matrix, self.vectors, self.has_vector = matrix, vectors, has_vector
+        self._loaded_at = time.monotonic()
+        missing = int((~has_vector).sum())
+        print(
+            f"✅ 신입사원 풀 로드 완료: {len(candidates)}명, 기술 {len(matrix.skill_vocab)}종, "
+            f"자격증 {len(matrix.cert_vocab)}종 ({time.perf_counter() - start:.1f}초)"
+        )
+        if missing:
+            print(f"⚠️ 벡터 DB 에 없는 신입사원 {missing}명 (store_new_employees.py 로 동기화 필요)")
+
+    async def ensure_loaded(self) -> None:
+        """
+        후보 행렬 준비
+
+        최초 로드만 요청이 기다리고, TTL 이 지난 뒤에는 기존 행렬로 바로 응답하면서 백그라운드에서 한 번만 다시 로드합니다.
+        """
+        if not self.stale:
+            return
+        if self.matrix is None:
+            async with self._load_lock:
+                if self.matrix is None:
+                    await self.load()
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        async with self._load_lock:
+            if not self.stale:
+                return
+            try:
+                await self.load()
+            except Exception as e:
+                # 실패해도 기존 행렬을 계속 사용하고 다음 TTL 이후 다시 시도
+                self._loaded_at = time.monotonic()
+                print(f"⚠️ 신입사원 풀 갱신 실패, 기존 데이터를 계속 사용합니다: {e}")
+
+    def _snapshot(self) -> "TalentPool":
+        """현재 행렬을 고정한 얕은 복사본 (채점 도중 백그라운드 갱신으로 행렬이 바뀌어도 행/유사도 순서가 어긋나지 않음)"""
+        return copy.copy(self)
+
+    def similarities(self, query_vectors: np.ndarray) -> np.ndarray:
+        """
+        질의 임베딩(들)과 전체 후보의 코사인 유사도
+
+        Args:
+            query_vectors: (차원,) 또는 (질의 수 × 차원) 임베딩
+
+        Returns:
+            (후보 수,) 또는 (질의 수 × 후보 수) 유사도 행렬
+        """
+        query_vectors = np.asarray(query_vectors, dtype=np.float32)
+        if self.vectors is None or self.vectors.shape[1] == 0:
+            return np.zeros(query_vectors.shape[:-1] + (len(self),), dtype=np.float32)
+        norms = np.linalg.norm(query_vectors, axis=-1, keepdims=True)
+        query_vectors = query_vectors / np.where(norms > 0, norms, 1.0)
+        return query_vectors @ self.vectors.T
+
+    def shortlist(self, project: Dict[str, Any], similarities: np.ndarray) -> np.ndarray:
+        """키워드 사전 선별 후보 ∪ 유사도 상위 semantic_k 명의 행 번호"""
+        rows = self.matrix.prefilter(project)
+        k = min(self.semantic_k, len(similarities))
+        if k:
+            top = np.argpartition(-similarities, k - 1)[:k]
+            rows = np.union1d(rows, top)
+        return rows
+
+    def rank(self, project: Dict[str, Any], similarities: np.ndarray, top_n: int = 3) -> List[Dict[str, Any]]:
+        """
+        전체 후보 중 프로젝트 적합도 상위 top_n 명 (CandidateMatrix.rank 형식)
+
+        Args:
+            project: 프로젝트 정보 딕셔너리
+            similarities: similarities() 로 구한 전체 후보 유사도
+            top_n: 추천 인원 수
+        """
+        if not len(self):
+            return []
+        rows = self.shortlist(project, similarities)
+        return self.matrix.rank(project, top_n, similarities[rows], rows)
+
+    def _top_rows(self, project: Dict[str, Any], similarities: np.ndarray, k: int) -> np.ndarray:
+        """종합 점수 상위 k 명의 행 번호 (근거 계산 없이)"""
+        rows = self.shortlist(project, similarities)
+        totals = self.matrix.score(project, similarities[rows], rows)["total"]
+        order = np.lexsort((np.arange(len(rows)), -similarities[rows], -totals))[:k]
+        return rows[order]
+
+    def rank_batch(self, projects: List[Dict[str, Any]], similarities: np.ndarray, top_n: int = 3,
+                   unique: bool = False) -> List[List[Dict[str, Any]]]:
+        """
+        여러 프로젝트 동시 채점
+
+        Args:
+            projects: 프로젝트 정보 딕셔너리 리스트
+            similarities: similarities() 로 구한 (프로젝트 수 × 후보 수) 유사도 행렬
+            top_n: 프로젝트당 추천 인원 수
+            unique: True 면 한 신입사원이 한 프로젝트에만 추천되도록 종합 점수 합이 최대가 되게 전역 배정
+                (scipy.optimize.linear_sum_assignment)
+
+        Returns:
+            프로젝트별 rank 결과 리스트
+        """
+        if not len(self):
+            return [[] for _ in projects]
+        if not unique:
+            return [self.rank(project, similarities[i], top_n) for i, project in enumerate(projects)]
+
+        # 프로젝트마다 상위 후보를 (프로젝트 수 × top_n) 명씩 뽑아 합집합을 배정 후보로 사용
+        pool_size = top_n * len(projects)
+        rows = np.unique(np.concatenate([
+            self._top_rows(project, similarities[i], pool_size) for i, project in enumerate(projects)
+        ]))
+        score_sets = [self.matrix.score(project, similarities[i][rows], rows) for i, project in enumerate(projects)]
+        totals = np.stack([scores["total"] for scores in score_sets])
+
+        # (프로젝트 × top_n 슬롯) × 후보 비용 행렬에서 종합 점수 합 최대화
+        slots, columns = linear_sum_assignment(-np.repeat(totals, top_n, axis=0))
+        results = []
+        for i, project in enumerate(projects):
+            assigned = columns[slots // top_n == i]
+            assigned = assigned[np.lexsort((assigned, -totals[i][assigned]))]
+            results.append(self.matrix.entries(project, rows, score_sets[i], similarities[i][rows], assigned))
+        return results
+
+    async def arank_batch(self, projects: List[Dict[str, Any]], query_texts: List[str], top_n: int = 3,
+                          unique: bool = False) -> List[List[Dict[str, Any]]]:
+        """질의 임베딩을 한 번에 계산(embed_documents 1회) 후 rank_batch 실행"""
+        await self.ensure_loaded()
+        pool = self._snapshot()
+        query_vectors = await get_openai_embeddings().aembed_documents(query_texts)
+        start = time.perf_counter()
+        results = await asyncio.to_thread(
+            lambda: pool.rank_batch(projects, pool.similarities(np.asarray(query_vectors)), top_n, unique)
+        )
+        print(
+            f"⚡ 프로젝트 {len(projects)}개 × 신입사원 {len(pool)}명 채점 완료"
+            f"{' (전역 배정)' if unique else ''} ({(time.perf_counter() - start) * 1000:.0f} ms)"
+        )
+        return results
+
+    async def arank(self, project: Dict[str, Any], query_text: str, top_n: int = 3) -> List[Dict[str, Any]]:
+        """질의 임베딩 계산 후 rank 실행"""
+        await self.ensure_loaded()
+        pool = self._snapshot()
+        query_vector = await get_openai_embeddings().aembed_query(query_text)
+        start = time.perf_counter()
+        ranked = await asyncio.to_thread(
+            lambda: pool.rank(project, pool.similarities(np.asarray(query_vector)), top_n)
+        )
+        print(f"⚡ 신입사원 {len(pool)}명 중 상위 {len(ranked)}명 선정 ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return ranked
+
+
+_pool: Optional[TalentPool] = None
+
+
+def get_talent_pool() -> TalentPool:
+    """프로세스 공유 TalentPool 반환 (로드는 최초 매칭 시점)"""
+    global _pool
+    if _pool is None:
+        _pool = TalentPool()
+    return _pool
@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+'''
+테스트 공통 설정
+
+- 프로젝트 루트를 import 경로에 추가 (scripts/ 의 벤치마크 스크립트와 같은 방식)
+- graph.py 등 import 시점에 ChatOpenAI 를 만드는 모듈을 위해 더미 API 키 설정
+- 빠른 라우터의 임베딩 모델은 테스트에서 불러오지 않음
+'''
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+if not os.environ.get("OPENAI_API_KEY"):
+    os.environ["OPENAI_API_KEY"] = "test"
+os.environ.setdefault("FAST_ROUTER_ENABLED", "false")
@@ -0,0 +1,61 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+import agent_state
+from agent_state import (
+    append_bounded_messages, conversation_history, follow_up_history, get_thread_id, is_follow_up,
+)
+
+
+def test_reducer_appends_and_keeps_latest_messages(monkeypatch):
+    monkeypatch.setattr(agent_state, "MAX_STATE_MESSAGES", 3)
+    assert append_bounded_messages(None, ["a"]) == ["a"]
+    assert append_bounded_messages(["a", "b"], ["c", "d"]) == ["b", "c", "d"]
+
+
+def test_reducer_with_empty_update_keeps_previous_list():
+    previous = ["a", "b"]
+    assert append_bounded_messages(previous, []) is previous
+    assert append_bounded_messages(previous, None) is previous
+    assert append_bounded_messages(None, None) == []
+
+
+def test_thread_id_resolution_order():
+    assert get_thread_id({"thread_id": "state"}, {"configurable": {"thread_id": "config"}}) == "config"
+    assert get_thread_id({"thread_id": "state"}, {}) == "state"
+    assert get_thread_id({}, None) == "default"
+
+
+def test_conversation_history_uses_answers_only_and_truncates(monkeypatch):
+    monkeypatch.setattr(agent_state, "HISTORY_MESSAGE_MAX_CHARS", 5)
+    state = {
+        "messages": [
+            "오래된 질문",
+            {"answer": "보고서 답변입니다", "sources": []},
+            {"error": "검색 실패"},
+            AIMessage(content="이메일 초안"),
+            "   ",
+        ]
+    }
+    assert conversation_history(state, limit=2) == ["보고서 답", "이메일 초"]
+    assert conversation_history(state, limit=0) == []
+    assert conversation_history({}, limit=4) == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("스마트팜 사업계획서 예산 알려줘", False),
+    ("이번 달 회의록에서 센서 교체 일정 찾아줘", False),
+    ("그 보고서 더 자세히 알려줘", True),
+    ("이 문서 요약해줘", True),
+    ("그럼 일정은 어떻게 돼?", True),
+    ("2페이지는?", True),
+    ("", False),
+])
+def test_is_follow_up(query, expected):
+    assert is_follow_up(query) is expected
+
+
+def test_follow_up_history_only_for_follow_up_questions():
+    messages = [{"answer": "이전 답변"}]
+    assert follow_up_history({"input_query": "스마트팜 사업계획서 예산 알려줘", "messages": messages}) == []
+    assert follow_up_history({"input_query": "그거 다시 설명해줘", "messages": messages}) == ["이전 답변"]
@@ -0,0 +1,115 @@
+import os
+
+from vector_store import builder
+from vector_store.builder import REPORT_DB_OPTIONS, VectorDatabaseBuilder
+from vector_store.manifest import IndexManifest
+
+SETTINGS = VectorDatabaseBuilder.index_settings(**REPORT_DB_OPTIONS)
+
+
+def _builder(db_path):
+    """임베딩 모델을 불러오지 않은 빌더 (구축 단계만 검증)"""
+    instance = VectorDatabaseBuilder.__new__(VectorDatabaseBuilder)
+    instance.db_path = str(db_path)
+    instance.embedding_model_name = REPORT_DB_OPTIONS["embedding_model_name"]
+    instance.chunk_size = REPORT_DB_OPTIONS["chunk_size"]
+    instance.chunk_overlap = REPORT_DB_OPTIONS["chunk_overlap"]
+    instance.embeddings = None
+    return instance
+
+
+class FakeChroma:
+    def __init__(self, persist_directory, embedding_function):
+        self.persist_directory = persist_directory
+        # 기존 DB 가 남아 있는 상태에서 컬렉션을 열면 예전 청크에 이어서 추가됨
+        assert not os.path.exists(os.path.join(persist_directory, "stale_segment"))
+
+    def persist(self):
+        pass
+
+
+def _leftover_db(tmp_path):
+    db_path = tmp_path / "reports_chroma"
+    (db_path / "stale_segment").mkdir(parents=True)
+    (db_path / "stale_segment" / "header.bin").write_bytes(b"old")
+    return db_path
+
+
+def test_build_replaces_existing_db_and_writes_manifest(tmp_path, monkeypatch):
+    db_path = _leftover_db(tmp_path)
+    doc = tmp_path / "doc.txt"
+    doc.write_text("스마트팜 문서", encoding="utf-8")
+
+    def ingest_files(vectordb, files, manifest):
+        for path, fingerprint in files.items():
+            manifest.record(path, fingerprint, ["chunk-0"])
+        return len(files)
+
+    instance = _builder(db_path)
+    monkeypatch.setattr(builder, "Chroma", FakeChroma)
+    monkeypatch.setattr(instance, "ingest_files", ingest_files)
+
+    assert isinstance(instance.build([str(doc)]), FakeChroma)
+    manifest = IndexManifest(str(db_path), SETTINGS)
+    assert manifest.exists()
+    assert manifest.chunk_ids(manifest.key(str(doc))) == ["chunk-0"]
+
+
+def test_sync_without_manifest_or_with_new_settings_does_full_build(tmp_path, monkeypatch):
+    db_path = _leftover_db(tmp_path)
+    instance = _builder(db_path)
+    calls = []
+    monkeypatch.setattr(instance, "build", lambda file_paths: calls.append(file_paths) or "built")
+
+    assert instance.sync(["a.txt"]) == "built"
+
+    IndexManifest(str(db_path), {**SETTINGS, "chunk_size": 800}).save()
+    assert instance.sync(["a.txt"]) == "built"
+    assert calls == [["a.txt"], ["a.txt"]]
+
+
+class RecordingBuilder:
+    calls = []
+
+    def __init__(self, db_path, **options):
+        self.db_path = db_path
+
+    def build(self, file_paths):
+        self.calls.append(("build", file_paths))
+        return "built"
+
+    def sync(self, file_paths):
+        self.calls.append(("sync", file_paths))
+        return "synced"
+
+    index_settings = staticmethod(VectorDatabaseBuilder.index_settings)
+
+
+def test_ensure_rebuilds_leftover_db_without_manifest(tmp_path, monkeypatch):
+    db_path = _leftover_db(tmp_path)
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("문서", encoding="utf-8")
+    RecordingBuilder.calls = []
+    monkeypatch.setattr(builder, "VectorDatabaseBuilder", RecordingBuilder)
+
+    assert builder.ensure_vector_db_exists(str(db_path), str(docs)) == "built"
+    assert RecordingBuilder.calls == [("build", [str(docs / "a.txt")])]
+
+
+def test_ensure_skips_up_to_date_db_and_syncs_changes(tmp_path, monkeypatch):
+    db_path = tmp_path / "reports_chroma"
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    doc = docs / "a.txt"
+    doc.write_text("문서", encoding="utf-8")
+    manifest = IndexManifest(str(db_path), SETTINGS)
+    manifest.record(str(doc), manifest.fingerprint(str(doc)), ["chunk-0"])
+    manifest.save()
+    RecordingBuilder.calls = []
+    monkeypatch.setattr(builder, "VectorDatabaseBuilder", RecordingBuilder)
+
+    assert builder.ensure_vector_db_exists(str(db_path), str(docs)) is True
+    doc.write_text("수정된 문서", encoding="utf-8")
+    assert builder.ensure_vector_db_exists(str(db_path), str(docs)) == "synced"
+    assert RecordingBuilder.calls == [("sync", [str(doc)])]
@@ -0,0 +1,93 @@
+import pytest
+from langchain_core.documents import Document
+
+from vector_store import context_builder
+from vector_store.context_builder import ContextBuilder, merge_overlapping, split_sentences
+
+
+@pytest.fixture(autouse=True)
+def char_tokens(monkeypatch):
+    """tiktoken 설치 여부와 관계없이 글자 수를 토큰 수로 사용"""
+    monkeypatch.setitem(context_builder._encodings, "gpt-4o-mini", None)
+
+
+def _doc(text, page=0, source="docs/report.pdf", doc_index=0, chunk_index=0, section="1. 개요"):
+    return Document(
+        page_content=text,
+        metadata={"source": source, "page": page, "doc_index": doc_index, "chunk_index": chunk_index, "section": section},
+    )
+
+
+class FakeEmbeddings:
+    """'온도' 가 들어간 문장만 질의와 같은 방향"""
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] if "온도" in text else [0.0, 1.0] for text in texts]
+
+
+def test_merge_overlapping_keeps_shared_span_once():
+    first = "스마트팜 온실은 센서로 온도와 습도를 측정하고 데이터를 서버로 전송합니다."
+    second = "온도와 습도를 측정하고 데이터를 서버로 전송합니다. 서버는 이상값을 탐지합니다."
+    assert merge_overlapping(first, second) == (
+        "스마트팜 온실은 센서로 온도와 습도를 측정하고 데이터를 서버로 전송합니다. 서버는 이상값을 탐지합니다."
+    )
+
+
+def test_merge_overlapping_containment_and_short_overlap():
+    assert merge_overlapping("가나다라마바사", "다라마") == "가나다라마바사"
+    assert merge_overlapping("다라마", "가나다라마바사") == "가나다라마바사"
+    # MIN_OVERLAP_CHARS 보다 짧은 우연 일치는 병합하지 않음
+    assert merge_overlapping("센서 점검 완료.", "완료. 다음 단계") == "센서 점검 완료.\n완료. 다음 단계"
+
+
+def test_same_page_chunks_are_merged_in_document_order_and_duplicates_dropped():
+    overlap = "양액 공급 장치는 매일 오전 9시에 점검합니다"
+    docs = [
+        _doc(f"{overlap}. 점검 결과는 관리 대장에 기록합니다.", chunk_index=1),
+        _doc(f"양액 공급 절차를 설명합니다. {overlap}", chunk_index=0),
+        _doc(f"{overlap}. 점검 결과는 관리 대장에 기록합니다.", chunk_index=1),
+        _doc("다른 페이지 내용입니다.", page=1),
+    ]
+    context, stats = ContextBuilder(max_tokens=1000).build(docs)
+
+    assert context.count(overlap) == 1
+    assert context.index("양액 공급 절차") < context.index("관리 대장")
+    assert context.count("[문서 ") == 2
+    assert stats["merged_chunks"] == 2
+    assert stats["dropped_sentences"] == 0
+    assert stats["context_tokens"] < stats["original_tokens"]
+
+
+def test_trim_keeps_most_relevant_sentences_within_budget():
+    text = "습도는 60%로 유지합니다. 온도는 25도로 유지합니다. 조명은 12시간 켭니다."
+    builder = ContextBuilder(embeddings=FakeEmbeddings(), max_tokens=50)
+    context, stats = builder.build([_doc(text)], query_vector=[1.0, 0.0])
+
+    assert "온도는 25도로 유지합니다." in context
+    assert "조명" not in context
+    assert stats["dropped_sentences"] >= 1
+    assert stats["context_tokens"] <= 50
+
+
+# --- 회귀: 1위 문장(또는 머리글)만으로 예산을 넘으면 컨텍스트가 비던 문제 ---
+
+def test_trim_always_keeps_top_sentence_truncated_to_budget():
+    long_sentence = "온도 " + "센서 측정값 " * 20
+    docs = [_doc(long_sentence + ". 두 번째 문장입니다."), _doc("다른 문서의 문장입니다.", source="docs/other.pdf")]
+    context, stats = ContextBuilder(embeddings=FakeEmbeddings(), max_tokens=60).build(docs, query_vector=[1.0, 0.0])
+
+    assert context.startswith("[문서 1] 출처: report.pdf")
+    assert "온도 센서" in context
+    assert "다른 문서" not in context
+    # 머리글과 본문 사이 줄바꿈 1자 외에는 예산 이내
+    assert 0 < stats["context_tokens"] <= 60 + len("\n")
+
+
+def test_trim_keeps_a_sentence_when_headers_alone_exceed_budget():
+    context, stats = ContextBuilder(max_tokens=5).build([_doc("첫 문장입니다. 둘째 문장입니다.")])
+    assert "첫 문장입니다." in context
+    assert stats["context_tokens"] > 0
+
+
+def test_split_sentences():
+    assert split_sentences("첫 문장. 둘째 문장!\n\n셋째 줄") == ["첫 문장.", "둘째 문장!", "셋째 줄"]
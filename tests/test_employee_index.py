@@ -0,0 +1,72 @@
+import pytest
+
+from vector_store.employee_index import EmployeeIndex, load_employee_records, parse_employee_line
+
+
+EMPLOYEE_DATA = """이름,이메일,부서,직책,담당업무
+김태양,taeyangkim@smartfarm.kr,환경제어부,부장,온실 환경제어 시스템 설계
+박드론,dronepark@smartfarm.kr,스마트농업부,과장,드론 방제 및 항공 촬영
+이데이터,datalee@smartfarm.kr,데이터분석부,대리,센서 데이터 수집, 데이터 분석
+윤빅데이터,bigdata@smartfarm.kr,데이터분석부,차장,빅데이터 플랫폼 운영, 데이터 분석
+"""
+
+
+@pytest.fixture
+def employee_file(tmp_path):
+    path = tmp_path / "employees.txt"
+    path.write_text(EMPLOYEE_DATA, encoding="utf-8")
+    return str(path)
+
+
+def _names(records):
+    return [record["name"] for record in records]
+
+
+def test_parse_skips_header_and_keeps_commas_in_duty(employee_file):
+    records = load_employee_records(employee_file)
+
+    assert _names(records) == ["김태양", "박드론", "이데이터", "윤빅데이터"]
+    assert records[2]["duty"] == "센서 데이터 수집, 데이터 분석"
+    assert parse_employee_line("이름만,있는행") is None
+
+
+def test_lookup_by_name_prefers_longest_name(employee_file):
+    result = EmployeeIndex(employee_file).lookup("윤빅데이터 차장님 연락처 알려줘")
+    assert result["method"] == "name"
+    assert result["match"]["name"] == "윤빅데이터"
+
+
+def test_lookup_by_email(employee_file):
+    result = EmployeeIndex(employee_file).lookup("DataLee@smartfarm.kr 한테 물어봐도 돼?")
+    assert result["method"] == "name"
+    assert result["match"]["name"] == "이데이터"
+
+
+def test_unique_keyword_match(employee_file):
+    result = EmployeeIndex(employee_file, min_score=1.0, ratio=1.5).lookup("드론 방제 담당자 누구야?")
+    assert result["method"] == "keyword"
+    assert result["match"]["name"] == "박드론"
+    assert "드론" in result["keywords"]
+
+
+def test_ambiguous_keywords_fall_back_to_candidates(employee_file):
+    result = EmployeeIndex(employee_file, min_score=1.0, ratio=1.5).lookup("데이터 분석 담당자 알려줘")
+    assert result["match"] is None and result["method"] is None
+    assert set(_names(result["candidates"][:2])) == {"이데이터", "윤빅데이터"}
+
+
+def test_score_below_min_score_is_not_confirmed(employee_file):
+    result = EmployeeIndex(employee_file, min_score=100.0, ratio=1.5).lookup("드론 방제 담당자 누구야?")
+    assert result["match"] is None
+    assert _names(result["candidates"]) == ["박드론"]
+
+
+def test_query_without_keywords_has_no_candidates(employee_file):
+    result = EmployeeIndex(employee_file).lookup("담당자 누구야?")
+    assert result == {"match": None, "method": None, "keywords": [], "candidates": []}
+
+
+def test_ratio_controls_how_clear_the_top_match_must_be(employee_file):
+    result = EmployeeIndex(employee_file, min_score=1.0, ratio=1.0).lookup("데이터 분석 담당자 알려줘")
+    assert result["method"] == "keyword"
+    assert result["match"]["name"] in ("이데이터", "윤빅데이터")
@@ -0,0 +1,16 @@
+import asyncio
+
+from agents import exception_agent
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+def test_astream_emits_fixed_answer_as_token_before_message():
+    state = {"input_query": "오늘 점심 뭐 먹지", "thread_id": "t1"}
+    events = asyncio.run(_collect(exception_agent.astream(state, {"configurable": {"thread_id": "t1"}})))
+
+    assert [event["event"] for event in events] == ["token", "message"]
+    assert events[0]["data"] == events[1]["data"]
+    assert "오늘 점심 뭐 먹지" in events[0]["data"]
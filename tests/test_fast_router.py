@@ -0,0 +1,64 @@
+import pytest
+
+import fast_router
+from fast_router import FastRouter
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("def add(a, b):\n    return a + b", "code_check"),
+    ("const x = 1;\nconsole.log(x);", "code_check"),
+    ("팀장님께 보낼 메일 작성해줘", "email_agent"),
+    ("스마트팜 센서 담당자가 누구야?", "matching_agent"),
+    ("온실 제어 관련해서 누구에게 문의하면 돼?", "matching_agent"),
+    # 담당자가 언급되어도 문서를 찾는 질문은 휴리스틱으로 정하지 않음
+    ("담당자 배정 관련 회의록 찾아줘", None),
+    ("스마트팜 사업계획서 요약해줘", None),
+    # 코드 패턴 하나만 있는 한 줄 문장은 코드로 보지 않음
+    ("import 절차가 궁금해요", None),
+])
+def test_match_heuristic(query, expected):
+    assert FastRouter()._match_heuristic(query) == expected
+
+
+class FakeEmbeddings:
+    """'보고서' 가 들어가면 x 축, '용어' 가 들어가면 y 축 벡터"""
+
+    @staticmethod
+    def _vector(text):
+        return [1.0 if "보고서" in text else 0.0, 1.0 if "용어" in text else 0.0, 0.1]
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setattr(fast_router, "get_embeddings", lambda model_name: FakeEmbeddings())
+    examples = {"search_agent": ["보고서 찾아줘", "보고서 알려줘"], "word_explain": ["용어 설명", "용어 뜻"]}
+    return FastRouter(threshold=0.6, margin=0.05, examples=examples)
+
+
+def test_route_uses_centroid_when_confident(router):
+    assert router.route("작년 보고서 보여줘") == "search_agent"
+    assert router.route("이 용어 알려줘") == "word_explain"
+    assert router.stats()["centroid"] == 2
+
+
+def test_route_defers_to_llm_when_ambiguous(router):
+    # 두 중심점과 같은 거리 → margin 미달
+    assert router.route("보고서 용어") is None
+    assert router.route("오늘 날씨") is None
+
+    router.record_fallback("general_chat")
+    stats = router.stats()
+    assert stats["llm_fallback"] == 1
+    assert stats["fast_path_hit_rate"] == 0.0
+
+
+def test_heuristic_short_circuits_embeddings(router, monkeypatch):
+    monkeypatch.setattr(router, "_match_centroid", lambda query: pytest.fail("centroid should not be used"))
+    assert router.route("메일 초안 부탁해") == "email_agent"
+    assert router.stats()["routes"] == {"email_agent": 1}
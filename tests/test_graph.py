@@ -0,0 +1,22 @@
+from graph import state_delta
+
+
+def test_state_delta_keeps_only_new_messages_when_agent_returns_full_list():
+    previous = [{"answer": "이전 답변"}, "이전 질문"]
+    state = {"input_query": "질문", "messages": previous}
+    result = {"messages": previous + [{"answer": "새 답변"}], "agent": "search_agent", "thread_id": "t1"}
+
+    assert state_delta(state, result) == {"messages": [{"answer": "새 답변"}], "thread_id": "t1"}
+
+
+def test_state_delta_passes_through_message_deltas():
+    state = {"messages": [{"answer": "이전 답변"}]}
+    # 내용이 같아도 다른 객체면 새 메시지로 취급
+    result = {"messages": [{"answer": "이전 답변"}]}
+    assert state_delta(state, result) == {"messages": [{"answer": "이전 답변"}]}
+
+
+def test_state_delta_drops_unknown_keys_and_empty_messages():
+    state = {"messages": ["a"]}
+    result = {"messages": state["messages"], "generated_email": "본문", "raw_search_result": {"context": "..."}}
+    assert state_delta(state, result) == {"raw_search_result": {"context": "..."}}
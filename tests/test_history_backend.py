@@ -0,0 +1,82 @@
+import asyncio
+
+from api.utils import history_backend
+from api.utils.history_backend import InMemoryHistoryBackend
+
+
+def _add_turns(backend, thread_id, count):
+    async def add():
+        for i in range(count):
+            await backend.add_turn(thread_id, f"질문 {i}", [f"답변 {i}"])
+    asyncio.run(add())
+
+
+def _queries(result):
+    return [turn["query"] for turn in result["turns"]]
+
+
+def test_ring_buffer_keeps_only_latest_turns_per_thread():
+    backend = InMemoryHistoryBackend(max_turns=3, max_threads=10)
+    _add_turns(backend, "t1", 5)
+
+    result = asyncio.run(backend.get_turns("t1"))
+    assert result["total"] == 3
+    assert _queries(result) == ["질문 2", "질문 3", "질문 4"]
+    assert result["turns"][-1]["messages"] == ["답변 4"]
+
+
+def test_least_recently_used_thread_is_evicted():
+    backend = InMemoryHistoryBackend(max_turns=5, max_threads=2)
+    _add_turns(backend, "t1", 1)
+    _add_turns(backend, "t2", 1)
+    _add_turns(backend, "t1", 1)  # t1 을 최근 사용으로 갱신
+    _add_turns(backend, "t3", 1)
+
+    assert asyncio.run(backend.get_turns("t2"))["total"] == 0
+    assert asyncio.run(backend.get_turns("t1"))["total"] == 2
+    assert asyncio.run(backend.get_turns("t3"))["total"] == 1
+
+
+def test_get_turns_paginates_oldest_first():
+    backend = InMemoryHistoryBackend(max_turns=10, max_threads=10)
+    _add_turns(backend, "t1", 5)
+
+    first = asyncio.run(backend.get_turns("t1", page=1, size=2))
+    last = asyncio.run(backend.get_turns("t1", page=3, size=2))
+    beyond = asyncio.run(backend.get_turns("t1", page=4, size=2))
+
+    assert _queries(first) == ["질문 0", "질문 1"]
+    assert first == {"turns": first["turns"], "total": 5, "page": 1, "size": 2}
+    assert _queries(last) == ["질문 4"]
+    assert beyond["turns"] == [] and beyond["total"] == 5
+
+
+def test_unknown_thread_returns_empty_page():
+    backend = InMemoryHistoryBackend(max_turns=3, max_threads=3)
+    assert asyncio.run(backend.get_turns("없음", page=1, size=10)) == {"turns": [], "total": 0, "page": 1, "size": 10}
+
+
+class RecordingSQLBackend:
+    def __init__(self, db_url=None):
+        self.db_url = db_url
+
+
+def test_sqlite_backend_defaults_to_local_file(monkeypatch, tmp_path):
+    db_path = str(tmp_path / "cache" / "history.sqlite3")
+    monkeypatch.setattr(history_backend, "SQLHistoryBackend", RecordingSQLBackend)
+    monkeypatch.setattr(history_backend, "DEFAULT_SQLITE_HISTORY_PATH", db_path)
+    monkeypatch.setenv("HISTORY_BACKEND", "sqlite")
+    monkeypatch.delenv("HISTORY_DB_URL", raising=False)
+
+    backend = history_backend.create_history_backend()
+
+    assert backend.db_url == f"sqlite+aiosqlite:///{db_path}"
+    assert (tmp_path / "cache").is_dir()
+
+
+def test_sqlite_backend_uses_history_db_url_when_set(monkeypatch):
+    monkeypatch.setattr(history_backend, "SQLHistoryBackend", RecordingSQLBackend)
+    monkeypatch.setenv("HISTORY_BACKEND", "sqlite")
+    monkeypatch.setenv("HISTORY_DB_URL", "sqlite+aiosqlite:///tmp/other.sqlite3")
+
+    assert history_backend.create_history_backend().db_url == "sqlite+aiosqlite:///tmp/other.sqlite3"
@@ -0,0 +1,97 @@
+import json
+
+from langchain_core.documents import Document
+
+from vector_store.hybrid_search import reciprocal_rank_fusion
+from vector_store.keyword_index import KeywordIndex, tokenize
+
+
+class FakeCollection:
+    def __init__(self, store):
+        self.store = store
+
+    def count(self):
+        return len(self.store.ids)
+
+
+class FakeVectorDB:
+    """KeywordIndex 가 사용하는 Chroma 메서드(_collection.count, get)만 제공"""
+
+    def __init__(self, chunks):
+        self.ids = [chunk_id for chunk_id, _, _ in chunks]
+        self.documents = [text for _, text, _ in chunks]
+        self.metadatas = [metadata for _, _, metadata in chunks]
+        self._collection = FakeCollection(self)
+        self.get_calls = 0
+
+    def get(self, include=None):
+        self.get_calls += 1
+        return {"ids": list(self.ids), "documents": list(self.documents), "metadatas": list(self.metadatas)}
+
+
+CHUNKS = [
+    ("c1", "TTAK.KO-10.1347 스마트팜 센서 데이터 표준을 설명합니다.", {"filename": "표준.pdf", "page": 0}),
+    ("c2", "온실 온도 제어 시스템의 구성과 운영 방법", {"filename": "매뉴얼.pdf", "page": 3}),
+    ("c3", "농업·농촌 및 식품산업 기본법 제12조 스마트농업 지원", {"filename": "법령.pdf", "page": 1}),
+]
+
+
+def test_tokenize_keeps_identifiers_and_articles_whole():
+    tokens = tokenize("TTAK.KO-10.1347 과 제 12 조 참고")
+    assert "ttak.ko-10.1347" in tokens
+    assert "제12조" in tokens
+
+
+def test_bm25_ranks_exact_identifier_match_first(tmp_path):
+    index = KeywordIndex(FakeVectorDB(CHUNKS), str(tmp_path))
+    results = index.search("TTAK.KO-10.1347 표준 내용", k=3)
+    assert results[0][0].metadata["chunk_id"] == "c1"
+    assert all(score > 0 for _, score in results)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    results = index.search("제12조 내용 알려줘", k=3)
+    assert results[0][0].metadata["chunk_id"] == "c3"
+
+
+def test_predicate_filters_candidates(tmp_path):
+    index = KeywordIndex(FakeVectorDB(CHUNKS), str(tmp_path))
+    results = index.search("스마트팜 스마트농업 온도", k=3, predicate=lambda metadata: metadata["page"] > 0)
+    assert {doc.metadata["chunk_id"] for doc, _ in results} <= {"c2", "c3"}
+
+
+def test_token_cache_is_persisted_and_resynced_on_count_change(tmp_path):
+    vectordb = FakeVectorDB(CHUNKS)
+    index = KeywordIndex(vectordb, str(tmp_path))
+    index.search("온도", k=1)
+    index.search("온도", k=1)
+    assert vectordb.get_calls == 1
+
+    with open(tmp_path / "keyword_index" / "tokens.json", encoding="utf-8") as f:
+        assert set(json.load(f)) == {"c1", "c2", "c3"}
+
+    vectordb.ids.append("c4")
+    vectordb.documents.append("양액 공급 장치 점검 절차")
+    vectordb.metadatas.append({"filename": "점검.pdf", "page": 0})
+    results = index.search("양액 공급", k=1)
+    assert vectordb.get_calls == 2
+    assert results[0][0].metadata["chunk_id"] == "c4"
+
+
+def test_empty_collection_returns_no_results(tmp_path):
+    assert KeywordIndex(FakeVectorDB([]), str(tmp_path)).search("온도") == []
+
+
+def _doc(source, text):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_rrf_prefers_documents_ranked_by_both_lists():
+    a, b, c = _doc("x.pdf", "a"), _doc("x.pdf", "b"), _doc("y.pdf", "c")
+    vector_results = [a, b, c]
+    keyword_results = [_doc("x.pdf", "b"), _doc("y.pdf", "c")]
+
+    fused = reciprocal_rank_fusion([vector_results, keyword_results])
+    assert [doc.page_content for doc in fused] == ["b", "c", "a"]
+    # 같은 (source, 내용) 문서는 하나로 합쳐짐
+    assert len(fused) == 3
+    assert reciprocal_rank_fusion([vector_results, keyword_results], k=1) == [fused[0]]
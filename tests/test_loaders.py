@@ -0,0 +1,113 @@
+import pytest
+
+from vector_store import loaders
+from vector_store.loaders import load_file_documents
+
+
+def test_registry_dispatches_by_extension():
+    assert loaders.get_loader("보고서.PDF") is loaders.load_pdf
+    assert loaders.get_loader("notes.md") is loaders.load_text
+    assert {".pdf", ".docx", ".hwp", ".txt", ".md"} <= set(loaders.supported_extensions())
+    with pytest.raises(ValueError):
+        load_file_documents("data.xlsx")
+
+
+def test_markdown_sections_are_recorded(tmp_path):
+    path = tmp_path / "guide.md"
+    path.write_text(
+        "# 1. 개요\n스마트팜 개요 문단\n\n## 1.1 목적\n목적 문단 첫 줄\n목적 문단 둘째 줄\n\n# 2. 구성\n구성 문단\n",
+        encoding="utf-8",
+    )
+    documents = list(load_file_documents(str(path)))
+    assert [doc.metadata["section"] for doc in documents] == ["1. 개요", "1. 개요 > 1.1 목적", "2. 구성"]
+    assert documents[1].page_content == "1.1 목적\n목적 문단 첫 줄\n목적 문단 둘째 줄"
+    assert all(doc.metadata["source"] == str(path) for doc in documents)
+
+
+def test_docx_headings_and_tables(tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "회의록.docx"
+    document = docx.Document()
+    document.add_heading("회의 개요", level=1)
+    document.add_paragraph("8월 7일 정기 회의")
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "안건"
+    table.rows[0].cells[1].text = "센서 교체"
+    document.add_heading("결정 사항", level=1)
+    document.add_paragraph("다음 주까지 교체 완료")
+    document.save(path)
+
+    documents = list(load_file_documents(str(path)))
+    assert [doc.metadata["section"] for doc in documents] == ["회의 개요", "결정 사항"]
+    assert "안건 | 센서 교체" in documents[0].page_content
+
+
+# --- 회귀: UTF-8 로 읽다가 실패하면 CP949 로 처음부터 다시 읽어 앞 문단이 중복되던 문제 ---
+
+def test_cp949_text_is_decoded_once_without_duplicate_paragraphs(tmp_path):
+    path = tmp_path / "legacy.txt"
+    # 디코딩 실패가 파일 뒷부분에서 나도록 앞쪽을 ASCII 문단으로 채움
+    ascii_paragraphs = [f"paragraph {i} " + "x" * 80 for i in range(200)]
+    text = "\n\n".join(ascii_paragraphs + ["스마트팜 온실 제어 문단"]) + "\n"
+    path.write_bytes(text.encode("cp949"))
+
+    paragraphs = [paragraph for paragraph, _ in loaders._iter_text_paragraphs(str(path))]
+    assert len(paragraphs) == len(set(paragraphs)) == 201
+    assert paragraphs[-1] == "스마트팜 온실 제어 문단"
+
+
+def test_undecodable_text_raises(tmp_path):
+    path = tmp_path / "binary.txt"
+    path.write_bytes(b"\xff\xfe\xfa\xfb" * 8)
+    with pytest.raises(ValueError):
+        list(loaders._iter_text_paragraphs(str(path)))
+
+
+def _write_pdf(path, pages):
+    """pages: 페이지별 [(y, 텍스트, 글자 크기)]"""
+    fitz = pytest.importorskip("fitz")
+    pdf = fitz.open()
+    for lines in pages:
+        page = pdf.new_page(width=595, height=842)
+        for y, text, size in lines:
+            page.insert_text((72, y), text, fontsize=size)
+    pdf.save(str(path))
+    pdf.close()
+
+
+def test_pdf_splits_sections_by_font_size(tmp_path):
+    path = tmp_path / "report.pdf"
+    _write_pdf(path, [[
+        (100, "Introduction", 18),
+        (130, "Greenhouse sensors collect data.", 11),
+        (150, "Readings are stored hourly.", 11),
+        (200, "Architecture", 18),
+        (230, "Gateways forward readings.", 11),
+    ]])
+    documents = list(load_file_documents(str(path)))
+    assert [doc.metadata["section"] for doc in documents] == ["Introduction", "Architecture"]
+    assert all(doc.metadata["page"] == 0 for doc in documents)
+    assert "Readings are stored hourly." in documents[0].page_content
+
+
+# --- 회귀: 본문 표의 숫자만 있는 줄까지 쪽 번호로 보고 버리던 문제 ---
+
+def test_pdf_keeps_digit_lines_in_body_and_drops_footer_page_numbers(tmp_path):
+    path = tmp_path / "table.pdf"
+    _write_pdf(path, [[
+        (100, "Monthly yield table", 11),
+        (320, "1200", 11),
+        (340, "Total harvested kilograms", 11),
+        (830, "- 7 -", 11),
+    ]])
+    content = "\n".join(doc.page_content for doc in load_file_documents(str(path)))
+    assert "1200" in content.splitlines()
+    assert "- 7 -" not in content
+
+
+def test_is_page_number_only_inside_margins():
+    height = 842
+    assert loaders._is_page_number("3", (290, 20, 300, 40), height)
+    assert loaders._is_page_number("- 3 -", (280, 800, 310, 820), height)
+    assert not loaders._is_page_number("3", (290, 400, 300, 420), height)
+    assert not loaders._is_page_number("3페이지", (290, 800, 330, 820), height)
@@ -0,0 +1,81 @@
+import os
+
+from vector_store.manifest import IndexManifest, make_chunk_id
+
+SETTINGS = {"embedding_model": "text-embedding-3-small", "chunk_size": 1000}
+
+
+def _index(manifest: IndexManifest, paths):
+    """diff 결과를 그대로 기록하고 저장 (증분 색인 1회)"""
+    changed, removed = manifest.diff(paths)
+    for path, fingerprint in changed.items():
+        manifest.record(path, fingerprint, [make_chunk_id(fingerprint["sha256"], "0", path)])
+    for key in removed:
+        manifest.remove(key)
+    manifest.save()
+    return changed, removed
+
+
+def test_diff_reports_only_new_changed_and_removed_files(tmp_path):
+    db_path = tmp_path / "db"
+    a, b, c = (tmp_path / name for name in ("a.txt", "b.txt", "c.txt"))
+    a.write_text("첫 번째 문서", encoding="utf-8")
+    b.write_text("두 번째 문서", encoding="utf-8")
+    c.write_text("세 번째 문서", encoding="utf-8")
+
+    changed, removed = _index(IndexManifest(str(db_path), SETTINGS), [str(a), str(b), str(c)])
+    assert set(changed) == {str(a), str(b), str(c)}
+    assert removed == []
+
+    # 재실행: 변경 없음
+    changed, removed = IndexManifest(str(db_path), SETTINGS).diff([str(a), str(b), str(c)])
+    assert changed == {}
+    assert removed == []
+
+    # b 내용 변경, c 삭제
+    b.write_text("두 번째 문서 (수정)", encoding="utf-8")
+    changed, removed = IndexManifest(str(db_path), SETTINGS).diff([str(a), str(b)])
+    assert list(changed) == [str(b)]
+    assert removed == [os.path.normpath(str(c))]
+
+
+def test_touch_without_content_change_only_updates_mtime(tmp_path):
+    db_path = tmp_path / "db"
+    a = tmp_path / "a.txt"
+    a.write_text("내용", encoding="utf-8")
+    _index(IndexManifest(str(db_path), SETTINGS), [str(a)])
+
+    stat = os.stat(a)
+    os.utime(a, (stat.st_atime, stat.st_mtime + 10))
+    manifest = IndexManifest(str(db_path), SETTINGS)
+    changed, removed = manifest.diff([str(a)])
+    assert changed == {}
+    assert removed == []
+    assert manifest.dirty
+
+
+def test_settings_change_marks_every_file_changed(tmp_path):
+    db_path = tmp_path / "db"
+    a = tmp_path / "a.txt"
+    a.write_text("내용", encoding="utf-8")
+    _index(IndexManifest(str(db_path), SETTINGS), [str(a)])
+
+    changed, _ = IndexManifest(str(db_path), {**SETTINGS, "chunk_size": 500}).diff([str(a)])
+    assert list(changed) == [str(a)]
+
+
+def test_chunk_ids_are_stable_and_path_scoped(tmp_path):
+    assert make_chunk_id("abc", "0", "x/a.txt") == make_chunk_id("abc", "0", "x/a.txt")
+    assert make_chunk_id("abc", "0", "x/a.txt") != make_chunk_id("abc", "0", "y/a.txt")
+
+
+def test_corrupt_manifest_falls_back_to_full_reindex(tmp_path):
+    db_path = tmp_path / "db"
+    db_path.mkdir()
+    (db_path / "index_manifest.json").write_text("{not json", encoding="utf-8")
+    a = tmp_path / "a.txt"
+    a.write_text("내용", encoding="utf-8")
+
+    changed, removed = IndexManifest(str(db_path), SETTINGS).diff([str(a)])
+    assert list(changed) == [str(a)]
+    assert removed == []
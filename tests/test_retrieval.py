@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+from agents.find_report_agent import FindReportAgent
+from vector_store import retrieval
+
+
+FILENAMES = ["스마트팜_20240807_회의록.docx", "스마트팜 사업계획서.pdf"]
+
+
+def test_extract_filters_filename_takes_precedence_over_doc_type():
+    filters = retrieval.extract_filters("스마트팜 사업계획서 내용 요약해줘", FILENAMES)
+    assert filters == {"filename": "스마트팜 사업계획서.pdf"}
+
+
+def test_extract_filters_doc_type_and_full_date():
+    filters = retrieval.extract_filters("2024년 8월 7일 회의록 알려줘", FILENAMES)
+    assert filters == {"doc_type": "회의록", "date_from": 20240807, "date_to": 20240807}
+
+
+def test_extract_filters_month_day_and_mmdd():
+    assert retrieval.extract_filters("8월 7일 회의 내용")["month_day"] == "0807"
+    assert retrieval.extract_filters("0807 회의록 요약")["month_day"] == "0807"
+
+
+def test_extract_filters_year_only_when_no_month_follows():
+    assert retrieval.extract_filters("2023년 보고서 목록")["year"] == 2023
+    assert "year" not in retrieval.extract_filters("2023년 8월 7일 보고서")
+
+
+def test_extract_filters_invalid_date_is_ignored():
+    filters = retrieval.extract_filters("13월 40일 회의록")
+    assert "month_day" not in filters
+    assert "date_from" not in filters
+
+
+def test_extract_filters_pages_are_zero_based():
+    filters = retrieval.extract_filters("3~5페이지 내용")
+    assert (filters["page_from"], filters["page_to"]) == (2, 4)
+    filters = retrieval.extract_filters("10쪽에 뭐라고 적혀 있어?")
+    assert (filters["page_from"], filters["page_to"]) == (9, 9)
+
+
+def test_extract_filters_plain_query_has_no_filters():
+    assert retrieval.extract_filters("스마트팜 온도 제어 방법", FILENAMES) == {}
+
+
+def test_build_where_shapes():
+    assert retrieval.build_where(None) is None
+    assert retrieval.build_where({}) is None
+    assert retrieval.build_where({"doc_type": "회의록"}) == {"doc_type": {"$eq": "회의록"}}
+    assert retrieval.build_where({"date_from": 20240807, "date_to": 20240807}) == {
+        "$and": [{"date": {"$gte": 20240807}}, {"date": {"$lte": 20240807}}]
+    }
+
+
+def test_matches_filters_agrees_with_build_where():
+    metadata = {"doc_type": "회의록", "date": 20240807, "page": 2}
+    assert retrieval.matches_filters(metadata, {"doc_type": "회의록", "page_from": 2, "page_to": 4})
+    assert not retrieval.matches_filters(metadata, {"doc_type": "매뉴얼"})
+    assert not retrieval.matches_filters({"doc_type": "회의록"}, {"date_from": 20240101})
+
+
+def test_parse_document_metadata():
+    assert retrieval.parse_document_metadata("스마트팜_20240807_회의록.docx") == {
+        "doc_type": "회의록", "date": 20240807, "year": 2024, "month_day": "0807"
+    }
+    assert retrieval.parse_document_metadata("2023년 사업계획서.pdf") == {"doc_type": "사업계획서", "year": 2023}
+
+
+def test_report_agent_lists_filenames_off_the_event_loop():
+    agent = FindReportAgent.__new__(FindReportAgent)
+    threads = []
+
+    def known_filenames():
+        threads.append(threading.current_thread())
+        return FILENAMES
+
+    agent._known_filenames = known_filenames
+    filters = asyncio.run(agent._aextract_filters("0807 회의록 요약"))
+
+    assert filters == {"doc_type": "회의록", "month_day": "0807"}
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,116 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from talent_matching.scoring import (
+    MAX_SCORES, CandidateMatrix, normalize_term, related_to, term_tokens, terms_match,
+)
+
+TODAY = date(2025, 1, 1)
+
+PROJECT = {
+    "project_name": "스마트팜 데이터 플랫폼",
+    "project_description": "온실 센서 데이터를 수집하는 스마트팜 백엔드 플랫폼",
+    "project_role": "백엔드 개발자",
+    "tech_stack": "Python, Django, AWS",
+    "additional_info": "",
+}
+
+CANDIDATES = [
+    {
+        "id": "1", "name": "강백엔드", "position": "백엔드 개발자", "department": "스마트팜사업부",
+        "join_date": "2020-03-01", "skills": ["Python", "Django", "AWS Lambda"],
+        "projects": ["스마트팜 센서 데이터 플랫폼", "온실 모니터링"],
+        "certifications": ["AWS Solutions Architect", "정보처리기사"],
+    },
+    {
+        "id": "2", "name": "김디자인", "position": "디자이너", "department": "디자인팀",
+        "join_date": "2024-07-01", "skills": ["Photoshop", "Figma"],
+        "projects": ["브랜드 리뉴얼"], "certifications": ["컬러리스트기사"],
+    },
+    {
+        "id": "3", "name": "이자바", "position": "프론트엔드 개발자", "department": "개발팀",
+        "join_date": None, "skills": ["JavaScript", "Python"], "projects": [], "certifications": [],
+    },
+    {"id": "4", "name": "빈후보", "position": None, "department": None, "join_date": "잘못된 날짜"},
+]
+
+
+@pytest.fixture
+def matrix():
+    return CandidateMatrix(CANDIDATES, today=TODAY)
+
+
+def test_scores_stay_within_category_bounds(matrix):
+    scores = matrix.score(PROJECT, similarities=np.asarray([1.5, -0.2, 0.5, 0.0]))
+    assert set(scores) == set(MAX_SCORES) | {"total"}
+    for name, maximum in MAX_SCORES.items():
+        assert scores[name].shape == (len(CANDIDATES),)
+        assert np.all(scores[name] >= 0.0)
+        assert np.all(scores[name] <= maximum)
+    np.testing.assert_allclose(scores["total"], sum(scores[name] for name in MAX_SCORES), atol=0.02)
+    assert np.all(scores["total"] <= sum(MAX_SCORES.values()))
+
+
+def test_score_components(matrix):
+    scores = matrix.score(PROJECT)
+    # 3개 필요 기술 모두 보유 ('aws' ↔ 'aws lambda')
+    assert scores["tech_match"][0] == pytest.approx(MAX_SCORES["tech_match"])
+    # python 만 보유 ('javascript' 는 'java' 와도 python 과도 다름)
+    assert scores["tech_match"][2] == pytest.approx(MAX_SCORES["tech_match"] / 3, abs=0.01)
+    assert scores["tech_match"][1] == 0.0
+    assert scores["project_experience"][0] > 0.0
+    assert scores["certifications"][0] > 0.0
+    assert scores["certifications"][1] == 0.0
+    # 근속 3년 이상 + 직책 일치 → 경력 적합성 상위
+    assert scores["career_fit"][0] > scores["career_fit"][2] > scores["career_fit"][3]
+
+
+def test_rows_subset_matches_full_scoring(matrix):
+    full = matrix.score(PROJECT)
+    subset = matrix.score(PROJECT, rows=np.asarray([2, 0]))
+    np.testing.assert_array_equal(subset["total"], full["total"][[2, 0]])
+
+
+def test_prefilter_skips_unrelated_candidates(matrix):
+    assert list(matrix.prefilter(PROJECT)) == [0, 2]
+
+
+def test_rank_orders_by_total_and_reports_evidence(matrix):
+    ranked = matrix.rank(PROJECT, top_n=2)
+    assert [entry["candidate"]["id"] for entry in ranked] == ["1", "3"]
+    evidence = ranked[0]["evidence"]
+    assert evidence["skills"] == ["Python", "Django", "AWS Lambda"]
+    assert evidence["missing_skills"] == []
+    assert "스마트팜 센서 데이터 플랫폼" in evidence["projects"]
+    assert ranked[1]["evidence"]["missing_skills"] == ["django", "aws"]
+    assert matrix.rank(PROJECT, rows=np.asarray([], dtype=int)) == []
+
+
+def test_empty_tech_stack_gives_zero_tech_match(matrix):
+    scores = matrix.score({**PROJECT, "tech_stack": ""})
+    assert np.all(scores["tech_match"] == 0.0)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("aws", "aws lambda", True),
+    ("java", "javascript", False),
+    ("빅데이터", "빅데이터분석기사", True),
+    ("python", "Python", True),
+])
+def test_terms_match(a, b, expected):
+    assert terms_match(a, b) is expected
+
+
+# --- 회귀: 두 글자 한글 토큰이 더 긴 단어 안에서 일치하던 문제 ---
+
+def _related(term, project_text):
+    return related_to(term, sorted(set(term_tokens(project_text))), normalize_term(project_text))
+
+
+def test_short_hangul_tokens_do_not_match_inside_longer_terms():
+    assert not _related("빅데이터분석기사", "로그 분석 도구")
+    assert not _related("정보처리기사", "대용량 데이터 처리 파이프라인")
+    assert _related("빅데이터분석기사", "빅데이터 플랫폼 구축")
+    assert _related("데이터 분석", "로그 분석 도구")
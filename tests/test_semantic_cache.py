@@ -0,0 +1,175 @@
+import asyncio
+import os
+
+import pytest
+
+from agents import find_report_agent, report_writing_guide_agent
+from agents.report_agent_base import GenerationError
+from vector_store import semantic_cache
+from vector_store.semantic_cache import SemanticCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(semantic_cache.time, "time", clock)
+    return clock
+
+
+def test_lookup_hits_similar_vector_and_misses_other_namespace(clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    cache.store("agent:a", "질문", [1.0, 0.0], {"answer": "답변"})
+
+    assert cache.lookup("agent:a", [0.99, 0.01]) == {"answer": "답변"}
+    assert cache.lookup("agent:a", [0.0, 1.0]) is None
+    assert cache.lookup("agent:b", [1.0, 0.0]) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    cache.store("ns", "질문", [1.0, 0.0], {"answer": "답변"})
+
+    clock.now += 61
+    assert cache.lookup("ns", [1.0, 0.0]) is None
+    stats = cache.stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_hit_entry(clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=2)
+    cache.store("ns", "a", [1.0, 0.0, 0.0], {"answer": "a"})
+    cache.store("ns", "b", [0.0, 1.0, 0.0], {"answer": "b"})
+    # a 를 최근 사용으로 갱신한 뒤 c 저장 → b 가 제거되어야 함
+    assert cache.lookup("ns", [1.0, 0.0, 0.0]) == {"answer": "a"}
+    cache.store("ns", "c", [0.0, 0.0, 1.0], {"answer": "c"})
+
+    assert cache.lookup("ns", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("ns", [1.0, 0.0, 0.0]) == {"answer": "a"}
+    assert cache.lookup("ns", [0.0, 0.0, 1.0]) == {"answer": "c"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_index_rebuild_invalidates_cache(tmp_path, clock):
+    marker = tmp_path / "chroma.sqlite3"
+    marker.write_text("v1")
+    cache = SemanticCache(index_path=str(tmp_path), threshold=0.95, ttl_seconds=60, max_entries=8)
+    cache.store("ns", "질문", [1.0, 0.0], {"answer": "답변"})
+
+    stat = marker.stat()
+    os.utime(marker, (stat.st_atime, stat.st_mtime + 10))
+    assert cache.lookup("ns", [1.0, 0.0]) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+# --- 회귀: LLM 생성 실패 답변이 캐시에 저장되던 문제 ---
+
+def _report_agent(agent_cls, cache, answer_tokens=("답변",), fail=False):
+    """벡터 DB / LLM 없이 검색·생성 단계만 대체한 보고서 에이전트"""
+    agent = agent_cls.__new__(agent_cls)
+    agent.vectordb = object()
+    agent.cache = cache
+    agent.generated = []
+
+    async def aembed_query(query):
+        return [1.0, 0.0]
+
+    async def aretrieve(query, query_vector, filters=None):
+        return []
+
+    async def abuild_context(docs, query_vector):
+        return "컨텍스트", [{"filename": "a.pdf"}], {}
+
+    async def agenerate_response(query, context, history=None):
+        agent.generated.append(history)
+        if fail:
+            raise GenerationError("응답 생성 중 오류가 발생했습니다: timeout")
+        return "".join(answer_tokens)
+
+    async def astream_response(query, context, history=None):
+        for token in answer_tokens:
+            yield token
+        if fail:
+            raise GenerationError("응답 생성 중 오류가 발생했습니다: timeout")
+
+    agent._aembed_query = aembed_query
+    agent._aretrieve = aretrieve
+    agent._abuild_context = abuild_context
+    agent._extract_filters = lambda query: {}
+    agent.agenerate_response = agenerate_response
+    agent.astream_response = astream_response
+    return agent
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+REPORT_AGENTS = [find_report_agent.FindReportAgent, report_writing_guide_agent.ReportWritingGuideAgent]
+
+
+@pytest.mark.parametrize("agent_cls", REPORT_AGENTS)
+def test_generation_error_is_not_cached(agent_cls, clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    agent = _report_agent(agent_cls, cache, fail=True)
+
+    result = asyncio.run(agent.asearch_documents("질문", "프로젝트"))
+    assert result["success"] is False
+    assert agent.format_agent_response(result)["messages"][0]["error"]
+
+    events = asyncio.run(_collect(agent.astream({"input_query": "질문", "project_name": "프로젝트"}, {})))
+    assert events[-1]["event"] == "message"
+    assert "error" in events[-1]["data"]
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("agent_cls", REPORT_AGENTS)
+def test_successful_answer_is_cached(agent_cls, clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    agent = _report_agent(agent_cls, cache, answer_tokens=("보고서 ", "답변"))
+
+    events = asyncio.run(_collect(agent.astream({"input_query": "질문", "project_name": "프로젝트"}, {})))
+    assert events[-1]["data"]["answer"] == "보고서 답변"
+
+    cached = asyncio.run(agent.asearch_documents("질문", "프로젝트"))
+    assert cached["cached"] is True
+    assert cached["answer"] == "보고서 답변"
+
+
+@pytest.mark.parametrize("agent_cls", REPORT_AGENTS)
+def test_standalone_question_mid_thread_uses_cache(agent_cls, clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    agent = _report_agent(agent_cls, cache)
+    thread = [{"answer": "센서 담당자는 강백엔드입니다."}, "메일 초안입니다."]
+
+    asyncio.run(agent.ainvoke({"input_query": "스마트팜 사업계획서 예산 알려줘", "messages": thread}, {}))
+    thread = thread + [{"answer": "답변"}, "용어 설명입니다."]
+    state = asyncio.run(agent.ainvoke({"input_query": "스마트팜 사업계획서 예산 알려줘", "messages": thread}, {}))
+
+    assert state["messages"][0]["answer"] == "답변"
+    # 이전 대화가 있어도 독립 질문이면 두 번째 요청은 캐시 적중 (LLM 호출 1회)
+    assert agent.generated == [[]]
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("agent_cls", REPORT_AGENTS)
+def test_follow_up_question_gets_history_and_skips_cache(agent_cls, clock):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=8)
+    agent = _report_agent(agent_cls, cache)
+    thread = [{"answer": "사업계획서 예산은 3억 원입니다."}]
+
+    for _ in range(2):
+        asyncio.run(agent.ainvoke({"input_query": "그 보고서 더 자세히 알려줘", "messages": thread}, {}))
+
+    assert agent.generated == [["사업계획서 예산은 3억 원입니다."]] * 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,33 @@
+from datetime import date
+from types import SimpleNamespace
+
+from talent_matching.store_new_employees import content_hash, employee_metadata
+
+
+def _employee(**overrides):
+    fields = {
+        "id": 7, "name": "강백엔드", "position": "백엔드 개발자", "department": "스마트팜사업부",
+        "join_date": date(2024, 3, 1), "skills": ["Python", "Django"], "projects": ["스마트팜 플랫폼"],
+        "education_degree": "학사", "education_school": "한국대학교", "certifications": ["정보처리기사"],
+        "languages": ["영어"], "profile_summary": "백엔드 개발자", "updated_at": "2025-01-01 09:00:00",
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+# --- 회귀: db_hr_init.py 재실행마다 바뀌는 updated_at 때문에 전 직원을 다시 임베딩하던 문제 ---
+
+def test_content_hash_ignores_updated_at():
+    assert content_hash(_employee()) == content_hash(_employee(updated_at="2025-06-30 18:00:00"))
+
+
+def test_content_hash_changes_with_embedded_fields():
+    assert content_hash(_employee()) != content_hash(_employee(skills=["Python", "Django", "AWS"]))
+    assert content_hash(_employee()) != content_hash(_employee(profile_summary="데이터 엔지니어"))
+
+
+def test_metadata_carries_hash_for_incremental_sync():
+    metadata = employee_metadata(_employee())
+    assert metadata["content_hash"] == content_hash(_employee())
+    assert "updated_at" not in metadata
+    assert metadata["skills"] == "Python, Django"
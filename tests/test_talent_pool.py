@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import date
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from talent_matching.scoring import CandidateMatrix
+from talent_matching.talent_pool import TalentPool
+
+TODAY = date(2025, 1, 1)
+
+
+def _candidate(candidate_id, position, skills, projects=(), certifications=(), join_date="2022-01-01"):
+    return {
+        "id": candidate_id, "name": f"후보{candidate_id}", "position": position, "department": "개발팀",
+        "join_date": join_date, "skills": list(skills), "projects": list(projects),
+        "certifications": list(certifications),
+    }
+
+
+CANDIDATES = [
+    _candidate("0", "백엔드 개발자", ["Python", "Django", "AWS", "React"], ["스마트팜 백엔드 플랫폼"], ["정보처리기사"]),
+    _candidate("1", "백엔드 개발자", ["Python", "Flask"]),
+    _candidate("2", "프론트엔드 개발자", ["React", "TypeScript", "Python"], ["스마트팜 대시보드"]),
+    _candidate("3", "디자이너", ["Figma"]),
+    _candidate("4", "데이터 엔지니어", ["Python", "Spark", "AWS"], ["센서 데이터 파이프라인"]),
+]
+
+
+def _project(name, role, tech_stack, description=""):
+    return {
+        "project_name": name, "project_description": description, "project_role": role,
+        "tech_stack": tech_stack, "additional_info": "",
+    }
+
+
+PROJECTS = [
+    _project("스마트팜 플랫폼", "백엔드 개발자", "Python, Django, AWS", "스마트팜 백엔드 플랫폼"),
+    _project("스마트팜 대시보드", "프론트엔드 개발자", "React, TypeScript, Python", "스마트팜 대시보드"),
+]
+
+
+@pytest.fixture
+def pool():
+    pool = TalentPool(ttl_seconds=600, semantic_k=2)
+    pool.matrix = CandidateMatrix(CANDIDATES, today=TODAY)
+    return pool
+
+
+def _similarities(n_projects):
+    return np.zeros((n_projects, len(CANDIDATES)), dtype=np.float32)
+
+
+def _ids(results):
+    return [[entry["candidate"]["id"] for entry in ranked] for ranked in results]
+
+
+def test_rank_batch_without_unique_allows_same_candidate(pool):
+    results = pool.rank_batch(PROJECTS, _similarities(2), top_n=2)
+    assert [len(ranked) for ranked in results] == [2, 2]
+    assert results[0] == pool.rank(PROJECTS[0], _similarities(2)[0], top_n=2)
+    # 후보 0 은 두 프로젝트 모두에서 상위권
+    assert "0" in _ids(results)[0] and "0" in _ids(results)[1]
+
+
+def test_rank_batch_unique_assigns_each_candidate_once(pool):
+    results = pool.rank_batch(PROJECTS, _similarities(2), top_n=2, unique=True)
+    ids = _ids(results)
+    assert [len(project_ids) for project_ids in ids] == [2, 2]
+    flat = [candidate_id for project_ids in ids for candidate_id in project_ids]
+    assert len(flat) == len(set(flat))
+    for ranked in results:
+        totals = [entry["total_score"] for entry in ranked]
+        assert totals == sorted(totals, reverse=True)
+
+
+def test_rank_batch_unique_maximizes_total_score(pool):
+    similarities = _similarities(2)
+    results = pool.rank_batch(PROJECTS, similarities, top_n=1, unique=True)
+    assigned_total = sum(ranked[0]["total_score"] for ranked in results)
+
+    totals = [pool.matrix.score(project, similarities[i])["total"] for i, project in enumerate(PROJECTS)]
+    best = max(totals[0][a] + totals[1][b] for a, b in permutations(range(len(CANDIDATES)), 2))
+    assert assigned_total == pytest.approx(float(best), abs=0.01)
+
+
+def test_rank_batch_unique_with_fewer_candidates_than_slots():
+    pool = TalentPool(ttl_seconds=600, semantic_k=2)
+    pool.matrix = CandidateMatrix(CANDIDATES[:3], today=TODAY)
+    results = pool.rank_batch(PROJECTS, np.zeros((2, 3), dtype=np.float32), top_n=2, unique=True)
+    flat = [candidate_id for project_ids in _ids(results) for candidate_id in project_ids]
+    assert sorted(flat) == ["0", "1", "2"]
+
+
+def test_empty_pool_returns_empty_lists():
+    assert TalentPool().rank_batch(PROJECTS, np.zeros((2, 0)), unique=True) == [[], []]
+
+
+class CountingPool(TalentPool):
+    """DB 대신 load 호출 횟수만 세는 풀 (gate 가 열릴 때까지 로드가 끝나지 않음)"""
+
+    def __init__(self, fail=False):
+        super().__init__(ttl_seconds=600)
+        self.loads = 0
+        self.fail = fail
+        self.gate = None
+
+    async def load(self):
+        self.loads += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail and self.matrix is not None:
+            raise RuntimeError("DB 연결 실패")
+        self.matrix = CandidateMatrix(CANDIDATES[:self.loads], today=TODAY)
+        self._loaded_at = time.monotonic()
+
+
+def test_stale_pool_refreshes_once_in_background():
+    async def scenario():
+        pool = CountingPool()
+        await pool.ensure_loaded()
+        assert (pool.loads, len(pool)) == (1, 1)
+
+        pool._loaded_at -= 601
+        pool.gate = asyncio.Event()
+        # 갱신이 끝나지 않아도 기존 행렬로 바로 응답하고, 갱신 작업은 하나만 생성
+        await asyncio.gather(*(pool.ensure_loaded() for _ in range(5)))
+        assert len(pool) == 1
+        await asyncio.sleep(0)
+        assert pool.loads == 2
+
+        pool.gate.set()
+        await pool._refresh_task
+        assert len(pool) == 2
+        assert not pool.stale
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_keeps_previous_matrix():
+    async def scenario():
+        pool = CountingPool(fail=True)
+        await pool.ensure_loaded()
+        matrix = pool.matrix
+
+        pool._loaded_at -= 601
+        await pool.ensure_loaded()
+        await pool._refresh_task
+        assert pool.matrix is matrix
+        # 다음 TTL 까지는 다시 시도하지 않음
+        assert not pool.stale
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_is_not_affected_by_refresh(pool):
+    snapshot = pool._snapshot()
+    pool.matrix = CandidateMatrix(CANDIDATES[:1], today=TODAY)
+    assert len(snapshot) == len(CANDIDATES)
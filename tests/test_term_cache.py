@@ -0,0 +1,75 @@
+import pytest
+
+from agents import term_cache
+from agents.term_cache import TermCache, extract_glossary_terms, normalize_term
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("NDVI가 뭐야?", "ndvi"),
+    ("MQTT란 무엇인가요", "mqtt"),
+    ("  스마트팜   설명해줘 ", "스마트팜"),
+    ("ＹＯＬＯｖ８ 뜻이 뭐야", "yolov8"),
+    ("\"LoRa\"", "lora"),
+])
+def test_normalize_term(raw, expected):
+    assert normalize_term(raw) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("파이 뭐야", "파이"),
+    ("파이란 뭐야", "파이"),
+    ("스마트팜이 뭐야", "스마트팜"),
+    ("온실은 뭐야", "온실"),
+    ("센서는 뭐야", "센서"),
+    ("데이터가 뭐야", "데이터"),
+])
+def test_normalize_term_strips_only_particles_matching_final_consonant(raw, expected):
+    assert normalize_term(raw) == expected
+
+
+def test_question_without_term_normalizes_to_empty_key():
+    assert normalize_term("설명해줘") == ""
+    assert normalize_term("뭐야?") == ""
+
+
+def test_get_and_set_round_trip_per_project(tmp_path):
+    cache = TermCache(str(tmp_path / "terms.sqlite3"), ttl_seconds=60)
+    cache.set("NDVI가 뭐야?", "스마트팜", "정규식생지수")
+
+    assert cache.get("ndvi", "스마트팜") == "정규식생지수"
+    assert cache.get("NDVI", "다른 프로젝트") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_expired_entry_is_ignored_and_purged(tmp_path, monkeypatch):
+    cache = TermCache(str(tmp_path / "terms.sqlite3"), ttl_seconds=60)
+    cache.set("MQTT", None, "메시지 프로토콜")
+
+    now = term_cache.time.time()
+    monkeypatch.setattr(term_cache.time, "time", lambda: now + 120)
+    assert cache.get("MQTT", None) is None
+    assert cache.purge_expired() == 1
+
+
+# --- 회귀: 용어가 없는 질문끼리 빈 키 항목 하나를 공유하던 문제 ---
+
+def test_empty_key_is_never_stored_or_served(tmp_path):
+    cache = TermCache(str(tmp_path / "terms.sqlite3"), ttl_seconds=60)
+    cache.set("설명해줘", None, "이전 질문에 대한 설명")
+
+    assert cache.stats()["entries"] == 0
+    assert cache.get("알려줘", None) is None
+    # 빈 키 조회는 적중/미적중 통계에도 포함하지 않음
+    assert cache.stats()["misses"] == 0
+
+
+def test_extract_glossary_terms_from_meeting_summary():
+    summary = (
+        "<strong>주요 안건</strong><br>스마트팜 구축<br>"
+        "<strong>신입 직원을 위한 생소한 용어:</strong><br>"
+        "• NDVI: 정규식생지수<br>• MQTT - 메시지 프로토콜<br>• YOLOv8(객체 탐지 모델)<br>"
+        "<strong>다음 일정</strong><br>8월 7일"
+    )
+    assert extract_glossary_terms(summary) == ["NDVI", "MQTT", "YOLOv8"]
+    assert extract_glossary_terms("<strong>신입 직원을 위한 생소한 용어:</strong> 해당 내용에 대한 발언은 없었습니다") == []
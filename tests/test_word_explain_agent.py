@@ -0,0 +1,78 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+
+from agents import word_explain_agent
+from agents.term_cache import TermCache
+
+
+@pytest.fixture(autouse=True)
+def tavily_key(monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = TermCache(str(tmp_path / "terms.sqlite3"), ttl_seconds=60)
+    monkeypatch.setattr(word_explain_agent, "get_term_cache", lambda: cache)
+    return cache
+
+
+def _response(status_code, payload):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode("utf-8")
+    response.url = word_explain_agent.TAVILY_SEARCH_URL
+    return response
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.prompts = []
+
+    def create(self, model, messages):
+        self.prompts.append(messages[-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="NDVI 는 식생 지수입니다."))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = FakeCompletions()
+    monkeypatch.setattr(word_explain_agent, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return completions
+
+
+@pytest.mark.parametrize("status_code", [401, 429, 503])
+def test_search_tavily_raises_on_http_error(monkeypatch, status_code):
+    monkeypatch.setattr(word_explain_agent.requests, "get", lambda *args, **kwargs: _response(status_code, {"detail": "x"}))
+    with pytest.raises(requests.HTTPError):
+        word_explain_agent.search_tavily("NDVI")
+
+
+def test_asearch_tavily_raises_on_http_error(monkeypatch):
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, json={"detail": "rate limited"}))
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(word_explain_agent.httpx, "AsyncClient", lambda: real_client(transport=transport))
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(word_explain_agent.asearch_tavily("NDVI"))
+
+
+def test_explanation_without_web_results_is_not_cached(monkeypatch, cache, completions):
+    monkeypatch.setattr(word_explain_agent.requests, "get", lambda *args, **kwargs: _response(429, {}))
+
+    explanation = word_explain_agent.explain_word("NDVI", "스마트팜", "온실 자동화")
+    assert explanation == "NDVI 는 식생 지수입니다."
+    assert cache.stats()["entries"] == 0
+
+
+def test_explanation_with_web_results_is_cached(monkeypatch, cache, completions):
+    payload = {"results": [{"content": "NDVI: 정규식생지수"}]}
+    monkeypatch.setattr(word_explain_agent.requests, "get", lambda *args, **kwargs: _response(200, payload))
+
+    word_explain_agent.explain_word("NDVI", "스마트팜", "온실 자동화")
+    assert "NDVI: 정규식생지수" in completions.prompts[0]
+    assert cache.get("NDVI 뜻이 뭐야", "스마트팜") == "NDVI 는 식생 지수입니다."
@@ -1,16 +1,79 @@
 import os
+import time
+import shutil
 import argparse
 import traceback
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-from langchain_community.document_loaders import PyMuPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
 
+from vector_store.registry import get_embeddings, get_openai_embeddings, get_vectorstore, release_vectorstore
+from vector_store.manifest import IndexManifest, make_chunk_id
+from vector_store.embedding_pipeline import EmbeddingPipeline
+from vector_store.loaders import load_file_documents, is_supported, DEFAULT_SECTION
+from vector_store.retrieval import parse_document_metadata
+from vector_store.semantic_cache import invalidate_semantic_cache
+from vector_store.keyword_index import invalidate_keyword_index
+
+
+# 청크 생성 방식 버전 (바뀌면 매니페스트 비교 시 전체 재색인)
+CHUNKER_VERSION = "section-v2"
+
+
+def split_documents(docs: Iterable[Document], text_splitter, file_hash: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    섹션 단위 문서를 청크로 분할하며 하나씩 생성 (청크는 섹션 경계를 넘지 않음)
+
+    Args:
+        docs: 섹션 단위 문서 iterable (generator 가능)
+        text_splitter: 텍스트 분할기
+        file_hash: 원본 파일 SHA-256 (주어지면 내용 기반의 안정적인 chunk_id 생성)
+
+    Returns:
+        {"text", "metadata"} 청크 generator
+    """
+    for i, doc in enumerate(docs):
+        # 문서 메타데이터에서 섹션 정보 추출
+        source_path = doc.metadata.get("source", "")
+        source_filename = os.path.basename(source_path) if source_path else "unknown"
+
+        # 기본 메타데이터 설정 (문서 유형/날짜는 검색 필터용)
+        metadata = {
+            "source": source_path,
+            "filename": source_filename,
+            "page": doc.metadata.get("page", 0),
+            "section": doc.metadata.get("section", DEFAULT_SECTION),
+            "doc_index": i,
+            **parse_document_metadata(source_filename)
+        }
+
+        # 텍스트 분할 후 각 청크에 메타데이터 추가
+        for j, chunk in enumerate(text_splitter.split_text(doc.page_content)):
+            yield {
+                "text": chunk,
+                "metadata": {
+                    **metadata,
+                    "chunk_index": j,
+                    "chunk_id": make_chunk_id(file_hash, f"{i}_{j}", source_path) if file_hash else f"{i}_{j}"
+                }
+            }
+
+
+def _parse_file_worker(file_path: str, file_hash: str, chunk_size: int, chunk_overlap: int) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """프로세스 풀 작업: 파일 하나를 파싱하고 청크로 분할 (임베딩은 부모 프로세스에서 수행)"""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+    )
+    texts, metadatas = [], []
+    for chunk in split_documents(load_file_documents(file_path), text_splitter, file_hash):
+        texts.append(chunk["text"])
+        metadatas.append(chunk["metadata"])
+    return texts, metadatas
 
 
 class VectorDatabaseBuilder:
@@ -21,7 +84,9 @@ class VectorDatabaseBuilder:
         embedding_model_name: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS",
         chunk_size: int = 800,
         chunk_overlap: int = 150,
-        db_path: str = "./vector_store/db"
+        db_path: str = "./vector_store/db",
+        num_workers: Optional[int] = None,
+        batch_size: Optional[int] = None
     ):
         """
         VectorDatabaseBuilder 초기화
@@ -31,14 +96,19 @@ class VectorDatabaseBuilder:
             chunk_size: 청크 크기
             chunk_overlap: 청크 오버랩
             db_path: 벡터 DB 저장 경로
+            num_workers: 파일 파싱/분할 프로세스 수 (기본값: INGEST_WORKERS 또는 CPU 코어 수, 1 이면 직렬 처리)
+            batch_size: 한 번에 임베딩/저장할 청크 수 (기본값: INGEST_BATCH_SIZE 또는 1024)
         """
         self.embedding_model_name = embedding_model_name
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.db_path = db_path
+        self.num_workers = num_workers or int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+        self.batch_size = batch_size or int(os.getenv("INGEST_BATCH_SIZE", "1024"))
         
         # 임베딩 모델 초기화
         self.embeddings = self._init_embedding_model()
+        self.pipeline = EmbeddingPipeline(self.embeddings)
         
         # 텍스트 분할기 초기화
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -47,14 +117,25 @@ class VectorDatabaseBuilder:
             length_function=len,
         )
     
+    @staticmethod
+    def index_settings(embedding_model_name: str, chunk_size: int, chunk_overlap: int) -> Dict[str, Any]:
+        """매니페스트에 기록되는 인덱스 설정 (바뀌면 전체 파일을 다시 임베딩)"""
+        return {
+            "chunker": CHUNKER_VERSION,
+            "embedding_model": embedding_model_name,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap
+        }
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return self.index_settings(self.embedding_model_name, self.chunk_size, self.chunk_overlap)
+
     def _init_embedding_model(self):
         """임베딩 모델 초기화"""
         try:
-            embeddings = HuggingFaceEmbeddings(
-                model_name=self.embedding_model_name,
-                model_kwargs={"device": "cpu"},
-                encode_kwargs={"normalize_embeddings": True}
-            )
+            # 에이전트와 같은 모델 인스턴스를 공유
+            embeddings = get_embeddings(self.embedding_model_name)
             print(f"임베딩 모델 '{self.embedding_model_name}' 초기화 완료")
             return embeddings
         except Exception as e:
@@ -79,8 +160,7 @@ class VectorDatabaseBuilder:
                 if not os.path.exists(file_path):
                     raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
                 
-                loader = PyMuPDFLoader(file_path=file_path)
-                docs = loader.load()
+                docs = list(load_file_documents(file_path))
                 all_docs.extend(docs)
                 print(f"파일 '{os.path.basename(file_path)}' 로드 완료: {len(docs)}개 문서 조각")
             
@@ -91,47 +171,19 @@ class VectorDatabaseBuilder:
         print(f"총 로드된 문서 조각: {len(all_docs)}개")
         return all_docs
     
-    def process_documents(self, docs: List[Any]) -> tuple:
+    def process_documents(self, docs: List[Any], file_hash: Optional[str] = None) -> tuple:
         """
         문서 처리 및 청크 생성
         
         Args:
             docs: 문서 객체 리스트
+            file_hash: 원본 파일 SHA-256 (주어지면 내용 기반의 안정적인 chunk_id 생성)
             
         Returns:
             texts, metadatas: 텍스트와 메타데이터 튜플
         """
-        all_chunks = []
-        
         try:
-            # 각 문서 처리
-            for i, doc in enumerate(docs):
-                # 문서 메타데이터에서 섹션 정보 추출
-                source_path = doc.metadata.get("source", "")
-                source_filename = os.path.basename(source_path) if source_path else "unknown"
-                
-                # 기본 메타데이터 설정
-                metadata = {
-                    "source": source_path,
-                    "filename": source_filename,
-                    "page": doc.metadata.get("page", 0),
-                    "doc_index": i
-                }
-                
-                # 텍스트 분할
-                text = doc.page_content
-                chunks = self.text_splitter.split_text(text)
-                
-                # 각 청크에 메타데이터 추가
-                for j, chunk in enumerate(chunks):
-                    all_chunks.append({
-                        "text": chunk,
-                        "metadata": {
-                            **metadata,
-                            "chunk_index": j,
-                            "chunk_id": f"{i}_{j}"
-                        }
-                    })
+            all_chunks = list(split_documents(docs, self.text_splitter, file_hash))
             
             # 벡터화를 위한 텍스트와 메타데이터 준비
             texts = [chunk["text"] for chunk in all_chunks]
@@ -145,73 +197,220 @@ class VectorDatabaseBuilder:
             traceback.print_exc()
             raise
     
-    def create_vector_db(self, texts: List[str], metadatas: List[Dict[str, Any]]) -> Optional[Chroma]:
+    def load_file_chunks(self, file_path: str, file_hash: str) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """
+        단일 파일 로드 및 청크 생성
+
+        Args:
+            file_path: 문서 파일 경로
+            file_hash: 파일 SHA-256
+
+        Returns:
+            texts, metadatas, ids (ids 는 파일 내용 기반 chunk_id)
+        """
+        docs = self.load_documents([file_path])
+        if not docs:
+            return [], [], []
+        texts, metadatas = self.process_documents(docs, file_hash=file_hash)
+        return texts, metadatas, [metadata["chunk_id"] for metadata in metadatas]
+
+    def iter_file_chunks(self, files: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any], List[str], List[Dict[str, Any]]]]:
+        """
+        파일별 청크를 처리가 끝나는 순서대로 생성
+        num_workers > 1 이면 프로세스 풀에서 병렬 파싱하며, 동시에 처리 중인 파일 수를 제한하여 메모리 사용량을 묶어둠
+
+        Args:
+            files: 파일 경로 → 지문(sha256 포함)
+
+        Returns:
+            (파일 경로, 지문, texts, metadatas) generator
+        """
+        if self.num_workers <= 1 or len(files) <= 1:
+            for file_path, fingerprint in files.items():
+                texts, metadatas, _ = self.load_file_chunks(file_path, fingerprint["sha256"])
+                yield file_path, fingerprint, texts, metadatas
+            return
+
+        max_in_flight = self.num_workers * 2
+        pending_files = iter(files.items())
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            in_flight = {}
+
+            def submit_next() -> None:
+                for file_path, fingerprint in pending_files:
+                    future = executor.submit(
+                        _parse_file_worker, file_path, fingerprint["sha256"], self.chunk_size, self.chunk_overlap
+                    )
+                    in_flight[future] = (file_path, fingerprint)
+                    return
+
+            for _ in range(max_in_flight):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, fingerprint = in_flight.pop(future)
+                    try:
+                        texts, metadatas = future.result()
+                        print(f"파일 '{os.path.basename(file_path)}' 분할 완료: {len(texts)}개 청크")
+                    except Exception as e:
+                        print(f"파일 '{file_path}' 로드 과정에서 오류 발생: {e}")
+                        texts, metadatas = [], []
+                    submit_next()
+                    yield file_path, fingerprint, texts, metadatas
+
+    def ingest_files(self, vectordb: Chroma, files: Dict[str, Dict[str, Any]], manifest: IndexManifest) -> int:
+        """
+        파일 청크를 batch_size 단위로 모아 벡터 DB 에 추가하고 매니페스트에 기록
+
+        Args:
+            vectordb: 대상 Chroma 객체
+            files: 파일 경로 → 지문
+            manifest: 청크 ID 를 기록할 매니페스트
+
+        Returns:
+            추가된 청크 수
+        """
+        start = time.perf_counter()
+        texts, metadatas, ids = [], [], []
+        total = 0
+
+        def flush() -> None:
+            if texts:
+                self.pipeline.upsert(vectordb, list(texts), list(metadatas), list(ids))
+                texts.clear()
+                metadatas.clear()
+                ids.clear()
+
+        for file_path, fingerprint, file_texts, file_metadatas in self.iter_file_chunks(files):
+            if not file_texts:
+                # 로드 실패 시 다음 갱신에서 다시 시도
+                manifest.remove(manifest.key(file_path))
+                continue
+
+            file_ids = [metadata["chunk_id"] for metadata in file_metadatas]
+            texts.extend(file_texts)
+            metadatas.extend(file_metadatas)
+            ids.extend(file_ids)
+            manifest.record(file_path, fingerprint, file_ids)
+            total += len(file_ids)
+
+            if len(texts) >= self.batch_size:
+                flush()
+        flush()
+
+        print(f"총 {total}개 청크 색인 완료 ({time.perf_counter() - start:.1f}초, workers={self.num_workers})")
+        self.pipeline.report(f"'{self.db_path}' 임베딩")
+        return total
+
+    def _remove_existing_db(self) -> None:
+        """
+        기존 DB 디렉토리 삭제 (전체 구축 전)
+
+        기존 컬렉션에 이어서 추가하면 예전 청크(임의 ID)와 새 청크가 함께 남아 검색 결과가 중복되므로
+        열려 있는 핸들과 chromadb 의 경로별 클라이언트 캐시를 먼저 해제한 뒤 디렉토리 전체를 지웁니다.
+        """
+        if not os.path.exists(self.db_path):
+            return
+        print(f"경고: 기존 데이터베이스가 '{self.db_path}'에 존재합니다. 삭제 후 새로 구축합니다.")
+        release_vectorstore(self.db_path, reload_from_disk=True)
+        shutil.rmtree(self.db_path)
+
+    def build(self, file_paths: List[str]) -> Optional[Chroma]:
         """
-        벡터 데이터베이스 생성
+        전체 벡터 DB 구축 프로세스 실행 (기존 DB 는 삭제, 증분 갱신용 매니페스트도 함께 기록)
         
         Args:
-            texts: 텍스트 리스트
-            metadatas: 메타데이터 리스트
+            file_paths: 문서 파일 경로 목록
             
         Returns:
             생성된 Chroma 객체 또는 None (오류 발생 시)
         """
         try:
-            # 저장 디렉토리 생성
+            manifest = IndexManifest(self.db_path, self.settings)
+            manifest.files = {}
+
+            # 1. 파일 지문 계산 (파일 해시 기반 chunk_id)
+            files = {}
+            for file_path in file_paths:
+                if not os.path.exists(file_path):
+                    print(f"파일을 찾을 수 없습니다: {file_path}")
+                    continue
+                files[file_path] = manifest.fingerprint(file_path)
+
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            
-            # 기존 DB 확인
-            if os.path.exists(self.db_path):
-                print(f"경고: 기존 데이터베이스가 '{self.db_path}'에 존재합니다. 덮어쓰기를 진행합니다.")
-            
-            # 벡터 DB 생성
-            vectordb = Chroma.from_texts(
-                texts=texts,
-                embedding=self.embeddings,
-                metadatas=metadatas,
-                persist_directory=self.db_path
-            )
-            
-            # 저장
+            self._remove_existing_db()
+
+            # 2. 병렬 파싱/분할 → 배치 단위 임베딩 및 저장
+            vectordb = Chroma(persist_directory=self.db_path, embedding_function=self.embeddings)
+            if not self.ingest_files(vectordb, files, manifest):
+                print("생성된 청크가 없습니다.")
+                return None
+
             vectordb.persist()
+            manifest.save()
             print(f"벡터 데이터베이스가 '{self.db_path}'에 저장되었습니다.")
-            
+
+            # 기존에 열려 있던 공유 핸들은 다음 조회 시 다시 열리도록 해제하고 캐시된 답변 무효화
+            release_vectorstore(self.db_path)
+            invalidate_semantic_cache(self.db_path)
+            invalidate_keyword_index(self.db_path)
             return vectordb
         
         except Exception as e:
-            print(f"벡터 데이터베이스 생성 과정에서 오류 발생: {e}")
+            print(f"벡터 DB 구축 과정에서 오류 발생: {e}")
             traceback.print_exc()
             return None
-    
-    def build(self, file_paths: List[str]) -> Optional[Chroma]:
+
+    def sync(self, file_paths: List[str]) -> Optional[Chroma]:
         """
-        전체 벡터 DB 구축 프로세스 실행
-        
+        매니페스트 기반 증분 갱신
+        새로 추가되거나 내용이 바뀐 파일만 다시 임베딩하고, 삭제/변경된 파일의 기존 청크는 제거
+
         Args:
-            file_paths: 문서 파일 경로 목록
-            
+            file_paths: 현재 색인 대상 문서 파일 경로 목록
+
         Returns:
-            생성된 Chroma 객체 또는 None (오류 발생 시)
+            갱신된 Chroma 객체 또는 None (오류 발생 시)
         """
         try:
-            # 1. 문서 로드
-            docs = self.load_documents(file_paths)
-            if not docs:
-                print("처리할 문서가 없습니다.")
-                return None
-            
-            # 2. 문서 처리 및 청크 생성
-            texts, metadatas = self.process_documents(docs)
-            if not texts:
-                print("생성된 청크가 없습니다.")
-                return None
-            
-            # 3. 벡터 DB 생성 및 저장
-            vectordb = self.create_vector_db(texts, metadatas)
+            manifest = IndexManifest(self.db_path, self.settings)
+            if not manifest.exists() or manifest.settings_changed:
+                # 매니페스트가 없으면 기존 청크 ID 를 알 수 없고, 설정(임베딩 모델 등)이 바뀌면 기존 벡터와 섞을 수 없음
+                print("매니페스트가 없거나 인덱스 설정이 바뀌어 전체 구축을 진행합니다.")
+                return self.build(file_paths)
+
+            changed, removed = manifest.diff(file_paths)
+            vectordb = get_vectorstore(self.db_path, self.embedding_model_name)
+            if not changed and not removed:
+                print(f"변경된 문서가 없습니다: '{self.db_path}'")
+                if manifest.dirty:
+                    manifest.save()
+                return vectordb
+
+            print(f"증분 갱신: 추가/변경 {len(changed)}개, 삭제 {len(removed)}개 파일")
+
+            # 1. 삭제되거나 변경된 파일의 기존 청크 제거
+            stale_ids = []
+            for key in removed + [manifest.key(path) for path in changed]:
+                stale_ids.extend(manifest.chunk_ids(key))
+            if stale_ids:
+                vectordb.delete(ids=stale_ids)
+                print(f"기존 청크 {len(stale_ids)}개 삭제")
+            for key in removed:
+                manifest.remove(key)
+
+            # 2. 추가/변경된 파일만 병렬 파싱 후 임베딩
+            self.ingest_files(vectordb, changed, manifest)
+
+            manifest.save()
+            invalidate_semantic_cache(self.db_path)
+            invalidate_keyword_index(self.db_path)
             return vectordb
-        
+
         except Exception as e:
-            print(f"벡터 DB 구축 과정에서 오류 발생: {e}")
+            print(f"벡터 DB 증분 갱신 과정에서 오류 발생: {e}")
             traceback.print_exc()
             return None
 
@@ -237,15 +436,14 @@ def build_code_rule_vector_db(
         raw_text = f.read()
 
     chunks = [chunk.strip() for chunk in raw_text.split("\n\n") if chunk.strip()]
-    documents = [Document(page_content=chunk) for chunk in chunks]
 
-    embedding = OpenAIEmbeddings()
-    vectorstore = Chroma.from_documents(
-        documents=documents,
-        embedding=embedding,
-        persist_directory=db_path
-    )
+    embedding = get_openai_embeddings()
+    vectorstore = Chroma(persist_directory=db_path, embedding_function=embedding)
+    pipeline = EmbeddingPipeline(embedding)
+    pipeline.upsert(vectorstore, chunks, ids=[f"rule_{i}" for i in range(len(chunks))])
+    pipeline.report("코드 규칙 임베딩")
     vectorstore.persist()
+    release_vectorstore(db_path)
     print(f"✅ 코드 규칙 벡터 DB 저장 완료: {db_path}")
     return vectorstore
 
@@ -264,33 +462,58 @@ def ensure_code_rule_vector_db_exists():
     print("📦 코드 규칙 벡터 DB 생성 시작")
     build_code_rule_vector_db(rule_file_path=rule_file_path, db_path=db_path)
 
-def ensure_vector_db_exists(db_path: str = "./vector_store/db", file_path: str="./docs"):
-    # DB가 이미 존재하는지 확인
-    if os.path.exists(db_path) and os.path.isdir(db_path) and len(os.listdir(db_path)) > 0:
-        print(f"벡터 데이터베이스가 '{db_path}'에 이미 존재합니다.")
-        return True
-    
-    print(f"벡터 데이터베이스가 존재하지 않습니다. 새로 구축합니다...")
-
-    # 벡터 DB 빌더 생성
-    builder = VectorDatabaseBuilder(
-        embedding_model_name="snunlp/KR-SBERT-V40K-klueNLI-augSTS",
-        chunk_size=400,
-        chunk_overlap=50,
-        db_path=db_path
-    )
-    
-    # 파일 경로를 리스트로 변환
+def collect_file_paths(file_path) -> List[str]:
+    """파일/디렉토리 경로를 문서 파일 경로 리스트로 변환 (로더가 없는 형식은 제외)"""
     if isinstance(file_path, str):
         if os.path.isdir(file_path):
             # 디렉토리인 경우 모든 파일 경로를 수집
-            file_paths = [os.path.join(file_path, f) for f in os.listdir(file_path) 
-                         if os.path.isfile(os.path.join(file_path, f))]
+            file_paths = sorted(
+                os.path.join(file_path, f) for f in os.listdir(file_path)
+                if os.path.isfile(os.path.join(file_path, f))
+            )
         else:
             # 단일 파일인 경우
             file_paths = [file_path]
     else:
-        file_paths = file_path
+        file_paths = list(file_path)
+
+    skipped = [path for path in file_paths if not is_supported(path)]
+    if skipped:
+        print(f"지원하지 않는 형식이라 건너뜀: {[os.path.basename(path) for path in skipped]}")
+    return [path for path in file_paths if is_supported(path)]
+
+REPORT_DB_OPTIONS = {
+    "embedding_model_name": "snunlp/KR-SBERT-V40K-klueNLI-augSTS",
+    "chunk_size": 400,
+    "chunk_overlap": 50,
+}
+
+def ensure_vector_db_exists(db_path: str = "./vector_store/db", file_path: str="./docs"):
+    file_paths = collect_file_paths(file_path)
+
+    # DB가 이미 존재하는지 확인
+    if os.path.exists(db_path) and os.path.isdir(db_path) and len(os.listdir(db_path)) > 0:
+        manifest = IndexManifest(db_path, VectorDatabaseBuilder.index_settings(**REPORT_DB_OPTIONS))
+        if not manifest.exists():
+            # 매니페스트 이전에 만든 DB 는 섹션/문서 유형/날짜 메타데이터가 없으므로 설정 변경과 같이 전체 재구축
+            print(f"'{db_path}'에 매니페스트가 없습니다. 기존 DB를 삭제하고 전체 구축을 진행합니다...")
+            return VectorDatabaseBuilder(db_path=db_path, **REPORT_DB_OPTIONS).build(file_paths)
+
+        # 임베딩 모델 로드 전에 변경 여부부터 확인
+        changed, removed = manifest.diff(file_paths)
+        if not changed and not removed:
+            if manifest.dirty:
+                manifest.save()
+            print(f"벡터 데이터베이스가 '{db_path}'에 이미 존재하며 최신 상태입니다.")
+            return True
+
+        print(f"문서 변경 감지: '{db_path}' 증분 갱신을 진행합니다...")
+        return VectorDatabaseBuilder(db_path=db_path, **REPORT_DB_OPTIONS).sync(file_paths)
+    
+    print("벡터 데이터베이스가 존재하지 않습니다. 새로 구축합니다...")
+
+    # 벡터 DB 빌더 생성
+    builder = VectorDatabaseBuilder(db_path=db_path, **REPORT_DB_OPTIONS)
     
     # 벡터 DB 구축
     return builder.build(file_paths)
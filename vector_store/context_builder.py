@@ -0,0 +1,252 @@
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+'''
+LLM 프롬프트용 컨텍스트 압축
+
+검색된 청크를 그대로 이어 붙이면 chunk_overlap 으로 겹친 구간과 같은 페이지의 인접 청크가 반복되어
+입력 토큰이 불필요하게 늘어납니다.
+- 같은 청크(내용 동일)는 한 번만 사용
+- 같은 파일/페이지의 청크는 문서 순서대로 하나로 합치고, 겹친 구간은 한 번만 남김
+- 토큰 예산(CONTEXT_MAX_TOKENS)을 넘으면 질의와 임베딩 유사도가 낮은 문장부터 제외
+요청마다 압축 전후 토큰 수를 출력합니다.
+'''
+
+DEFAULT_SECTION = "미분류 섹션"
+# 겹친 구간으로 인정할 최소 글자 수 (짧은 우연 일치는 병합하지 않음)
+MIN_OVERLAP_CHARS = 20
+MAX_OVERLAP_CHARS = 400
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model_name: str):
+    """모델별 tiktoken 인코딩 (미설치 또는 인코딩 파일을 내려받을 수 없는 환경이면 None)"""
+    with _encodings_lock:
+        if model_name not in _encodings:
+            try:
+                import tiktoken
+                try:
+                    _encodings[model_name] = tiktoken.encoding_for_model(model_name)
+                except KeyError:
+                    _encodings[model_name] = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"⚠️ tiktoken 인코딩을 사용할 수 없어 글자 수로 토큰을 추정합니다: {e}")
+                _encodings[model_name] = None
+        return _encodings[model_name]
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o-mini") -> int:
+    """
+    OpenAI 모델 기준 토큰 수 (tiktoken 이 없으면 글자 수 기반 근사치)
+
+    Args:
+        text: 텍스트
+        model_name: OpenAI 모델 이름
+
+    Returns:
+        토큰 수
+    """
+    encoding = _get_encoding(model_name)
+    if encoding is None:
+        # 한글은 대략 글자당 1 토큰 내외
+        return len(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model_name: str = "gpt-4o-mini") -> str:
+    """텍스트를 앞에서부터 max_tokens 토큰까지만 자름 (count_tokens 와 같은 기준)"""
+    encoding = _get_encoding(model_name)
+    if encoding is None:
+        return text[:max_tokens]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens]).rstrip("\ufffd")
+
+
+def merge_overlapping(first: str, second: str) -> str:
+    """
+    앞 청크의 끝과 뒤 청크의 시작이 겹치면 겹친 구간을 한 번만 남기고 합침
+
+    Args:
+        first: 앞 텍스트
+        second: 뒤 텍스트
+
+    Returns:
+        합쳐진 텍스트 (겹침이 없으면 줄바꿈으로 연결)
+    """
+    if second in first:
+        return first
+    if first in second:
+        return second
+    for size in range(min(len(first), len(second), MAX_OVERLAP_CHARS), MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return f"{first}\n{second}"
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_SPLIT_PATTERN.split(text) if sentence and sentence.strip()]
+
+
+def _section(metadata: Dict[str, Any]) -> str:
+    if "section" in metadata:
+        return metadata["section"]
+    if "dl_meta" in metadata:
+        return metadata["dl_meta"].get("headings", [DEFAULT_SECTION])[0]
+    return DEFAULT_SECTION
+
+
+def _header(index: int, filename: str, section: str) -> str:
+    return f"[문서 {index}] 출처: {filename}, 섹션: {section}"
+
+
+class ContextBuilder:
+    """검색 청크 → 중복 제거 / 인접 병합 / 토큰 예산 내 문장 선택"""
+
+    def __init__(self, embeddings=None, max_tokens: Optional[int] = None, model_name: str = "gpt-4o-mini"):
+        """
+        Args:
+            embeddings: 문장-질의 유사도 계산용 임베딩 객체 (None 이면 예산 초과 시 뒤쪽 문장부터 제외)
+            max_tokens: 컨텍스트 토큰 예산 (기본값: CONTEXT_MAX_TOKENS 또는 1500)
+            model_name: 토큰 수를 셀 OpenAI 모델 이름
+        """
+        self.embeddings = embeddings
+        self.max_tokens = max_tokens or int(os.getenv("CONTEXT_MAX_TOKENS", "1500"))
+        self.model_name = model_name
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self.model_name)
+
+    def _group_entries(self, docs: List[Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """같은 파일/페이지 청크를 검색 순위가 가장 높은 위치에 모아 문서 순서대로 병합"""
+        groups: Dict[Tuple[str, Any], List[Any]] = {}
+        seen_contents = set()
+        duplicates = 0
+        for doc in docs:
+            content = doc.page_content.strip()
+            if content in seen_contents:
+                duplicates += 1
+                continue
+            seen_contents.add(content)
+            key = (doc.metadata.get("source", "Unknown"), doc.metadata.get("page"))
+            groups.setdefault(key, []).append(doc)
+
+        entries = []
+        merged = duplicates
+        for (source_path, _), group in groups.items():
+            group.sort(key=lambda doc: (doc.metadata.get("doc_index", 0), doc.metadata.get("chunk_index", 0)))
+            text = group[0].page_content.strip()
+            for doc in group[1:]:
+                text = merge_overlapping(text, doc.page_content.strip())
+            merged += len(group) - 1
+            entries.append({
+                "filename": os.path.basename(source_path) if isinstance(source_path, str) else "Unknown",
+                "section": _section(group[0].metadata),
+                "text": text,
+            })
+        return entries, merged
+
+    def _render(self, entries: List[Dict[str, Any]]) -> str:
+        return "\n\n".join(
+            f"{_header(i + 1, entry['filename'], entry['section'])}\n{entry['text']}"
+            for i, entry in enumerate(entries)
+        )
+
+    def _sentence_scores(self, query_vector: Optional[List[float]], sentences: List[Tuple[int, int, str]]) -> np.ndarray:
+        if self.embeddings is None or query_vector is None:
+            # 유사도를 계산할 수 없으면 각 문서의 앞 문장일수록 우선
+            return -np.asarray([sentence_index for _, sentence_index, _ in sentences], dtype=np.float32)
+        vectors = np.asarray(self.embeddings.embed_documents([sentence for _, _, sentence in sentences]), dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+        return vectors @ query / np.where(norms == 0, 1.0, norms)
+
+    def _trim(self, entries: List[Dict[str, Any]], query_vector: Optional[List[float]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        토큰 예산 안에서 질의 유사도가 높은 문장만 남김 (남은 문장은 원래 순서 유지)
+
+        문서 머리글은 문장이 하나라도 남는 문서만 예산에 포함합니다. 유사도 1위 문장은 예산을 넘더라도
+        남은 예산만큼 잘라서 항상 포함하여, 예산이 작아도 LLM 이 문서 없이 답하지 않도록 합니다.
+        """
+        sentences = []  # (entry 번호, 문장 번호, 문장)
+        for entry_index, entry in enumerate(entries):
+            for sentence_index, sentence in enumerate(split_sentences(entry["text"])):
+                sentences.append((entry_index, sentence_index, sentence))
+        if not sentences:
+            return entries, 0
+
+        scores = self._sentence_scores(query_vector, sentences)
+        header_tokens = [self._count(_header(i + 1, e["filename"], e["section"])) for i, e in enumerate(entries)]
+
+        kept: Dict[int, str] = {}
+        used_entries = set()
+        used = 0
+        for position in np.argsort(-scores, kind="stable"):
+            entry_index, _, sentence = sentences[position]
+            cost = self._count(sentence) + (0 if entry_index in used_entries else header_tokens[entry_index])
+            if used + cost > self.max_tokens:
+                if kept:
+                    continue
+                # 1위 문장: 머리글을 뺀 남은 예산만큼 자름 (머리글만으로 예산을 넘으면 문장 전체 유지)
+                remaining = max(self.max_tokens - header_tokens[entry_index], 0)
+                sentence = truncate_tokens(sentence, remaining, self.model_name) if remaining else sentence
+                cost = self._count(sentence) + header_tokens[entry_index]
+            kept[int(position)] = sentence
+            used_entries.add(entry_index)
+            used += cost
+
+        trimmed_entries = []
+        for entry_index, entry in enumerate(entries):
+            kept_sentences = [
+                kept[position] for position, (index, _, _) in enumerate(sentences)
+                if index == entry_index and position in kept
+            ]
+            if kept_sentences:
+                trimmed_entries.append({**entry, "text": " ".join(kept_sentences)})
+        return trimmed_entries, len(sentences) - len(kept)
+
+    def build(self, docs: List[Any], query_vector: Optional[List[float]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        LLM 컨텍스트 구성
+
+        Args:
+            docs: 검색된 문서 리스트 (순위순)
+            query_vector: 질의 임베딩 (문장 선택에 사용)
+
+        Returns:
+            (컨텍스트 문자열, {"original_tokens", "context_tokens", "saved_tokens", "merged_chunks", "dropped_sentences"})
+        """
+        original_tokens = self._count("\n\n".join(
+            f"{_header(i + 1, os.path.basename(str(doc.metadata.get('source', 'Unknown'))), _section(doc.metadata))}\n{doc.page_content}"
+            for i, doc in enumerate(docs)
+        ))
+
+        entries, merged_chunks = self._group_entries(docs)
+        context = self._render(entries)
+        dropped_sentences = 0
+        if self._count(context) > self.max_tokens:
+            entries, dropped_sentences = self._trim(entries, query_vector)
+            context = self._render(entries)
+
+        context_tokens = self._count(context)
+        stats = {
+            "original_tokens": original_tokens,
+            "context_tokens": context_tokens,
+            "saved_tokens": max(original_tokens - context_tokens, 0),
+            "merged_chunks": merged_chunks,
+            "dropped_sentences": dropped_sentences,
+        }
+        print(
+            f"✂️ 컨텍스트 압축: {original_tokens} → {context_tokens} 토큰 "
+            f"({stats['saved_tokens']} 절약, 병합 {merged_chunks}개, 제외 문장 {dropped_sentences}개)"
+        )
+        return context, stats
+
+
+def context_compression_enabled() -> bool:
+    return os.getenv("CONTEXT_COMPRESSION_ENABLED", "true").lower() not in ("0", "false", "no")
@@ -0,0 +1,183 @@
+import os
+import time
+import uuid
+import threading
+from typing import Any, Dict, List, Optional
+
+'''
+벡터 DB 구축용 공통 임베딩 파이프라인
+
+- 토큰 수 기준 배치 구성 (긴 청크가 몰린 배치로 메모리가 튀지 않도록)
+- HuggingFace(SentenceTransformer) 모델은 encode 배치 크기와 torch 스레드 수를 지정해 직접 인코딩
+- 계산된 임베딩을 Chroma 컬렉션에 큰 단위로 upsert
+- 처리량(chunks/sec) 통계 출력
+
+보고서 / 코드 규칙 / 신입사원 벡터 DB 빌더가 함께 사용합니다.
+'''
+
+_torch_threads_lock = threading.Lock()
+_torch_threads_set = False
+
+
+def _configure_torch_threads(num_threads: Optional[int]) -> None:
+    """torch intra-op 스레드 수 설정 (프로세스당 1회)"""
+    global _torch_threads_set
+    if not num_threads or _torch_threads_set:
+        return
+    with _torch_threads_lock:
+        if _torch_threads_set:
+            return
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+            print(f"🧵 torch 스레드 수: {num_threads}")
+        except ImportError:
+            pass
+        _torch_threads_set = True
+
+
+class EmbeddingPipeline:
+    """토큰 기준 배치 임베딩 + Chroma 대량 upsert"""
+
+    def __init__(
+        self,
+        embeddings,
+        max_batch_tokens: Optional[int] = None,
+        encode_batch_size: Optional[int] = None,
+        num_threads: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None
+    ):
+        """
+        Args:
+            embeddings: LangChain 임베딩 객체 (HuggingFaceEmbeddings 또는 OpenAIEmbeddings)
+            max_batch_tokens: 임베딩 배치당 최대 토큰 수 (기본값: EMBED_MAX_BATCH_TOKENS 또는 8192)
+            encode_batch_size: SentenceTransformer.encode 배치 크기 (기본값: EMBED_BATCH_SIZE 또는 64)
+            num_threads: torch 스레드 수 (기본값: EMBED_THREADS 또는 CPU 코어 수)
+            upsert_batch_size: Chroma upsert 1회당 최대 청크 수 (기본값: CHROMA_UPSERT_BATCH 또는 5000)
+        """
+        self.embeddings = embeddings
+        self.max_batch_tokens = max_batch_tokens or int(os.getenv("EMBED_MAX_BATCH_TOKENS", "8192"))
+        self.encode_batch_size = encode_batch_size or int(os.getenv("EMBED_BATCH_SIZE", "64"))
+        self.num_threads = num_threads or int(os.getenv("EMBED_THREADS", str(os.cpu_count() or 1)))
+        self.upsert_batch_size = upsert_batch_size or int(os.getenv("CHROMA_UPSERT_BATCH", "5000"))
+
+        # HuggingFaceEmbeddings 는 SentenceTransformer 를 client 로 가짐
+        self._sentence_model = getattr(embeddings, "client", None) if hasattr(embeddings, "encode_kwargs") else None
+        if self._sentence_model is not None:
+            _configure_torch_threads(self.num_threads)
+
+        self._tokenizer = self._init_tokenizer()
+        self._stats = {"chunks": 0, "tokens": 0, "embed_seconds": 0.0, "upsert_seconds": 0.0, "batches": 0}
+
+    def _init_tokenizer(self):
+        """배치 구성용 토큰 카운터 (모델 토크나이저 → tiktoken → 글자 수 순으로 사용)"""
+        tokenizer = getattr(self._sentence_model, "tokenizer", None)
+        if tokenizer is not None:
+            return lambda text: len(tokenizer.tokenize(text))
+        try:
+            import tiktoken
+            encoding = tiktoken.get_encoding("cl100k_base")
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            return len
+
+    def count_tokens(self, text: str) -> int:
+        return self._tokenizer(text)
+
+    def _token_batches(self, texts: List[str]) -> List[List[int]]:
+        """누적 토큰 수가 max_batch_tokens 를 넘지 않도록 인덱스 배치 구성"""
+        batches, current, current_tokens = [], [], 0
+        for i, text in enumerate(texts):
+            tokens = self.count_tokens(text)
+            self._stats["tokens"] += tokens
+            if current and current_tokens + tokens > self.max_batch_tokens:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if self._sentence_model is None:
+            return self.embeddings.embed_documents(texts)
+
+        encode_kwargs = dict(self.embeddings.encode_kwargs)
+        encode_kwargs.setdefault("batch_size", self.encode_batch_size)
+        encode_kwargs["show_progress_bar"] = False
+        vectors = self._sentence_model.encode(texts, **encode_kwargs)
+        return vectors.tolist()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트 임베딩 (토큰 기준 배치)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            입력 순서와 같은 임베딩 리스트
+        """
+        start = time.perf_counter()
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        for batch in self._token_batches(texts):
+            for i, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[i] = vector
+            self._stats["batches"] += 1
+        self._stats["embed_seconds"] += time.perf_counter() - start
+        return vectors
+
+    def upsert(
+        self,
+        vectordb,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        임베딩 계산 후 Chroma 컬렉션에 대량 upsert
+
+        Args:
+            vectordb: 대상 Chroma 객체
+            texts: 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            ids: 청크 ID 리스트 (None 이면 uuid 생성)
+
+        Returns:
+            저장된 ID 리스트
+        """
+        if not texts:
+            return []
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        vectors = self.embed(texts)
+
+        start = time.perf_counter()
+        collection = vectordb._collection
+        batch_size = min(self.upsert_batch_size, getattr(collection._client, "max_batch_size", self.upsert_batch_size))
+        for i in range(0, len(texts), batch_size):
+            collection.upsert(
+                ids=ids[i:i + batch_size],
+                embeddings=vectors[i:i + batch_size],
+                metadatas=metadatas[i:i + batch_size] if metadatas else None,
+                documents=texts[i:i + batch_size]
+            )
+        self._stats["upsert_seconds"] += time.perf_counter() - start
+        self._stats["chunks"] += len(texts)
+        return ids
+
+    def stats(self) -> Dict[str, Any]:
+        """누적 처리량 통계"""
+        seconds = self._stats["embed_seconds"] + self._stats["upsert_seconds"]
+        return {
+            **self._stats,
+            "chunks_per_sec": self._stats["chunks"] / seconds if seconds else 0.0,
+        }
+
+    def report(self, label: str = "임베딩") -> None:
+        stats = self.stats()
+        print(
+            f"📈 {label}: {stats['chunks']}개 청크, {stats['tokens']} 토큰, "
+            f"임베딩 {stats['embed_seconds']:.1f}초 + 저장 {stats['upsert_seconds']:.1f}초 "
+            f"→ {stats['chunks_per_sec']:.1f} chunks/sec"
+        )
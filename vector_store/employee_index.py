@@ -0,0 +1,195 @@
+import os
+import re
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from vector_store.keyword_index import tokenize
+
+'''
+직원 정보 구조화 색인 (담당자 매칭용)
+
+smartfarm-employee-data-revised.txt 의 각 행을 이름/이메일/부서/직책/담당업무 필드로 파싱하고,
+담당업무·부서 키워드 역색인을 메모리에 만듭니다.
+- 질의에 직원 이름이나 이메일이 있으면 해당 직원
+- 키워드 점수(idf 합) 1위가 EMPLOYEE_MATCH_MIN_SCORE 이상이고 2위보다 EMPLOYEE_MATCH_RATIO 배 이상 높으면 확정
+- 그 외(키워드가 없거나 여러 직원이 비슷하게 맞는 경우)는 모호한 질의로 보고 호출 측이 LLM 으로 판단
+원본 파일이 바뀌면 다음 조회 시 다시 색인합니다.
+'''
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMPLOYEE_DATA_PATH = os.path.join(BASE_DIR, "vector_store", "docs", "employee_info", "smartfarm-employee-data-revised.txt")
+EMPLOYEE_FIELDS = ("name", "email", "department", "position", "duty")
+FIELD_LABELS = {"name": "이름", "email": "이메일", "department": "부서", "position": "직책", "duty": "담당업무"}
+
+# 담당자 질문에 공통으로 등장해 직원을 구분하지 못하는 단어
+QUERY_STOPWORDS = {
+    "담당자", "담당", "담당하", "누구", "문의", "관련", "업무", "분", "사람", "직원", "알리", "묻", "물어보",
+    "연락", "하", "되", "있", "없", "찾", "주", "및",
+}
+EMAIL_ADDRESS_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+def parse_employee_line(line: str) -> Optional[Dict[str, str]]:
+    """
+    직원 정보 한 행 파싱 (이름,이메일,부서,직책,담당업무)
+
+    Returns:
+        필드 딕셔너리 (필드가 부족하거나 헤더 행이면 None)
+    """
+    parts = [part.strip() for part in line.split(",")]
+    if len(parts) < len(EMPLOYEE_FIELDS) or parts[0] == FIELD_LABELS["name"]:
+        return None
+    # 담당업무에 쉼표가 들어간 경우 나머지를 모두 담당업무로 사용
+    values = parts[:4] + [", ".join(parts[4:])]
+    return dict(zip(EMPLOYEE_FIELDS, values))
+
+
+def load_employee_records(path: str = EMPLOYEE_DATA_PATH) -> List[Dict[str, str]]:
+    """직원 정보 텍스트 파일을 필드 딕셔너리 리스트로 로드"""
+    with open(path, mode="r", encoding="utf-8") as file:
+        lines = [line.strip() for line in file if line.strip()]
+    return [record for record in (parse_employee_line(line) for line in lines) if record]
+
+
+def employee_keywords(record: Dict[str, str]) -> List[str]:
+    """담당업무 / 부서에서 뽑은 색인 키워드"""
+    tokens = tokenize(f"{record['duty']} {record['department']}")
+    return sorted({token for token in tokens if token not in QUERY_STOPWORDS})
+
+
+def format_employee(record: Dict[str, str]) -> str:
+    """매칭 결과 / 프롬프트용 직원 정보 문자열"""
+    return "\n".join(f"{FIELD_LABELS[field]}: {record[field]}" for field in EMPLOYEE_FIELDS)
+
+
+def employee_document(record: Dict[str, str]) -> Document:
+    """벡터 DB 저장용 Document (필드와 키워드를 메타데이터로 포함)"""
+    metadata: Dict[str, Any] = dict(record)
+    # Chroma 메타데이터는 스칼라 값만 허용하므로 키워드는 문자열로 저장
+    metadata["keywords"] = ",".join(employee_keywords(record))
+    return Document(page_content=format_employee(record), metadata=metadata)
+
+
+class EmployeeIndex:
+    """직원 필드 / 담당업무 키워드 역색인"""
+
+    def __init__(self, path: str = EMPLOYEE_DATA_PATH, min_score: Optional[float] = None, ratio: Optional[float] = None):
+        """
+        Args:
+            path: 직원 정보 텍스트 파일 경로
+            min_score: 키워드 매칭 확정에 필요한 최소 점수 (기본값: EMPLOYEE_MATCH_MIN_SCORE 또는 2.0)
+            ratio: 1위 점수가 2위보다 높아야 하는 배수 (기본값: EMPLOYEE_MATCH_RATIO 또는 1.5)
+        """
+        self.path = path
+        self.min_score = min_score if min_score is not None else float(os.getenv("EMPLOYEE_MATCH_MIN_SCORE", "2.0"))
+        self.ratio = ratio if ratio is not None else float(os.getenv("EMPLOYEE_MATCH_RATIO", "1.5"))
+
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self.records: List[Dict[str, str]] = []
+        self._by_name: Dict[str, int] = {}
+        self._by_email: Dict[str, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _sync(self) -> None:
+        """원본 파일이 바뀌었으면 다시 색인"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and self._mtime is not None:
+            return
+
+        records = load_employee_records(self.path) if mtime is not None else []
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        for index, record in enumerate(records):
+            for keyword in employee_keywords(record):
+                postings[keyword].add(index)
+
+        self.records = records
+        self._by_name = {record["name"]: index for index, record in enumerate(records)}
+        self._by_email = {record["email"].lower(): index for index, record in enumerate(records)}
+        self._postings = dict(postings)
+        self._mtime = mtime
+        print(f"✅ 직원 정보 색인 완료: {len(records)}명, 키워드 {len(postings)}개")
+
+    def _find_mentioned(self, query: str) -> Optional[int]:
+        for email in EMAIL_ADDRESS_PATTERN.findall(query):
+            if email.lower() in self._by_email:
+                return self._by_email[email.lower()]
+        # 긴 이름부터 확인 (예: "이데이터" 와 "윤빅데이터")
+        for name in sorted(self._by_name, key=len, reverse=True):
+            if name in query:
+                return self._by_name[name]
+        return None
+
+    def score(self, query: str) -> List[Tuple[int, float, List[str]]]:
+        """
+        질의 키워드와 담당업무/부서 키워드의 idf 가중 일치 점수
+
+        Returns:
+            (직원 인덱스, 점수, 일치 키워드) 리스트 (점수 내림차순)
+        """
+        n = len(self.records)
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, List[str]] = defaultdict(list)
+        for token in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings or token in QUERY_STOPWORDS:
+                continue
+            idf = math.log(1 + n / len(postings))
+            for index in postings:
+                scores[index] += idf
+                matched[index].append(token)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(index, score, matched[index]) for index, score in ranked]
+
+    def lookup(self, query: str, k: int = 3) -> Dict[str, Any]:
+        """
+        질의에 해당하는 직원 조회
+
+        Args:
+            query: 사용자 질의
+            k: 모호한 경우 반환할 후보 수
+
+        Returns:
+            {"match": 확정된 직원 또는 None, "method": "name" | "keyword" | None,
+             "keywords": 일치 키워드, "candidates": 키워드 점수 상위 직원 리스트}
+        """
+        with self._lock:
+            self._sync()
+            mentioned = self._find_mentioned(query)
+            if mentioned is not None:
+                record = self.records[mentioned]
+                return {"match": record, "method": "name", "keywords": [], "candidates": [record]}
+
+            ranked = self.score(query)
+            candidates = [self.records[index] for index, _, _ in ranked[:k]]
+            if ranked:
+                top_index, top_score, keywords = ranked[0]
+                second_score = ranked[1][1] if len(ranked) > 1 else 0.0
+                if top_score >= self.min_score and top_score >= second_score * self.ratio:
+                    return {"match": self.records[top_index], "method": "keyword", "keywords": keywords, "candidates": candidates}
+            return {"match": None, "method": None, "keywords": [], "candidates": candidates}
+
+
+_index: Optional[EmployeeIndex] = None
+_index_lock = threading.Lock()
+
+
+def local_matching_enabled() -> bool:
+    return os.getenv("EMPLOYEE_LOCAL_MATCH", "true").lower() not in ("0", "false", "no")
+
+
+def get_employee_index() -> EmployeeIndex:
+    """프로세스 공유 직원 색인 반환"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EmployeeIndex()
+    return _index
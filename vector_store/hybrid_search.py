@@ -0,0 +1,106 @@
+import os
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from vector_store.keyword_index import KeywordIndex
+from vector_store.retrieval import filtered_search, afiltered_search, matches_filters
+
+'''
+벡터 검색 + BM25 키워드 검색 하이브리드 검색 (Reciprocal Rank Fusion)
+
+두 검색에서 각각 fetch_k 개의 후보를 가져온 뒤 순위 기반으로 합쳐 상위 k 개를 반환합니다.
+메타데이터 필터는 벡터 검색에는 Chroma where 절로, 키워드 검색에는 후보 조건으로 적용합니다.
+점수 척도가 다른 두 검색을 정규화 없이 합칠 수 있고, 양쪽에서 모두 상위인 청크가 우선됩니다.
+'''
+
+RRF_K = 60
+
+
+def _document_key(doc: Document) -> Tuple[str, str]:
+    # chunk_id 는 예전에 구축한 DB 에서 파일 간 중복될 수 있으므로 (출처, 내용) 으로 식별
+    return doc.metadata.get("source", ""), doc.page_content
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Document]], k: Optional[int] = None, rrf_k: int = RRF_K) -> List[Document]:
+    """
+    여러 순위 리스트를 RRF 점수(Σ 1 / (rrf_k + rank))로 합침
+
+    Args:
+        result_lists: 검색 결과 문서 리스트들 (각각 순위순)
+        k: 반환할 최대 문서 수 (None 이면 전체)
+        rrf_k: RRF 상수
+
+    Returns:
+        합쳐진 순위의 문서 리스트
+    """
+    scores: Dict[Tuple[str, str], float] = {}
+    documents: Dict[Tuple[str, str], Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = _document_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            documents.setdefault(key, doc)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked[:k]]
+
+
+def _predicate(filters: Optional[Dict[str, Any]]):
+    return (lambda metadata: matches_filters(metadata, filters)) if filters else None
+
+
+def _fetch_k(k: int) -> int:
+    return max(int(os.getenv("HYBRID_FETCH_K", "10")), k)
+
+
+def hybrid_search(
+    vectordb,
+    keyword_index: Optional[KeywordIndex],
+    query: str,
+    query_vector: List[float],
+    k: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """
+    벡터 + 키워드 하이브리드 검색 (keyword_index 가 None 이면 벡터 검색만)
+
+    Args:
+        vectordb: Chroma 객체
+        keyword_index: BM25 키워드 색인
+        query: 질의
+        query_vector: 질의 임베딩
+        k: 반환할 문서 수
+        filters: 메타데이터 필터 (vector_store.retrieval.extract_filters 형식)
+
+    Returns:
+        문서 리스트
+    """
+    if keyword_index is None:
+        return filtered_search(vectordb, query_vector, k, filters)
+
+    fetch_k = _fetch_k(k)
+    vector_docs = filtered_search(vectordb, query_vector, fetch_k, filters)
+    keyword_docs = [doc for doc, _ in keyword_index.search(query, fetch_k, _predicate(filters))]
+    return reciprocal_rank_fusion([vector_docs, keyword_docs], k=k)
+
+
+async def ahybrid_search(
+    vectordb,
+    keyword_index: Optional[KeywordIndex],
+    query: str,
+    query_vector: List[float],
+    k: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """hybrid_search 의 비동기 버전 (벡터 검색과 키워드 검색을 동시에 실행)"""
+    if keyword_index is None:
+        return await afiltered_search(vectordb, query_vector, k, filters)
+
+    fetch_k = _fetch_k(k)
+    vector_docs, keyword_results = await asyncio.gather(
+        afiltered_search(vectordb, query_vector, fetch_k, filters),
+        asyncio.to_thread(keyword_index.search, query, fetch_k, _predicate(filters))
+    )
+    return reciprocal_rank_fusion([vector_docs, [doc for doc, _ in keyword_results]], k=k)
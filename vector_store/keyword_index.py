@@ -0,0 +1,231 @@
+import os
+import re
+import json
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+'''
+보고서 청크용 로컬 BM25 역색인
+
+벡터 DB(Chroma)에 저장된 것과 같은 청크를 형태소(kiwipiepy) 또는 글자 n-gram 으로 토큰화하여
+키워드 검색을 제공합니다. "TTAK.KO-10.1347", "제12조" 같은 식별자는 그대로 하나의 토큰으로 유지하여
+임베딩 검색이 놓치는 정확한 표기 일치를 잡아냅니다.
+- 토큰화 결과는 DB 디렉토리의 keyword_index/tokens.json 에 저장하고, 새로 추가된 청크만 토큰화
+- 컬렉션 청크 수가 바뀌거나 invalidate_keyword_index 가 호출되면 다음 검색 시 다시 동기화
+'''
+
+# 영문/숫자 식별자 (예: TTAK.KO-10.1347, ISO-11783, v1.2)
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z0-9]+(?:[.\-_/][A-Za-z0-9]+)+")
+# 법령 조항 (예: 제12조, 제3조의2, 제 5 항)
+ARTICLE_PATTERN = re.compile(r"제\s*\d+\s*[조항호](?:\s*의\s*\d+)?")
+WORD_PATTERN = re.compile(r"[가-힣]+|[A-Za-z]+|\d+")
+# 색인에 사용할 형태소 품사 (명사, 어근, 외국어, 숫자, 한자, 용언 어간)
+KIWI_TAGS = ("NNG", "NNP", "NR", "XR", "SL", "SN", "SH", "VV", "VA")
+
+_kiwi = None
+_kiwi_lock = threading.Lock()
+_kiwi_unavailable = False
+
+
+def _get_kiwi():
+    """kiwipiepy 형태소 분석기 (설치되어 있지 않으면 None → n-gram 토큰화 사용)"""
+    global _kiwi, _kiwi_unavailable
+    if _kiwi is not None or _kiwi_unavailable:
+        return _kiwi
+    with _kiwi_lock:
+        if _kiwi is None and not _kiwi_unavailable:
+            try:
+                from kiwipiepy import Kiwi
+                _kiwi = Kiwi()
+            except ImportError:
+                _kiwi_unavailable = True
+                print("⚠️ kiwipiepy 가 없어 글자 bigram 으로 키워드 색인을 만듭니다.")
+    return _kiwi
+
+
+def _identifier_tokens(text: str) -> List[str]:
+    tokens = [match.lower() for match in IDENTIFIER_PATTERN.findall(text)]
+    tokens += [re.sub(r"\s+", "", match) for match in ARTICLE_PATTERN.findall(text)]
+    return tokens
+
+
+def _ngram_tokens(text: str) -> List[str]:
+    """형태소 분석기가 없을 때: 영문/숫자 단어 + 한글 bigram"""
+    tokens = []
+    for word in WORD_PATTERN.findall(text):
+        if word[0] >= "가" and len(word) > 1:
+            tokens += [word[i:i + 2] for i in range(len(word) - 1)]
+        else:
+            tokens.append(word.lower())
+    return tokens
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25 색인/질의용 토큰화
+
+    Args:
+        text: 원문
+
+    Returns:
+        토큰 리스트 (식별자 토큰 + 형태소 또는 bigram 토큰)
+    """
+    kiwi = _get_kiwi()
+    if kiwi is None:
+        return _identifier_tokens(text) + _ngram_tokens(text)
+    morphemes = [token.form.lower() for token in kiwi.tokenize(text) if token.tag in KIWI_TAGS]
+    return _identifier_tokens(text) + morphemes
+
+
+class KeywordIndex:
+    """청크 ID 기준 BM25 역색인"""
+
+    def __init__(self, vectordb, db_path: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            vectordb: 같은 청크를 가진 Chroma 객체
+            db_path: 벡터 DB 경로 (토큰 캐시 저장 위치)
+            k1, b: BM25 파라미터
+        """
+        self.vectordb = vectordb
+        self.cache_path = os.path.join(db_path, "keyword_index", "tokens.json")
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._stale = True
+        self._synced_count = -1
+        self._documents: List[Document] = []
+        self._doc_lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._avg_length = 0.0
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def _load_token_cache(self) -> Dict[str, List[str]]:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 키워드 색인 캐시 로드 실패: {e}")
+            return {}
+
+    def _save_token_cache(self, token_cache: Dict[str, List[str]]) -> None:
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(token_cache, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def _sync(self) -> None:
+        """컬렉션 청크와 역색인 동기화 (새 청크만 토큰화)"""
+        count = self.vectordb._collection.count()
+        if not self._stale and count == self._synced_count:
+            return
+
+        data = self.vectordb.get(include=["documents", "metadatas"])
+        token_cache = self._load_token_cache()
+        new_tokens = 0
+
+        documents, doc_lengths = [], []
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        tokens_by_id = {}
+        for chunk_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+            tokens = token_cache.get(chunk_id)
+            if tokens is None:
+                tokens = tokenize(text or "")
+                new_tokens += 1
+            tokens_by_id[chunk_id] = tokens
+
+            index = len(documents)
+            documents.append(Document(page_content=text or "", metadata={**(metadata or {}), "chunk_id": chunk_id}))
+            doc_lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                postings[token].append((index, tf))
+
+        if new_tokens or len(tokens_by_id) != len(token_cache):
+            self._save_token_cache(tokens_by_id)
+
+        self._documents = documents
+        self._doc_lengths = doc_lengths
+        self._postings = dict(postings)
+        self._avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        self._synced_count = count
+        self._stale = False
+        print(f"✅ 키워드 색인 동기화: {len(documents)}개 청크 (새로 토큰화 {new_tokens}개)")
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        BM25 검색
+
+        Args:
+            query: 질의
+            k: 반환할 최대 문서 수
+            predicate: 메타데이터 조건 (False 인 문서는 제외)
+
+        Returns:
+            (문서, 점수) 리스트 (점수 내림차순)
+        """
+        with self._lock:
+            self._sync()
+            if not self._documents:
+                return []
+
+            n = len(self._documents)
+            scores: Dict[int, float] = defaultdict(float)
+            for token in set(tokenize(query)):
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for index, tf in postings:
+                    norm = 1 - self.b + self.b * self._doc_lengths[index] / (self._avg_length or 1.0)
+                    scores[index] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+            if predicate is not None:
+                scores = {index: score for index, score in scores.items() if predicate(self._documents[index].metadata)}
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self._documents[index], score) for index, score in ranked]
+
+
+# 벡터 DB 경로별 공유 키워드 색인
+_indexes: Dict[str, KeywordIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def hybrid_search_enabled() -> bool:
+    return os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def get_keyword_index(vectordb, db_path: str) -> KeywordIndex:
+    """벡터 DB 경로에 해당하는 공유 키워드 색인 반환"""
+    key = os.path.abspath(db_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.vectordb is not vectordb:
+            index = KeywordIndex(vectordb, db_path)
+            _indexes[key] = index
+        return index
+
+
+def invalidate_keyword_index(db_path: Optional[str] = None) -> None:
+    """db_path 의 키워드 색인(없으면 전체)을 다음 검색 시 다시 동기화하도록 표시"""
+    with _indexes_lock:
+        indexes = [
+            index for path, index in _indexes.items()
+            if db_path is None or path == os.path.abspath(db_path)
+        ]
+    for index in indexes:
+        index.invalidate()
@@ -0,0 +1,409 @@
+import os
+import re
+import zlib
+import struct
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+'''
+확장자별 문서 로더 레지스트리
+
+각 로더는 파일 경로를 받아 섹션(제목) 경계에 맞춘 Document 를 하나씩 생성하며,
+metadata["section"] 에 "1. 개요 > 1.1 목적" 형태의 섹션 경로를 기록합니다.
+새 형식은 @register_loader(".ext") 로 등록합니다.
+- PDF: 목차(outline) 제목과 글자 크기로 제목 줄 판별, 페이지 안에서도 섹션이 바뀌면 분리
+- DOCX: 제목 스타일(Heading N / 제목 N) 및 마크다운(#) 제목, 본문 문단/표는 문서 순서대로
+- HWP: HWP 5.0 BodyText 섹션 단위 (olefile)
+- TXT / MD: 마크다운(#) 제목, 빈 줄 기준 문단
+'''
+
+DocumentLoader = Callable[[str], Iterator[Document]]
+
+# 문단 묶음 하나의 최대 글자 수 (이후 text_splitter 가 다시 청크로 분할)
+BLOCK_MAX_CHARS = 2000
+
+_LOADERS: Dict[str, DocumentLoader] = {}
+
+
+def register_loader(*extensions: str) -> Callable[[DocumentLoader], DocumentLoader]:
+    """확장자에 로더 등록 (데코레이터)"""
+    def decorator(loader: DocumentLoader) -> DocumentLoader:
+        for extension in extensions:
+            _LOADERS[extension.lower()] = loader
+        return loader
+    return decorator
+
+
+def get_loader(file_path: str) -> Optional[DocumentLoader]:
+    return _LOADERS.get(os.path.splitext(file_path)[1].lower())
+
+
+def is_supported(file_path: str) -> bool:
+    return get_loader(file_path) is not None
+
+
+def supported_extensions() -> List[str]:
+    return sorted(_LOADERS)
+
+
+def load_file_documents(file_path: str) -> Iterator[Document]:
+    """
+    확장자에 맞는 로더로 문서를 하나씩 생성 (전체 내용을 한 번에 메모리에 올리지 않음)
+
+    Args:
+        file_path: 문서 파일 경로
+
+    Returns:
+        Document generator (metadata: source, page)
+    """
+    loader = get_loader(file_path)
+    if loader is None:
+        raise ValueError(f"지원하지 않는 문서 형식입니다: {file_path} (지원: {', '.join(supported_extensions())})")
+    return loader(file_path)
+
+
+DEFAULT_SECTION = "미분류 섹션"
+MARKDOWN_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+# "제1장", "제 2 절", "1.", "1.2", "1.2.3 " 형태의 번호 제목
+NUMBERED_HEADING_PATTERN = re.compile(r"^(제\s*\d+\s*[장절편]|\d+(\.\d+)*\.?)\s+\S")
+HEADING_MAX_CHARS = 80
+FONT_HEADING_MAX_CHARS = 40  # 목차 없이 글자 크기로만 판별할 때
+# 제목으로 볼 수 있는 줄: 한글/영문 2글자 이상 포함, 글머리표·괄호·수식으로 시작하지 않음
+HEADING_TEXT_PATTERN = re.compile(r"[가-힣A-Za-z]{2}")
+NON_HEADING_PREFIXES = ("-", "(", "※", "·", "•", "*", "=", "×", "<", "[")
+# 문장으로 끝나는 줄(…함, …나타남, …다.)은 강조된 본문으로 간주
+SENTENCE_END_PATTERN = re.compile(r"((함|남|음|됨|임|다|요)[.)]?|[.,:;」’])$")
+# "- 3 -", "3" 형태의 쪽 번호 줄 (머리글/바닥글 영역에 있을 때만 제외, 본문 표의 숫자 셀은 유지)
+PAGE_NUMBER_PATTERN = re.compile(r"^[-–\s]*\d+[-–\s]*$")
+# 페이지 위/아래에서 머리글·바닥글로 보는 영역 (페이지 높이 대비 비율)
+PAGE_MARGIN_RATIO = 0.08
+
+# (문단 텍스트, 제목 수준 또는 None)
+Paragraph = Tuple[str, Optional[int]]
+
+
+class SectionTracker:
+    """제목 수준별 스택으로 현재 섹션 경로 관리"""
+
+    def __init__(self):
+        self.stack: List[Tuple[int, str]] = []
+
+    def push(self, level: int, title: str) -> None:
+        while self.stack and self.stack[-1][0] >= level:
+            self.stack.pop()
+        self.stack.append((level, title))
+
+    @property
+    def path(self) -> str:
+        return " > ".join(title for _, title in self.stack) or DEFAULT_SECTION
+
+
+def markdown_heading_level(text: str) -> Tuple[Optional[int], str]:
+    """마크다운 제목이면 (수준, 제목), 아니면 (None, 원문)"""
+    match = MARKDOWN_HEADING_PATTERN.match(text)
+    if match:
+        return len(match.group(1)), match.group(2).strip()
+    return None, text
+
+
+def numbered_heading_level(text: str) -> Optional[int]:
+    """번호 제목의 수준 추정 ("1." → 1, "1.2" → 2, "제1장" → 1)"""
+    match = NUMBERED_HEADING_PATTERN.match(text)
+    if not match:
+        return None
+    number = match.group(1)
+    if number.startswith("제"):
+        return 1
+    return number.rstrip(".").count(".") + 1
+
+
+def _group_sections(file_path: str, paragraphs: Iterator[Paragraph], page: Optional[int] = None) -> Iterator[Document]:
+    """
+    문단을 섹션 경계와 BLOCK_MAX_CHARS 기준으로 묶어 Document 생성
+
+    Args:
+        file_path: 원본 파일 경로
+        paragraphs: (문단 텍스트, 제목 수준) iterable
+        page: 고정 페이지 번호 (None 이면 묶음 순번)
+    """
+    tracker = SectionTracker()
+    block: List[str] = []
+    length = 0
+    index = 0
+    has_body = False
+
+    def make_document() -> Document:
+        return Document(
+            page_content="\n".join(block),
+            metadata={"source": file_path, "page": index if page is None else page, "section": tracker.path}
+        )
+
+    for text, level in paragraphs:
+        if level is not None:
+            # 새 섹션 시작: 이전 섹션 본문을 먼저 내보냄 (제목만 연속된 경우는 합침)
+            if has_body:
+                yield make_document()
+                block, length, has_body = [], 0, False
+                index += 1
+            tracker.push(level, text)
+        else:
+            if block and length + len(text) > BLOCK_MAX_CHARS:
+                yield make_document()
+                block, length = [], 0
+                index += 1
+            has_body = True
+        block.append(text)
+        length += len(text) + 1
+    if block:
+        yield make_document()
+
+
+def _normalize_title(text: str) -> str:
+    return re.sub(r"\s+", "", text).lower()
+
+
+@register_loader(".pdf")
+def load_pdf(file_path: str) -> Iterator[Document]:
+    """
+    PDF 페이지를 섹션 단위 Document 로 생성
+    목차(outline)에 있는 제목 또는 본문보다 큰 글자의 짧은 줄을 제목으로 판별
+    """
+    import fitz
+
+    with fitz.open(file_path) as pdf:
+        # 목차 제목 → 수준
+        toc_levels = {_normalize_title(title): level for level, title, _ in pdf.get_toc() if title.strip()}
+        tracker = SectionTracker()
+        # 이전 페이지의 제목 후보 (매 페이지 반복되는 머리글은 제목으로 보지 않고 제외)
+        previous_headings: set = set()
+
+        for page_number, page in enumerate(pdf):
+            lines = _pdf_lines(page)
+            if not lines:
+                continue
+
+            # 페이지 본문 글자 크기 = 글자 수 기준 최빈값
+            sizes = Counter()
+            for text, size in lines:
+                sizes[size] += len(text)
+            body_size = sizes.most_common(1)[0][0]
+
+            block: List[str] = []
+            has_body = False
+            page_headings = set()
+            for text, size in lines:
+                level = _pdf_heading_level(text, size, body_size, toc_levels)
+                if level is not None:
+                    page_headings.add(text)
+                    if text in previous_headings:
+                        continue
+                    # 이전 섹션 본문을 먼저 내보냄 (제목만 연속된 경우는 합침)
+                    if has_body:
+                        yield Document(
+                            page_content="\n".join(block),
+                            metadata={"source": file_path, "page": page_number, "section": tracker.path}
+                        )
+                        block, has_body = [], False
+                    tracker.push(level, text)
+                else:
+                    has_body = True
+                block.append(text)
+            previous_headings = page_headings
+            if block:
+                yield Document(
+                    page_content="\n".join(block),
+                    metadata={"source": file_path, "page": page_number, "section": tracker.path}
+                )
+
+
+def _is_page_number(text: str, bbox: Tuple[float, float, float, float], page_height: float) -> bool:
+    """숫자만 있는 줄이 페이지 위/아래 PAGE_MARGIN_RATIO 영역 안에 있으면 쪽 번호"""
+    if not PAGE_NUMBER_PATTERN.match(text) or page_height <= 0:
+        return False
+    margin = page_height * PAGE_MARGIN_RATIO
+    return bbox[3] <= margin or bbox[1] >= page_height - margin
+
+
+def _pdf_lines(page) -> List[Tuple[str, float]]:
+    """페이지의 줄 단위 (텍스트, 최대 글자 크기)"""
+    lines = []
+    page_height = page.rect.height
+    for block in page.get_text("dict").get("blocks", []):
+        for line in block.get("lines", []):
+            spans = [span for span in line.get("spans", []) if span.get("text", "").strip()]
+            if not spans:
+                continue
+            text = "".join(span["text"] for span in spans).strip()
+            if _is_page_number(text, line["bbox"], page_height):
+                continue
+            lines.append((text, round(max(span["size"] for span in spans), 1)))
+    return lines
+
+
+def _pdf_heading_level(text: str, size: float, body_size: float, toc_levels: Dict[str, int]) -> Optional[int]:
+    """PDF 줄의 제목 수준 (목차 일치 → 목차 수준, 큰 글자 → 번호/크기로 추정)"""
+    if len(text) > HEADING_MAX_CHARS:
+        return None
+    toc_level = toc_levels.get(_normalize_title(text))
+    if toc_level is not None:
+        return toc_level
+    if (
+        size >= body_size * 1.15
+        and len(text) <= FONT_HEADING_MAX_CHARS
+        and HEADING_TEXT_PATTERN.search(text)
+        and not text.startswith(NON_HEADING_PREFIXES)
+        and not SENTENCE_END_PATTERN.search(text)
+    ):
+        return numbered_heading_level(text) or (1 if size >= body_size * 1.5 else 2)
+    return None
+
+
+@register_loader(".docx")
+def load_docx(file_path: str) -> Iterator[Document]:
+    return _group_sections(file_path, _iter_docx_paragraphs(file_path))
+
+
+def _docx_heading_level(paragraph) -> Optional[int]:
+    """문단 스타일(Title / Heading N / 제목 N)로 제목 수준 판별"""
+    style_name = (paragraph.style.name if paragraph.style is not None else "") or ""
+    if style_name in ("Title", "제목"):
+        return 1
+    match = re.match(r"^(Heading|제목)\s*(\d+)$", style_name)
+    return int(match.group(2)) if match else None
+
+
+def _iter_docx_paragraphs(file_path: str) -> Iterator[Paragraph]:
+    """DOCX 본문의 문단과 표를 문서 순서대로 생성 (표는 행 단위 'a | b | c')"""
+    import docx
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = docx.Document(file_path)
+    for element in document.element.body.iterchildren():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            paragraph = Paragraph(element, document)
+            text = paragraph.text.strip()
+            if not text:
+                continue
+            level = _docx_heading_level(paragraph)
+            if level is None:
+                level, text = markdown_heading_level(text)
+            yield text, level
+        elif tag == "tbl":
+            for row in Table(element, document).rows:
+                cells = []
+                for cell in row.cells:
+                    text = cell.text.strip()
+                    # 병합 셀은 같은 텍스트가 반복되므로 한 번만 사용
+                    if text and (not cells or cells[-1] != text):
+                        cells.append(text)
+                if cells:
+                    yield " | ".join(cells), None
+
+
+@register_loader(".txt", ".md")
+def load_text(file_path: str) -> Iterator[Document]:
+    return _group_sections(file_path, _iter_text_paragraphs(file_path))
+
+
+def _read_text(file_path: str) -> str:
+    """텍스트 파일 전체를 디코딩 (UTF-8 실패 시 CP949)"""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    for encoding in ("utf-8", "cp949"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"텍스트 인코딩을 확인할 수 없습니다: {file_path}")
+
+
+def _iter_text_paragraphs(file_path: str) -> Iterator[Paragraph]:
+    """빈 줄 기준 문단 생성, 마크다운 제목 줄은 별도 문단"""
+    # 인코딩을 먼저 확정해야 일부 문단을 내보낸 뒤 다른 인코딩으로 다시 읽어 중복되는 일이 없음
+    paragraph: List[str] = []
+    for line in _read_text(file_path).splitlines():
+        line = line.strip()
+        level, title = markdown_heading_level(line)
+        if line and level is None:
+            paragraph.append(line)
+            continue
+        if paragraph:
+            yield "\n".join(paragraph), None
+            paragraph = []
+        if level is not None:
+            yield title, level
+    if paragraph:
+        yield "\n".join(paragraph), None
+
+
+# HWP 5.0 레코드 태그 / 제어 문자
+HWPTAG_PARA_TEXT = 67
+HWP_SINGLE_CHAR_CONTROLS = {0, 10, 13} | set(range(24, 32))
+
+
+@register_loader(".hwp")
+def load_hwp(file_path: str) -> Iterator[Document]:
+    """HWP 5.0 (OLE 복합 문서) BodyText 섹션별 문단 텍스트 추출"""
+    import olefile
+
+    with olefile.OleFileIO(file_path) as ole:
+        header = ole.openstream("FileHeader").read()
+        if header[36] & 0x02:
+            raise ValueError(f"암호화된 HWP 문서는 지원하지 않습니다: {file_path}")
+        compressed = bool(header[36] & 0x01)
+
+        sections = sorted(
+            (entry for entry in ole.listdir() if entry[0] == "BodyText" and entry[1].startswith("Section")),
+            key=lambda entry: int(entry[1][len("Section"):])
+        )
+        for index, entry in enumerate(sections):
+            data = ole.openstream(entry).read()
+            if compressed:
+                data = zlib.decompress(data, -15)
+            # HWP 는 스타일 정보 대신 번호 제목("1.", "제1장")으로 섹션 구분
+            paragraphs = (
+                (text, numbered_heading_level(text) if len(text) <= HEADING_MAX_CHARS else None)
+                for text in _iter_hwp_paragraphs(data)
+            )
+            yield from _group_sections(file_path, paragraphs, page=index)
+
+
+def _iter_hwp_paragraphs(data: bytes) -> Iterator[str]:
+    """BodyText 섹션 레코드에서 문단 텍스트(HWPTAG_PARA_TEXT) 추출"""
+    offset = 0
+    while offset + 4 <= len(data):
+        header = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        tag, size = header & 0x3FF, (header >> 20) & 0xFFF
+        if size == 0xFFF:
+            size = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+        if tag == HWPTAG_PARA_TEXT:
+            text = _decode_hwp_text(data[offset:offset + size]).strip()
+            if text:
+                yield text
+        offset += size
+
+
+def _decode_hwp_text(payload: bytes) -> str:
+    """UTF-16LE 문단 텍스트에서 인라인/확장 제어 문자(8 WCHAR) 제거"""
+    text = bytearray()
+    i = 0
+    length = len(payload) // 2
+    while i < length:
+        code = struct.unpack_from("<H", payload, i * 2)[0]
+        if code < 32:
+            if code in HWP_SINGLE_CHAR_CONTROLS:
+                if code in (10, 13):
+                    text += "\n".encode("utf-16le")
+                i += 1
+            else:
+                i += 8
+            continue
+        text += payload[i * 2:i * 2 + 2]
+        i += 1
+    return re.sub(r"\n{2,}", "\n", text.decode("utf-16le", errors="ignore"))
@@ -0,0 +1,145 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+'''
+벡터 DB 증분 갱신용 매니페스트
+
+문서 파일마다 (경로, 크기, 수정 시각, SHA-256) 와 해당 파일에서 생성된 청크 ID 목록을
+DB 디렉토리의 index_manifest.json 에 기록합니다.
+재구축 시 새로 추가되거나 내용이 바뀐 파일만 다시 임베딩하고, 삭제된 파일의 청크는 제거합니다.
+'''
+
+MANIFEST_FILENAME = "index_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """파일 내용 SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_chunk_id(sha256: str, chunk_key: str, file_path: str = "") -> str:
+    """
+    파일 내용 해시 기반의 안정적인 청크 ID (경로와 내용이 같으면 항상 같은 ID)
+    내용이 같은 파일이 여러 경로에 있어도 ID 가 겹치지 않도록 경로를 함께 해시
+    """
+    prefix = hashlib.sha256(f"{os.path.normpath(file_path)}:{sha256}".encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}_{chunk_key}"
+
+
+class IndexManifest:
+    """index_manifest.json 읽기/쓰기 및 변경 파일 계산"""
+
+    def __init__(self, db_path: str, settings: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            db_path: 벡터 DB 경로
+            settings: 인덱스 설정 (임베딩 모델, 청크 크기 등). 기록된 값과 다르면 모든 파일을 변경된 것으로 간주
+        """
+        self.db_path = db_path
+        self.path = os.path.join(db_path, MANIFEST_FILENAME)
+        self.settings = settings or {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.stored_settings: Dict[str, Any] = {}
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def key(file_path: str) -> str:
+        return os.path.normpath(file_path)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> None:
+        if not self.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.stored_settings = data.get("settings", {})
+        except Exception as e:
+            print(f"⚠️ 매니페스트 로드 실패, 전체 파일을 새로 색인합니다: {e}")
+            self.files = {}
+            self.stored_settings = {}
+
+    def save(self) -> None:
+        os.makedirs(self.db_path, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "settings": self.settings, "files": self.files},
+                f,
+                ensure_ascii=False,
+                indent=2
+            )
+        os.replace(tmp_path, self.path)
+        self.stored_settings = dict(self.settings)
+        self.dirty = False
+
+    @property
+    def settings_changed(self) -> bool:
+        """기록된 인덱스 설정과 현재 설정이 다른지 (다르면 모든 파일을 다시 임베딩)"""
+        return self.stored_settings != self.settings
+
+    def fingerprint(self, file_path: str) -> Dict[str, Any]:
+        """
+        파일 지문 계산 (크기와 수정 시각이 기록과 같으면 해시 재계산 생략)
+
+        Returns:
+            {"size", "mtime", "sha256"}
+        """
+        stat = os.stat(file_path)
+        previous = self.files.get(self.key(file_path))
+        if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            sha256 = previous["sha256"]
+        else:
+            sha256 = file_sha256(file_path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+
+    def diff(self, file_paths: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        기록된 매니페스트와 현재 파일 목록 비교
+
+        Args:
+            file_paths: 현재 색인 대상 파일 경로 목록
+
+        Returns:
+            (새로 추가/변경된 파일 경로 → 지문, 삭제된 파일 키 목록)
+        """
+        settings_changed = self.settings_changed
+        changed: Dict[str, Dict[str, Any]] = {}
+        current_keys = set()
+
+        for file_path in file_paths:
+            key = self.key(file_path)
+            current_keys.add(key)
+            fingerprint = self.fingerprint(file_path)
+            previous = self.files.get(key)
+            if settings_changed or not previous or previous["sha256"] != fingerprint["sha256"]:
+                changed[file_path] = fingerprint
+            elif previous["mtime"] != fingerprint["mtime"]:
+                # 내용은 같고 수정 시각만 바뀐 경우 기록만 갱신
+                previous["mtime"] = fingerprint["mtime"]
+                self.dirty = True
+
+        removed = [key for key in self.files if key not in current_keys]
+        return changed, removed
+
+    def chunk_ids(self, key: str) -> List[str]:
+        return self.files.get(key, {}).get("chunk_ids", [])
+
+    def record(self, file_path: str, fingerprint: Dict[str, Any], chunk_ids: List[str]) -> None:
+        self.files[self.key(file_path)] = {**fingerprint, "chunk_ids": chunk_ids}
+        self.dirty = True
+
+    def remove(self, key: str) -> None:
+        self.files.pop(key, None)
+        self.dirty = True
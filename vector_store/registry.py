@@ -0,0 +1,131 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_community.vectorstores import Chroma
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_openai import OpenAIEmbeddings
+
+'''
+프로세스 전역 임베딩 모델 / 벡터 스토어 레지스트리
+
+에이전트마다 같은 임베딩 모델(KR-SBERT)과 같은 Chroma 디렉토리를 따로 로드하지 않도록
+(모델, 경로) 쌍마다 하나의 인스턴스만 만들어 공유합니다.
+'''
+
+DEFAULT_EMBEDDING_MODEL = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"  # OpenAIEmbeddings 기본 모델
+
+_lock = threading.RLock()
+_embeddings: Dict[Tuple[str, str], Any] = {}
+_vectorstores: Dict[Tuple[str, str, str], Chroma] = {}
+
+
+def _create_embeddings(provider: str, model_name: str):
+    """provider 에 맞는 임베딩 객체 생성"""
+    if provider == "huggingface":
+        embeddings = HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs={"device": "cpu"},
+            encode_kwargs={"normalize_embeddings": True}
+        )
+    elif provider == "openai":
+        embeddings = OpenAIEmbeddings(model=model_name)
+    else:
+        raise ValueError(f"지원하지 않는 임베딩 provider 입니다: {provider}")
+
+    print(f"✅ 임베딩 모델 '{model_name}' ({provider}) 로드 완료")
+    return embeddings
+
+
+def get_embeddings(model_name: str = DEFAULT_EMBEDDING_MODEL, provider: str = "huggingface"):
+    """
+    공유 임베딩 모델 반환 (최초 호출 시 1회만 로드)
+
+    Args:
+        model_name: 임베딩 모델 이름
+        provider: "huggingface" 또는 "openai"
+
+    Returns:
+        임베딩 객체
+    """
+    key = (provider, model_name)
+    embeddings = _embeddings.get(key)
+    if embeddings is not None:
+        return embeddings
+
+    with _lock:
+        if key not in _embeddings:
+            _embeddings[key] = _create_embeddings(provider, model_name)
+        return _embeddings[key]
+
+
+def get_openai_embeddings(model_name: str = OPENAI_EMBEDDING_MODEL):
+    """공유 OpenAI 임베딩 클라이언트 반환"""
+    return get_embeddings(model_name=model_name, provider="openai")
+
+
+def get_vectorstore(
+    persist_directory: str,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    provider: str = "huggingface"
+) -> Chroma:
+    """
+    (임베딩 모델, 경로) 쌍마다 하나의 Chroma 핸들을 반환
+
+    Args:
+        persist_directory: Chroma 저장 경로
+        model_name: 임베딩 모델 이름
+        provider: "huggingface" 또는 "openai"
+
+    Returns:
+        공유 Chroma 객체
+    """
+    key = (provider, model_name, os.path.abspath(persist_directory))
+    vectorstore = _vectorstores.get(key)
+    if vectorstore is not None:
+        return vectorstore
+
+    with _lock:
+        if key not in _vectorstores:
+            _vectorstores[key] = Chroma(
+                persist_directory=persist_directory,
+                embedding_function=get_embeddings(model_name, provider)
+            )
+            print(f"✅ 벡터 DB 로드 완료: {persist_directory}")
+        return _vectorstores[key]
+
+
+def _drop_chroma_system(persist_directory: str) -> None:
+    """chromadb 가 경로별로 공유하는 System(메모리에 올린 HNSW 인덱스 포함) 캐시 제거"""
+    try:
+        from chromadb.api.client import SharedSystemClient
+    except ImportError:
+        return
+    systems = getattr(SharedSystemClient, "_identifer_to_system", None)
+    if not systems:
+        return
+    path = os.path.abspath(persist_directory)
+    for identifier in [identifier for identifier in systems if identifier and os.path.abspath(identifier) == path]:
+        systems.pop(identifier, None)
+
+
+def release_vectorstore(persist_directory: Optional[str] = None, reload_from_disk: bool = False) -> None:
+    """
+    캐시된 Chroma 핸들 해제 (인덱스 재구축 후 다시 열 때 사용)
+
+    Args:
+        persist_directory: 해제할 경로 (None 이면 전체)
+        reload_from_disk: True 면 chromadb 의 경로별 클라이언트 캐시도 제거하여
+            다른 프로세스가 다시 만든 인덱스를 디스크에서 새로 읽음
+    """
+    with _lock:
+        if persist_directory is None:
+            _vectorstores.clear()
+            return
+
+        path = os.path.abspath(persist_directory)
+        for key in [key for key in _vectorstores if key[2] == path]:
+            del _vectorstores[key]
+        if reload_from_disk:
+            _drop_chroma_system(path)
@@ -0,0 +1,107 @@
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+'''
+Cross-encoder 재순위(re-ranking) 단계 (선택 사항, RERANKER_ENABLED=true 일 때 사용)
+
+1차 검색(하이브리드)으로 후보를 넉넉히 가져온 뒤 한국어 cross-encoder 로 (질의, 청크) 쌍을 배치 채점하고
+상위 몇 개만 LLM 에 전달하여 프롬프트를 줄입니다.
+지연 시간 예산을 넘기면 남은 후보는 채점하지 않고 1차 검색 순위를 그대로 사용합니다.
+'''
+
+DEFAULT_RERANKER_MODEL = "bongsoo/klue-cross-encoder-v1"
+
+
+class Reranker:
+    """sentence-transformers CrossEncoder 기반 재순위기"""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+        latency_budget_ms: Optional[float] = None
+    ):
+        """
+        Args:
+            model_name: cross-encoder 모델 (기본값: RERANKER_MODEL 또는 bongsoo/klue-cross-encoder-v1)
+            batch_size: 채점 배치 크기 (기본값: RERANK_BATCH_SIZE 또는 8)
+            max_candidates: 1차 검색에서 가져올 후보 수 (기본값: RERANK_CANDIDATES 또는 12)
+            latency_budget_ms: 재순위 지연 시간 예산 (기본값: RERANK_LATENCY_BUDGET_MS 또는 300ms)
+        """
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name or os.getenv("RERANKER_MODEL", DEFAULT_RERANKER_MODEL)
+        self.batch_size = batch_size or int(os.getenv("RERANK_BATCH_SIZE", "8"))
+        self.max_candidates = max_candidates or int(os.getenv("RERANK_CANDIDATES", "12"))
+        self.latency_budget_ms = latency_budget_ms or float(os.getenv("RERANK_LATENCY_BUDGET_MS", "300"))
+
+        self.model = CrossEncoder(self.model_name, max_length=512, device="cpu")
+        print(f"✅ 재순위 모델 '{self.model_name}' 로드 완료")
+
+    def rerank(self, query: str, docs: List[Any], top_n: int) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        후보 문서 재순위
+
+        Args:
+            query: 질의
+            docs: 1차 검색 후보 (순위순)
+            top_n: 반환할 문서 수
+
+        Returns:
+            (상위 문서 리스트, {"rerank_ms", "scored", "candidates", "budget_exceeded"})
+        """
+        start = time.perf_counter()
+        scored: List[Tuple[float, int]] = []
+        budget_exceeded = False
+
+        for i in range(0, len(docs), self.batch_size):
+            batch = docs[i:i + self.batch_size]
+            scores = self.model.predict(
+                [(query, doc.page_content) for doc in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False
+            )
+            scored.extend((float(score), i + j) for j, score in enumerate(scores))
+            if (time.perf_counter() - start) * 1000 > self.latency_budget_ms and i + self.batch_size < len(docs):
+                budget_exceeded = True
+                break
+
+        # 채점된 후보는 점수순, 예산 초과로 채점하지 못한 후보는 1차 검색 순서대로 뒤에 배치
+        scored_indexes = [index for _, index in sorted(scored, key=lambda item: item[0], reverse=True)]
+        remaining = [index for index in range(len(docs)) if index >= len(scored)]
+        ranked = [docs[index] for index in scored_indexes + remaining][:top_n]
+
+        return ranked, {
+            "rerank_ms": (time.perf_counter() - start) * 1000,
+            "scored": len(scored),
+            "candidates": len(docs),
+            "budget_exceeded": budget_exceeded,
+        }
+
+
+_reranker: Optional[Reranker] = None
+_reranker_lock = threading.Lock()
+_reranker_failed = False
+
+
+def reranker_enabled() -> bool:
+    return os.getenv("RERANKER_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_reranker() -> Optional[Reranker]:
+    """공유 재순위기 반환 (비활성화 또는 로드 실패 시 None → 1차 검색 결과 그대로 사용)"""
+    global _reranker, _reranker_failed
+    if not reranker_enabled() or _reranker_failed:
+        return None
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None and not _reranker_failed:
+                try:
+                    _reranker = Reranker()
+                except Exception as e:
+                    _reranker_failed = True
+                    print(f"⚠️ 재순위 모델 로드 실패, 재순위 없이 검색합니다: {e}")
+    return _reranker
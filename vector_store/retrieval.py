@@ -1,8 +1,247 @@
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from vector_store.registry import get_vectorstore
 import os
+import re
 from typing import List, Dict, Any, Optional
 
+'''
+보고서 벡터 DB 검색 API
+
+- 색인 시점: 파일명에서 문서 유형(doc_type)과 날짜(date, month_day)를 추출해 청크 메타데이터에 저장
+- 검색 시점: 질의에서 파일명 / 문서 유형 / 날짜 / 페이지 범위 필터를 추출하여 Chroma where 절로 전달
+'''
+
+# 파일명 키워드 → 문서 유형 (앞에 있을수록 우선)
+DOC_TYPE_KEYWORDS = [
+    ("회의록", "회의록"),
+    ("사업계획서", "사업계획서"),
+    ("시행령", "법령"),
+    ("시행규칙", "법령"),
+    ("법률", "법령"),
+    ("TTAK", "표준"),
+    ("매뉴얼", "매뉴얼"),
+    ("기획연구", "기획연구"),
+    ("보고서", "보고서"),
+]
+# 질의 표현 → 문서 유형
+QUERY_DOC_TYPE_PATTERNS = [
+    (re.compile(r"회의록"), "회의록"),
+    (re.compile(r"사업\s*계획서"), "사업계획서"),
+    (re.compile(r"시행령|시행규칙|법률|법령"), "법령"),
+    (re.compile(r"TTAK|표준\s*문서|단체\s*표준", re.IGNORECASE), "표준"),
+    (re.compile(r"매뉴얼|사용\s*설명서"), "매뉴얼"),
+]
+
+FILENAME_DATE_PATTERN = re.compile(r"(?<!\d)(20\d{2})[.\-_]?(\d{2})[.\-_]?(\d{2})(?!\d)")
+QUERY_FULL_DATE_PATTERN = re.compile(r"(20\d{2})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?")
+QUERY_COMPACT_DATE_PATTERN = re.compile(r"(?<!\d)(20\d{2})(\d{2})(\d{2})(?!\d)")
+QUERY_MONTH_DAY_PATTERN = re.compile(r"(?<!\d)(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+# "0807 회의록", "0807자 회의" 처럼 문서 표현 바로 앞의 MMDD
+QUERY_MMDD_PATTERN = re.compile(r"(?<!\d)(\d{2})(\d{2})(?!\d)\s*(?:자|일)?\s*(?:회의록|회의|보고서|문서|자료)")
+QUERY_YEAR_PATTERN = re.compile(r"(?<!\d)(20\d{2})\s*년(?!\s*\d{1,2}\s*월)")
+FILENAME_YEAR_PATTERN = re.compile(r"(?<!\d)(20\d{2})\s*년")
+QUERY_PAGE_RANGE_PATTERN = re.compile(r"(\d+)\s*(?:~|-|부터)\s*(\d+)\s*(?:페이지|쪽|p\b)", re.IGNORECASE)
+QUERY_PAGE_PATTERN = re.compile(r"(\d+)\s*(?:페이지|쪽|p\b)", re.IGNORECASE)
+
+
+def _valid_month_day(month: int, day: int) -> bool:
+    return 1 <= month <= 12 and 1 <= day <= 31
+
+
+def parse_document_metadata(filename: str) -> Dict[str, Any]:
+    """
+    파일명에서 검색 필터용 메타데이터 추출 (색인 시점)
+
+    Args:
+        filename: 파일명 (예: 스마트팜_20240807_회의록.docx)
+
+    Returns:
+        {"doc_type", "date"(YYYYMMDD 정수), "year", "month_day"("MMDD")} 중 추출된 항목 (doc_type 은 항상 포함)
+    """
+    metadata: Dict[str, Any] = {"doc_type": "기타"}
+    for keyword, doc_type in DOC_TYPE_KEYWORDS:
+        if keyword in filename:
+            metadata["doc_type"] = doc_type
+            break
+
+    match = FILENAME_DATE_PATTERN.search(filename)
+    if match and _valid_month_day(int(match.group(2)), int(match.group(3))):
+        year, month, day = match.groups()
+        metadata.update({"date": int(f"{year}{month}{day}"), "year": int(year), "month_day": f"{month}{day}"})
+    else:
+        match = FILENAME_YEAR_PATTERN.search(filename)
+        if match:
+            metadata["year"] = int(match.group(1))
+    return metadata
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[\s_\-]+", "", text).lower()
+
+
+def extract_filters(query: str, filenames: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    질의에서 메타데이터 필터 추출
+
+    Args:
+        query: 사용자 질의
+        filenames: 색인된 파일명 목록 (질의에 파일명이 포함되면 해당 파일로 한정)
+
+    Returns:
+        {"filename", "doc_type", "date_from", "date_to", "year", "month_day", "page_from", "page_to"} 중 추출된 항목
+    """
+    filters: Dict[str, Any] = {}
+
+    # 파일명 (확장자 제외 이름이 질의에 그대로 포함된 경우, 가장 긴 이름 우선)
+    normalized_query = _normalize(query)
+    for filename in sorted(filenames or [], key=len, reverse=True):
+        stem = _normalize(os.path.splitext(filename)[0])
+        if len(stem) >= 4 and stem in normalized_query:
+            filters["filename"] = filename
+            break
+
+    if "filename" not in filters:
+        for pattern, doc_type in QUERY_DOC_TYPE_PATTERNS:
+            if pattern.search(query):
+                filters["doc_type"] = doc_type
+                break
+
+    # 날짜: 전체 날짜 → 월/일 → 연도 순
+    match = QUERY_FULL_DATE_PATTERN.search(query) or QUERY_COMPACT_DATE_PATTERN.search(query)
+    if match and _valid_month_day(int(match.group(2)), int(match.group(3))):
+        date = int(f"{match.group(1)}{int(match.group(2)):02d}{int(match.group(3)):02d}")
+        filters["date_from"] = filters["date_to"] = date
+    else:
+        match = QUERY_MONTH_DAY_PATTERN.search(query) or QUERY_MMDD_PATTERN.search(query)
+        if match and _valid_month_day(int(match.group(1)), int(match.group(2))):
+            filters["month_day"] = f"{int(match.group(1)):02d}{int(match.group(2)):02d}"
+        else:
+            match = QUERY_YEAR_PATTERN.search(query)
+            if match:
+                filters["year"] = int(match.group(1))
+
+    # 페이지 (사용자는 1부터, 메타데이터는 0부터)
+    match = QUERY_PAGE_RANGE_PATTERN.search(query)
+    if match:
+        filters["page_from"] = max(int(match.group(1)) - 1, 0)
+        filters["page_to"] = max(int(match.group(2)) - 1, 0)
+    else:
+        match = QUERY_PAGE_PATTERN.search(query)
+        if match:
+            filters["page_from"] = filters["page_to"] = max(int(match.group(1)) - 1, 0)
+
+    return filters
+
+
+def build_where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    필터를 Chroma where 절로 변환
+
+    Args:
+        filters: extract_filters 형식의 필터
+
+    Returns:
+        Chroma where dict 또는 None (필터 없음)
+    """
+    if not filters:
+        return None
+
+    conditions = []
+    if filters.get("filename"):
+        conditions.append({"filename": {"$eq": filters["filename"]}})
+    if filters.get("doc_type"):
+        conditions.append({"doc_type": {"$eq": filters["doc_type"]}})
+    if filters.get("month_day"):
+        conditions.append({"month_day": {"$eq": filters["month_day"]}})
+    if filters.get("year"):
+        conditions.append({"year": {"$eq": filters["year"]}})
+    if filters.get("date_from") is not None:
+        conditions.append({"date": {"$gte": filters["date_from"]}})
+    if filters.get("date_to") is not None:
+        conditions.append({"date": {"$lte": filters["date_to"]}})
+    if filters.get("page_from") is not None:
+        conditions.append({"page": {"$gte": filters["page_from"]}})
+    if filters.get("page_to") is not None:
+        conditions.append({"page": {"$lte": filters["page_to"]}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def matches_filters(metadata: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """build_where 와 같은 조건을 메타데이터 dict 에 적용 (키워드 검색 결과 후처리용)"""
+    if not filters:
+        return True
+    for key in ("filename", "doc_type", "month_day", "year"):
+        if filters.get(key) and metadata.get(key) != filters[key]:
+            return False
+    for key, field, compare in (
+        ("date_from", "date", lambda value, bound: value >= bound),
+        ("date_to", "date", lambda value, bound: value <= bound),
+        ("page_from", "page", lambda value, bound: value >= bound),
+        ("page_to", "page", lambda value, bound: value <= bound),
+    ):
+        if filters.get(key) is not None:
+            value = metadata.get(field)
+            if value is None or not compare(value, filters[key]):
+                return False
+    return True
+
+
+def list_filenames(vectordb) -> List[str]:
+    """색인된 파일명 목록"""
+    data = vectordb.get(include=["metadatas"])
+    return sorted({metadata.get("filename") for metadata in data["metadatas"] if metadata and metadata.get("filename")})
+
+
+def filtered_search(vectordb, query_vector: List[float], k: int, filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    메타데이터 필터를 Chroma where 절로 적용한 벡터 검색
+
+    Args:
+        vectordb: Chroma 객체
+        query_vector: 질의 임베딩
+        k: 검색할 문서 수
+        filters: extract_filters 형식의 필터
+
+    Returns:
+        문서 리스트
+    """
+    return vectordb.similarity_search_by_vector(query_vector, k=k, filter=build_where(filters))
+
+
+async def afiltered_search(vectordb, query_vector: List[float], k: int, filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """filtered_search 의 비동기 버전"""
+    return await vectordb.asimilarity_search_by_vector(query_vector, k=k, filter=build_where(filters))
+
+
+def search_reports(
+    query: str,
+    k: int = 3,
+    filters: Optional[Dict[str, Any]] = None,
+    db_path: str = "./vector_store/db/reports_chroma",
+    embedding_model_name: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+) -> List[Any]:
+    """
+    보고서 벡터 DB 필터 검색
+
+    Args:
+        query: 검색 쿼리
+        k: 검색할 문서 수
+        filters: 메타데이터 필터 (None 이면 질의에서 추출)
+        db_path: 벡터 DB 경로
+        embedding_model_name: 임베딩 모델 이름
+
+    Returns:
+        문서 리스트
+    """
+    vectordb = get_vectorstore(db_path, embedding_model_name)
+    if filters is None:
+        filters = extract_filters(query, list_filenames(vectordb))
+    query_vector = vectordb.embeddings.embed_query(query)
+    return filtered_search(vectordb, query_vector, k, filters)
+
+
 def test_vector_retrieval(
     query: str, 
     k: int = 2, 
@@ -22,23 +261,13 @@ def test_vector_retrieval(
         검색 결과 리스트 (각 항목은 내용과 메타데이터 포함)
     """
     try:
-        # 임베딩 모델 초기화
-        embeddings = HuggingFaceEmbeddings(
-            model_name=embedding_model_name,
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True}
-        )
-        
         # 벡터 DB가 존재하는지 확인
         if not os.path.exists(db_path):
             print(f"오류: 벡터 DB가 '{db_path}'에 존재하지 않습니다.")
             return []
         
-        # 벡터 DB 로드
-        vectordb = Chroma(
-            persist_directory=db_path,
-            embedding_function=embeddings
-        )
+        # 벡터 DB 로드 (공유 레지스트리)
+        vectordb = get_vectorstore(db_path, embedding_model_name)
         
         # 검색 수행
         results = vectordb.similarity_search(query, k=k)
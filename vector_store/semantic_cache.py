@@ -0,0 +1,186 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+'''
+질의 임베딩 기반 시맨틱 답변 캐시
+
+같은 에이전트 / 같은 프로젝트에서 이전 질의와 코사인 유사도가 임계값 이상인 질의가 들어오면
+저장된 답변과 출처를 재사용하여 벡터 검색과 LLM 생성을 건너뜁니다.
+- TTL 이 지난 항목은 만료, 네임스페이스별 최대 개수를 넘으면 LRU 순서로 제거
+- 인덱스 디렉토리(예: reports_chroma)가 다시 구축되면 전체 무효화
+'''
+
+
+class SemanticCache:
+    """네임스페이스(에이전트, 프로젝트)별 시맨틱 캐시"""
+
+    def __init__(
+        self,
+        index_path: Optional[str] = None,
+        threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Args:
+            index_path: 캐시가 의존하는 벡터 DB 경로 (변경 시 무효화)
+            threshold: 캐시 적중으로 볼 최소 코사인 유사도 (기본값: SEMANTIC_CACHE_THRESHOLD 또는 0.95)
+            ttl_seconds: 항목 유효 시간 (기본값: SEMANTIC_CACHE_TTL 또는 3600초)
+            max_entries: 네임스페이스별 최대 항목 수 (기본값: SEMANTIC_CACHE_MAX_ENTRIES 또는 512)
+        """
+        self.index_path = index_path
+        self.threshold = threshold if threshold is not None else float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, "OrderedDict[int, Dict[str, Any]]"] = {}
+        self._next_id = 0
+        self._index_version = self._read_index_version()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def _read_index_version(self) -> Optional[float]:
+        """인덱스 디렉토리 최상위 파일들의 최종 수정 시각"""
+        if not self.index_path or not os.path.isdir(self.index_path):
+            return None
+        mtimes = [entry.stat().st_mtime for entry in os.scandir(self.index_path) if entry.is_file()]
+        return max(mtimes) if mtimes else None
+
+    def _check_index_version(self) -> None:
+        version = self._read_index_version()
+        if version != self._index_version:
+            self._entries.clear()
+            self._index_version = version
+            self._counters["invalidations"] += 1
+            print("♻️ 벡터 DB 변경 감지: 시맨틱 캐시를 비웁니다.")
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, namespace: str, query_vector) -> Optional[Dict[str, Any]]:
+        """
+        유사한 질의의 캐시된 값 조회
+
+        Args:
+            namespace: 캐시 네임스페이스 (예: "find_report_agent:프로젝트명")
+            query_vector: 질의 임베딩
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        vector = self._normalize(query_vector)
+        now = time.time()
+
+        with self._lock:
+            self._check_index_version()
+            entries = self._entries.get(namespace)
+            if entries:
+                # 만료 항목 제거
+                expired = [key for key, entry in entries.items() if now - entry["created_at"] > self.ttl_seconds]
+                for key in expired:
+                    del entries[key]
+                self._counters["expired"] += len(expired)
+
+            if not entries:
+                self._counters["misses"] += 1
+                return None
+
+            keys = list(entries.keys())
+            scores = np.vstack([entries[key]["vector"] for key in keys]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self._counters["misses"] += 1
+                return None
+
+            entries.move_to_end(keys[best])
+            self._counters["hits"] += 1
+            print(f"💾 시맨틱 캐시 적중 (유사도 {float(scores[best]):.3f}): {entries[keys[best]]['query']}")
+            return entries[keys[best]]["value"]
+
+    def store(self, namespace: str, query: str, query_vector, value: Dict[str, Any]) -> None:
+        """
+        캐시 항목 저장
+
+        Args:
+            namespace: 캐시 네임스페이스
+            query: 원본 질의
+            query_vector: 질의 임베딩
+            value: 저장할 값 (답변, 출처 등)
+        """
+        with self._lock:
+            self._check_index_version()
+            entries = self._entries.setdefault(namespace, OrderedDict())
+            entries[self._next_id] = {
+                "query": query,
+                "vector": self._normalize(query_vector),
+                "value": value,
+                "created_at": time.time(),
+            }
+            self._next_id += 1
+
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """캐시 무효화 (namespace 가 None 이면 전체)"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(namespace, None)
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미적중 등 캐시 통계"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "namespaces": list(self._entries.keys()),
+            }
+
+
+# 벡터 DB 경로별 공유 캐시
+_caches: Dict[str, SemanticCache] = {}
+_caches_lock = threading.Lock()
+
+
+def semantic_cache_enabled() -> bool:
+    return os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def get_semantic_cache(index_path: str) -> SemanticCache:
+    """벡터 DB 경로에 해당하는 공유 시맨틱 캐시 반환"""
+    key = os.path.abspath(index_path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SemanticCache(index_path=index_path)
+        return _caches[key]
+
+
+def all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 시맨틱 캐시의 통계"""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {path: cache.stats() for path, cache in caches.items()}
+
+
+def invalidate_semantic_cache(index_path: Optional[str] = None) -> None:
+    """index_path 의 캐시(없으면 전체) 무효화"""
+    with _caches_lock:
+        caches = [
+            cache for path, cache in _caches.items()
+            if index_path is None or path == os.path.abspath(index_path)
+        ]
+    for cache in caches:
+        cache.invalidate()